@@ -11,4 +11,13 @@ static void BM_ToUpper(benchmark::State &state) {
 
 BENCHMARK(BM_ToUpper);
 
+static void BM_Split(benchmark::State &state) {
+    for (auto _ : state) {
+        benchmark::DoNotOptimize(
+            project_name::utils::split("alpha,beta,gamma,delta,epsilon", ','));
+    }
+}
+
+BENCHMARK(BM_Split);
+
 BENCHMARK_MAIN();
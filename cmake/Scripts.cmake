@@ -156,20 +156,23 @@ function(add_script_targets)
     endif()
 
     # === Print available targets ===
+    # Every preset has its own build tree, so name this one rather than build/
+    file(RELATIVE_PATH _cqs_build_dir "${CMAKE_SOURCE_DIR}" "${CMAKE_BINARY_DIR}")
     message(STATUS "Script targets available:")
-    message(STATUS "  cmake --build build --target format       - Format code")
-    message(STATUS "  cmake --build build --target format-check - Check formatting")
-    message(STATUS "  cmake --build build --target clean-all    - Clean all artifacts")
+    message(STATUS "  cmake --build ${_cqs_build_dir} --target format       - Format code")
+    message(STATUS "  cmake --build ${_cqs_build_dir} --target format-check - Check formatting")
+    message(STATUS "  cmake --build ${_cqs_build_dir} --target clean-all    - Clean all artifacts")
     if(Python3_FOUND)
-        message(STATUS "  cmake --build build --target doctor       - Check environment")
-        message(STATUS "  cmake --build build --target info         - Project info")
-        message(STATUS "  cmake --build build --target add-module   - Add new module")
-        message(STATUS "  cmake --build build --target add-dep      - Add dependency")
+        message(STATUS "  cmake --build ${_cqs_build_dir} --target doctor       - Check environment")
+        message(STATUS "  cmake --build ${_cqs_build_dir} --target info         - Project info")
+        message(STATUS "  cmake --build ${_cqs_build_dir} --target add-module   - Add new module")
+        message(STATUS "  cmake --build ${_cqs_build_dir} --target add-dep      - Add dependency")
     endif()
 endfunction()
 
 # Utility function to run tests with coverage
 function(add_coverage_target)
+    file(RELATIVE_PATH _cqs_build_dir "${CMAKE_SOURCE_DIR}" "${CMAKE_BINARY_DIR}")
     find_program(GCOVR_PROGRAM gcovr)
     find_program(LCOV_PROGRAM lcov)
 
@@ -185,7 +188,7 @@ function(add_coverage_target)
             COMMENT "Generating coverage report with gcovr"
             DEPENDS unit_tests
         )
-        message(STATUS "  cmake --build build --target coverage     - Generate coverage")
+        message(STATUS "  cmake --build ${_cqs_build_dir} --target coverage     - Generate coverage")
     elseif(LCOV_PROGRAM)
         add_custom_target(coverage
             COMMAND ${LCOV_PROGRAM} --capture --directory "${CMAKE_BINARY_DIR}" --output-file coverage.info
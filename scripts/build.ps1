@@ -6,7 +6,7 @@
 .PARAMETER Preset
     CMake preset to use (default: ninja-debug on Unix, vs-debug on Windows)
 .PARAMETER Clean
-    Clean build directory before building
+    Clean the preset's build directory before building
 .PARAMETER Target
     Specific target to build
 .PARAMETER Jobs
@@ -28,6 +28,20 @@ $ErrorActionPreference = "Stop"
 
 $ProjectRoot = Split-Path -Parent $PSScriptRoot
 
+# Point build/compile_commands.json (where clangd looks) at a preset's database.
+# Falls back to a copy where symbolic links are not permitted.
+function Set-CompileCommands([string]$Name) {
+    $source = Join-Path $ProjectRoot "build/$Name/compile_commands.json"
+    if (-not (Test-Path $source)) { return }
+    $link = Join-Path $ProjectRoot "build/compile_commands.json"
+    Remove-Item -Force $link -ErrorAction SilentlyContinue
+    try {
+        New-Item -ItemType SymbolicLink -Path $link -Target $source -ErrorAction Stop | Out-Null
+    } catch {
+        Copy-Item $source $link
+    }
+}
+
 # Determine default preset based on platform
 if (-not $Preset) {
     if ($IsWindows -or $env:OS -eq "Windows_NT") {
@@ -48,7 +62,11 @@ Write-Host "========================================" -ForegroundColor Cyan
 
 # Clean if requested
 if ($Clean) {
-    $BuildDir = Join-Path $ProjectRoot "build"
+    # Only this preset's tree when presets have their own
+    $BuildDir = Join-Path $ProjectRoot "build/$Preset"
+    if (-not (Test-Path $BuildDir)) {
+        $BuildDir = Join-Path $ProjectRoot "build"
+    }
     if (Test-Path $BuildDir) {
         Write-Host "Cleaning build directory..." -ForegroundColor Yellow
         Remove-Item -Recurse -Force $BuildDir
@@ -63,6 +81,7 @@ if ($LASTEXITCODE -ne 0) {
     Write-Host "Configuration failed!" -ForegroundColor Red
     exit 1
 }
+Set-CompileCommands $Preset
 
 # Build
 Write-Host "`nBuilding..." -ForegroundColor Green
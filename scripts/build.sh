@@ -7,6 +7,13 @@ set -euo pipefail
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
+# Point build/compile_commands.json (where clangd looks) at a preset's database
+link_compile_commands() {
+    if [[ -f "$PROJECT_ROOT/build/$1/compile_commands.json" ]]; then
+        ln -sfn "$1/compile_commands.json" "$PROJECT_ROOT/build/compile_commands.json"
+    fi
+}
+
 # Default values
 PRESET=""
 CLEAN=false
@@ -48,16 +55,22 @@ echo "========================================"
 echo "  Building with preset: $PRESET"
 echo "========================================"
 
-# Clean if requested
+# Clean if requested (only this preset's tree when presets have their own)
 if [[ "$CLEAN" == "true" ]]; then
-    echo "Cleaning build directory..."
-    rm -rf "$PROJECT_ROOT/build"
+    if [[ -d "$PROJECT_ROOT/build/$PRESET" ]]; then
+        echo "Cleaning build/$PRESET..."
+        rm -rf "$PROJECT_ROOT/build/$PRESET"
+    else
+        echo "Cleaning build directory..."
+        rm -rf "$PROJECT_ROOT/build"
+    fi
 fi
 
 # Configure
 echo ""
 echo "Configuring..."
 cmake --preset "$PRESET"
+link_compile_commands "$PRESET"
 
 # Build
 echo ""
@@ -7,14 +7,18 @@
     Remove all generated files including IDE caches
 .PARAMETER BuildOnly
     Only remove build directory
+.PARAMETER Preset
+    Only remove one preset's build tree (build/<preset>)
 .EXAMPLE
     .\clean.ps1
     .\clean.ps1 -All
+    .\clean.ps1 -Preset ninja-release
 #>
 
 param(
     [switch]$All,
-    [switch]$BuildOnly
+    [switch]$BuildOnly,
+    [string]$Preset
 )
 
 $ErrorActionPreference = "Stop"
@@ -25,6 +29,21 @@ Write-Host "========================================" -ForegroundColor Cyan
 Write-Host "  Cleaning project" -ForegroundColor Cyan
 Write-Host "========================================" -ForegroundColor Cyan
 
+if ($Preset) {
+    $presetDir = Join-Path $ProjectRoot "build/$Preset"
+    if (Test-Path $presetDir) {
+        Write-Host "  Removing: build/$Preset" -ForegroundColor Yellow
+        Remove-Item -Recurse -Force $presetDir
+    }
+    # Drop the clangd link if it pointed into the removed tree
+    $link = Get-Item (Join-Path $ProjectRoot "build/compile_commands.json") -ErrorAction SilentlyContinue
+    if ($link -and $link.LinkType -and -not (Test-Path $link.FullName)) {
+        Remove-Item -Force $link.FullName
+    }
+    Write-Host "`nCleaned successfully!" -ForegroundColor Green
+    exit 0
+}
+
 $dirsToRemove = @(
     "build"
 )
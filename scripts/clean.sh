@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
 # Cross-platform clean script for cpp-quick-starter
-# Usage: ./clean.sh [--all] [--build-only]
+# Usage: ./clean.sh [--all] [--build-only] [--preset PRESET]
 
 set -euo pipefail
 
@@ -9,6 +9,7 @@ PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
 ALL=false
 BUILD_ONLY=false
+PRESET=""
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -20,6 +21,10 @@ while [[ $# -gt 0 ]]; do
             BUILD_ONLY=true
             shift
             ;;
+        --preset|-p)
+            PRESET="$2"
+            shift 2
+            ;;
         *)
             echo "Unknown option: $1" >&2
             exit 1
@@ -37,6 +42,21 @@ echo -e "${CYAN}========================================${NC}"
 echo -e "${CYAN}  Cleaning project${NC}"
 echo -e "${CYAN}========================================${NC}"
 
+# Only remove one preset's tree (build/<preset>), keeping the others
+if [[ -n "$PRESET" ]]; then
+    if [[ -d "$PROJECT_ROOT/build/$PRESET" ]]; then
+        echo -e "  ${YELLOW}Removing:${NC} build/$PRESET"
+        rm -rf "$PROJECT_ROOT/build/$PRESET"
+    fi
+    # Drop the clangd link if it pointed into the removed tree
+    if [[ -L "$PROJECT_ROOT/build/compile_commands.json" && ! -e "$PROJECT_ROOT/build/compile_commands.json" ]]; then
+        rm -f "$PROJECT_ROOT/build/compile_commands.json"
+    fi
+    echo ""
+    echo -e "${GREEN}Cleaned successfully!${NC}"
+    exit 0
+fi
+
 # Directories to remove
 dirs_to_remove=("build")
 
@@ -0,0 +1,335 @@
+"""
+Accelerate command - wire up compiler caches and fast linkers.
+
+    cqs accelerate [--max-size SIZE] [--benchmark [PRESET]]
+
+Detects ccache/sccache and mold/lld, writes '<preset>-fast' user presets
+(CMakeUserPresets.json) and .cqs/xmake.lua, and optionally benchmarks a
+clean build against cold and warm accelerated rebuilds.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_list,
+    print_success,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    green,
+    dim,
+)
+from .doctor import load_environment
+from .presets import (
+    configure_presets,
+    condition_matches,
+    resolve_field,
+    resolve_cache_variables,
+    update_user_presets,
+)
+from .runner import variant_binary_dir, configure_and_build
+from .state import project_state_dir, save_json, format_size
+
+
+PRESET_SUFFIX = "-fast"
+XMAKE_FILE = "xmake.lua"
+CONFIG_FILE = "accelerate.json"
+
+# Compiler cache size bounds (bytes)
+MIN_CACHE_SIZE = 2 << 30
+MAX_CACHE_SIZE = 50 << 30
+DEFAULT_CACHE_SIZE = 5 << 30
+
+# Rough number of object-file generations the cache should hold (presets x revisions)
+CACHE_GENERATIONS = 10
+
+OBJECT_SUFFIXES = (".o", ".obj")
+
+
+# ============================================================================
+# Detection
+# ============================================================================
+
+
+def detect_accelerators() -> Dict[str, Any]:
+    """Return the preferred compiler launcher and fast linker found on this machine."""
+    tools = load_environment()["tools"]
+
+    def _found(name: str) -> Optional[str]:
+        return tools[name]["path"] if tools[name]["status"] == "ok" else None
+
+    # sccache is the only one of the two that also caches MSVC reliably
+    launchers = ("sccache", "ccache") if sys.platform == "win32" else ("ccache", "sccache")
+    launcher = next(((n, _found(n)) for n in launchers if _found(n)), (None, None))
+
+    # -fuse-ld=<linker> with GCC/Clang is only wired up on Linux
+    linker = (None, None)
+    if sys.platform.startswith("linux"):
+        linker = next(((n, _found(n)) for n in ("mold", "ld.lld") if _found(n)), (None, None))
+
+    return {
+        "launcher": launcher[0],
+        "launcher_path": launcher[1],
+        "linker": "lld" if linker[0] == "ld.lld" else linker[0],
+        "linker_path": linker[1],
+    }
+
+
+def object_bytes(root: Path) -> int:
+    """Return the total size of object files below build/."""
+    total = 0
+    build = root / "build"
+    if not build.is_dir():
+        return 0
+    for dirpath, _, filenames in os.walk(build):
+        for name in filenames:
+            if name.endswith(OBJECT_SUFFIXES):
+                try:
+                    total += os.stat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
+    return total
+
+
+def tuned_cache_size(root: Path) -> int:
+    """Size the compiler cache from the project's current object output."""
+    objects = object_bytes(root)
+    if not objects:
+        return DEFAULT_CACHE_SIZE
+    return max(MIN_CACHE_SIZE, min(MAX_CACHE_SIZE, objects * CACHE_GENERATIONS))
+
+
+def _cache_size_value(size: int) -> str:
+    """Format a size as whole gigabytes understood by both ccache and sccache."""
+    return f"{max(1, round(size / (1 << 30)))}G"
+
+
+# ============================================================================
+# Presets and xmake
+# ============================================================================
+
+
+def launcher_environment(launcher: str, size: int) -> Dict[str, str]:
+    """Return the preset environment tuning a compiler cache."""
+    if launcher == "sccache":
+        return {"SCCACHE_CACHE_SIZE": _cache_size_value(size)}
+    return {
+        "CCACHE_MAXSIZE": _cache_size_value(size),
+        # Share hits between checkouts and build directories
+        "CCACHE_BASEDIR": "${sourceDir}",
+        "CCACHE_NOHASHDIR": "true",
+    }
+
+
+def fast_presets(root: Path, accel: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    """Return '<preset>-fast' configure presets inheriting every visible preset."""
+    presets = configure_presets(root)
+    result = []
+    for name, preset in presets.items():
+        if preset.get("hidden") or name.endswith(PRESET_SUFFIX) or not condition_matches(presets, name):
+            continue
+        # Visual Studio generators ignore compiler launchers
+        if str(resolve_field(presets, name, "generator") or "").startswith("Visual Studio"):
+            continue
+        cache_vars: Dict[str, str] = {}
+        environment: Dict[str, str] = {}
+        if accel["launcher"]:
+            cache_vars["CMAKE_C_COMPILER_LAUNCHER"] = accel["launcher"]
+            cache_vars["CMAKE_CXX_COMPILER_LAUNCHER"] = accel["launcher"]
+            environment.update(launcher_environment(accel["launcher"], size))
+
+        compiler = os.path.basename(resolve_cache_variables(presets, name).get("CMAKE_CXX_COMPILER", ""))
+        if accel["linker"] and compiler not in ("cl", "cl.exe", "clang-cl"):
+            flag = f"-fuse-ld={accel['linker']}"
+            for kind in ("EXE", "SHARED", "MODULE"):
+                cache_vars[f"CMAKE_{kind}_LINKER_FLAGS"] = flag
+
+        if not cache_vars:
+            continue
+        entry: Dict[str, Any] = {
+            "name": name + PRESET_SUFFIX,
+            "displayName": f"{preset.get('displayName', name)} (accelerated)",
+            "inherits": name,
+            "cacheVariables": cache_vars,
+        }
+        if environment:
+            entry["environment"] = environment
+        result.append(entry)
+    return result
+
+
+def write_xmake_config(root: Path, accel: Dict[str, Any]) -> Optional[Path]:
+    """Write .cqs/xmake.lua, which xmake.lua includes when present."""
+    if not (root / "xmake.lua").exists():
+        return None
+
+    lines = ["-- Generated by `cqs accelerate`; machine-specific, do not commit."]
+    if accel["launcher"] == "ccache":
+        lines.append('set_policy("build.ccache", true)')
+    elif accel["launcher"]:
+        lines.append(f"-- {accel['launcher']} is not supported by xmake; only ccache is wired up")
+    if accel["linker"]:
+        flag = f"-fuse-ld={accel['linker']}"
+        lines.append(f'add_ldflags("{flag}", {{force = true}})')
+        lines.append(f'add_shflags("{flag}", {{force = true}})')
+
+    path = project_state_dir(root) / XMAKE_FILE
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+def _timed_build(root: Path, preset: str, binary_dir: Path, env: Dict[str, str]) -> Optional[float]:
+    shutil.rmtree(binary_dir, ignore_errors=True)
+    start = time.perf_counter()
+    ok = configure_and_build(root, preset, binary_dir, env=env, echo=False)
+    return time.perf_counter() - start if ok else None
+
+
+def benchmark(root: Path, preset: str, accel: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """
+    Time a plain clean build, then a cold and a warm accelerated rebuild.
+
+    The accelerated builds use a throwaway cache directory, so the user's
+    compiler cache is neither polluted nor able to make the cold run warm.
+    """
+    baseline_dir = variant_binary_dir(root, preset, "accelerate-baseline")
+    fast_dir = variant_binary_dir(root, preset, "accelerate")
+    sccache = accel["launcher_path"] if accel["launcher"] == "sccache" else None
+    times: Dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory(prefix="cqs-accelerate-") as tmp:
+        env = dict(os.environ)
+        env["CCACHE_DIR"] = os.path.join(tmp, "ccache")
+        env["SCCACHE_DIR"] = os.path.join(tmp, "sccache")
+        runs = [
+            ("baseline", preset, baseline_dir, dict(os.environ)),
+            ("cold", preset + PRESET_SUFFIX, fast_dir, env),
+            ("warm", preset + PRESET_SUFFIX, fast_dir, env),
+        ]
+        try:
+            for label, run_preset, binary_dir, run_env in runs:
+                if sccache and label == "cold":
+                    # The sccache server keeps its cache dir; restart it under the temp dir
+                    subprocess.run([sccache, "--stop-server"], env=env, capture_output=True)
+                with Spinner(f"Clean build ({label})...") as spinner:
+                    elapsed = _timed_build(root, run_preset, binary_dir, run_env)
+                    if elapsed is None:
+                        spinner.fail(f"Build failed ({label})")
+                        return None
+                    spinner.succeed(f"{label}: {elapsed:.1f} s")
+                times[label] = elapsed
+        finally:
+            if sccache:
+                subprocess.run([sccache, "--stop-server"], env=env, capture_output=True)
+            shutil.rmtree(baseline_dir, ignore_errors=True)
+            shutil.rmtree(fast_dir, ignore_errors=True)
+
+    return times
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_accelerate(
+    root: Optional[Path] = None,
+    max_size: Optional[int] = None,
+    benchmark_preset: Optional[str] = None,
+) -> bool:
+    """Detect build accelerators and write accelerated presets."""
+    print_banner(
+        "Build Acceleration",
+        "Compiler caches and fast linkers",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+
+    accel = detect_accelerators()
+    if not accel["launcher"] and not accel["linker"]:
+        print_warning("No compiler cache (ccache/sccache) or fast linker (mold/lld) found.")
+        print_list(
+            [
+                "Linux: sudo apt install ccache mold",
+                "macOS: brew install ccache",
+                "Windows: scoop install sccache",
+            ]
+        )
+        return False
+
+    size = max_size or tuned_cache_size(root)
+    print_box(
+        [
+            f"Compiler cache: {cyan(accel['launcher'] or 'none')} {dim(accel['launcher_path'] or '')}",
+            f"Fast linker:    {cyan(accel['linker'] or 'none')} {dim(accel['linker_path'] or '')}",
+            f"Cache size:     {cyan(format_size(size))}",
+        ],
+        title="Detected",
+    )
+    print()
+
+    configure = fast_presets(root, accel, size) if (root / "CMakePresets.json").exists() else []
+    if configure:
+        update_user_presets(
+            root,
+            configure=configure,
+            build=[{"name": p["name"], "configurePreset": p["name"]} for p in configure],
+        )
+        print_success(f"Added user presets: {cyan(', '.join(p['name'] for p in configure))}")
+
+    xmake = write_xmake_config(root, accel)
+    if xmake:
+        print_success(f"Wrote {cyan(str(xmake.relative_to(root)))}")
+
+    config: Dict[str, Any] = {**accel, "cache_size": size, "presets": [p["name"] for p in configure]}
+
+    if benchmark_preset:
+        if benchmark_preset + PRESET_SUFFIX not in {p["name"] for p in configure}:
+            print_error(f"Unknown configure preset: {benchmark_preset}")
+            return False
+        print()
+        print_info(f"Benchmarking preset {cyan(benchmark_preset)} (three clean builds)...")
+        times = benchmark(root, benchmark_preset, accel)
+        if times is None:
+            return False
+        config["benchmark"] = {"preset": benchmark_preset, **times}
+        print()
+        print_box(
+            [
+                f"Plain clean build:       {times['baseline']:>7.1f} s",
+                f"Accelerated, cold cache: {times['cold']:>7.1f} s",
+                f"Accelerated, warm cache: {times['warm']:>7.1f} s  "
+                + green(f"{times['baseline'] / max(times['warm'], 1e-6):.1f}x faster"),
+            ],
+            title="Clean vs Warm Rebuild",
+        )
+
+    save_json(project_state_dir(root) / CONFIG_FILE, config, indent=2)
+
+    print()
+    first = configure[0]["name"] if configure else ""
+    print_list(
+        ([f"CMake: {dim(f'cmake --preset {first}')}"] if configure else [])
+        + ([f"xmake: {dim('xmake f -c && xmake')}"] if xmake else [])
+    )
+    return True
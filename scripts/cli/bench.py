@@ -0,0 +1,863 @@
+"""
+Bench command - Google Benchmark runner with history and regression gates.
+
+    cqs bench [preset] [--repetitions N] [--filter REGEX] [--baseline REF]
+              [--threshold PCT] [--alpha P] [--no-build]
+    cqs bench [preset] --compare A..B [--repetitions N] [--filter REGEX]
+
+    Both forms accept --stable and --noise PCT.
+
+Builds the 'benchmarks' target with CPP_QUICK_STARTER_BUILD_BENCHMARKS=ON,
+runs it with --benchmark_format=json and repetitions, and stores every
+repetition in .cqs/bench.sqlite keyed by commit, preset, compiler and host.
+Each benchmark is compared against a baseline run with the Mann-Whitney U
+test; a significant slowdown of the median beyond the threshold fails the
+command (exit code 1), so it can gate CI.
+
+--compare A..B checks both revisions out into reused worktrees under
+.cqs/worktrees, builds them concurrently (sharing the compiler cache), and
+runs the two executables interleaved, one repetition per turn.
+
+--stable pins runs to one (preferably isolated) core with ASLR disabled,
+warns about governor, turbo and SMT settings, and adds warmup passes.
+Benchmarks whose coefficient of variation exceeds the noise threshold are
+reported as untrustworthy instead of being compared, and fail the gate.
+"""
+
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    ProgressBar,
+    Spinner,
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    red,
+    yellow,
+    dim,
+)
+from .accelerate import detect_accelerators
+from .git import current_commit, resolve_commit, is_dirty, checkout_worktree, merge_base, first_parents
+from .presets import configure_presets
+from .runner import (
+    variant_binary_dir,
+    configure_and_build,
+    configure_command,
+    build_command,
+    run_streamed,
+    find_executable,
+)
+from .state import project_state_dir
+
+
+DATABASE_FILE = "bench.sqlite"
+BENCH_TARGET = "benchmarks"
+
+BENCH_CACHE_VARIABLES = {
+    "CPP_QUICK_STARTER_BUILD_BENCHMARKS": "ON",
+    "CPP_QUICK_STARTER_BUILD_TESTS": "OFF",
+    "CPP_QUICK_STARTER_BUILD_EXAMPLES": "OFF",
+}
+
+DEFAULT_REPETITIONS = 10
+
+# A benchmark regresses when its median is this much slower and the difference is significant
+DEFAULT_THRESHOLD = 0.05
+DEFAULT_ALPHA = 0.01
+
+CONFIDENCE = 0.95
+BOOTSTRAP_RESAMPLES = 2000
+
+TIME_UNITS = {"ns": 1.0, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+# Coefficient of variation above which a benchmark's results are not trusted
+DEFAULT_NOISE = 0.05
+
+# Untrustworthy benchmarks fail the gate rather than being silently skipped
+NOISY_FAILURE = "Noisy benchmarks could not be compared; use --stable, more repetitions or a higher --noise."
+
+# Untimed passes before measuring in --stable mode (page cache, branch predictors, frequency ramp-up)
+STABLE_WARMUPS = 1
+
+SYS_CPU = Path("/sys/devices/system/cpu")
+
+# Reused worktrees for --compare, one per side, so rebuilds stay incremental
+WORKTREE_DIR = "worktrees"
+
+# How far back the default baseline is searched along the mainline's first parents
+BASELINE_SEARCH_DEPTH = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    commit_hash TEXT NOT NULL,
+    preset TEXT NOT NULL,
+    compiler TEXT NOT NULL,
+    host TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    passed INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    benchmark TEXT NOT NULL,
+    real_ns REAL NOT NULL,
+    cpu_ns REAL NOT NULL,
+    iterations INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (preset, compiler, host);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id);
+"""
+
+
+# ============================================================================
+# Build and Run
+# ============================================================================
+
+
+def build_benchmarks(root: Path, preset: str, binary_dir: Path, echo: bool = True) -> Optional[Path]:
+    """Configure and build the benchmark executable, returning its path."""
+    if not configure_and_build(root, preset, binary_dir, BENCH_CACHE_VARIABLES, [BENCH_TARGET], echo=echo):
+        return None
+    return find_executable(binary_dir, BENCH_TARGET)
+
+
+def compiler_id(binary_dir: Path) -> str:
+    """Return '<id> <version>' of the C++ compiler a build directory was configured with."""
+    for path in sorted((binary_dir / "CMakeFiles").glob("*/CMakeCXXCompiler.cmake")):
+        values = {}
+        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            for key in ("CMAKE_CXX_COMPILER_ID", "CMAKE_CXX_COMPILER_VERSION"):
+                if line.startswith(f"set({key} "):
+                    values[key] = line.split('"')[1] if '"' in line else ""
+        if values.get("CMAKE_CXX_COMPILER_ID"):
+            return f"{values['CMAKE_CXX_COMPILER_ID']} {values.get('CMAKE_CXX_COMPILER_VERSION', '')}".strip()
+    return "unknown"
+
+
+def host_id() -> str:
+    """Return the host key results are stored under."""
+    return f"{platform.node()} {platform.machine()}"
+
+
+def run_benchmarks(
+    executable: Path,
+    repetitions: int,
+    benchmark_filter: Optional[str] = None,
+    extra_args: Optional[List[str]] = None,
+    prefix: Optional[List[str]] = None,
+) -> Dict[str, List[Dict[str, float]]]:
+    """
+    Run a Google Benchmark executable and return its repetitions per benchmark.
+
+    Only individual repetitions are kept ({"real_ns", "cpu_ns", "iterations"});
+    aggregates (mean, median, stddev) are recomputed from them.
+    """
+    with tempfile.TemporaryDirectory(prefix="cqs-bench-") as tmp:
+        out = Path(tmp) / "results.json"
+        cmd = list(prefix or []) + [
+            str(executable),
+            "--benchmark_format=json",
+            f"--benchmark_out={out}",
+            "--benchmark_out_format=json",
+            f"--benchmark_repetitions={repetitions}",
+            "--benchmark_report_aggregates_only=false",
+        ]
+        if benchmark_filter:
+            cmd.append(f"--benchmark_filter={benchmark_filter}")
+        cmd += extra_args or []
+        result = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
+        if result.returncode != 0:
+            raise ValueError(f"{executable.name} failed: {(result.stderr or result.stdout).strip()[-2000:]}")
+        report = json.loads(out.read_text(encoding="utf-8"))
+
+    runs: Dict[str, List[Dict[str, float]]] = {}
+    for entry in report.get("benchmarks", []):
+        if entry.get("run_type", "iteration") != "iteration" or entry.get("error_occurred"):
+            continue
+        scale = TIME_UNITS.get(entry.get("time_unit", "ns"), 1.0)
+        runs.setdefault(entry.get("run_name", entry["name"]), []).append(
+            {
+                "real_ns": float(entry["real_time"]) * scale,
+                "cpu_ns": float(entry["cpu_time"]) * scale,
+                "iterations": int(entry.get("iterations", 0)),
+            }
+        )
+    return runs
+
+
+# ============================================================================
+# Stable Mode
+# ============================================================================
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parse a kernel CPU list such as '0-3,8'."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.extend(range(int(first), int(last) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read_sys(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def pick_cpu() -> Tuple[int, bool]:
+    """
+    Return (cpu, isolated): an isolated core (isolcpus=) we may run on, or
+    else the highest-numbered allowed core, which is least likely to handle
+    housekeeping work and interrupts.
+    """
+    allowed = sorted(os.sched_getaffinity(0))
+    isolated = [c for c in parse_cpu_list(_read_sys(SYS_CPU / "isolated") or "") if c in allowed]
+    return (isolated[-1], True) if isolated else (allowed[-1], False)
+
+
+def noise_warnings(cpu: int, isolated: bool) -> List[str]:
+    """Return warnings about CPU settings that make timings noisy."""
+    warnings = []
+    if not isolated:
+        warnings.append(f"No isolated cores (isolcpus=); CPU {cpu} is shared with other work.")
+
+    governor = _read_sys(SYS_CPU / f"cpu{cpu}" / "cpufreq" / "scaling_governor")
+    if governor and governor != "performance":
+        warnings.append(f"CPU {cpu} frequency governor is '{governor}', not 'performance'.")
+
+    no_turbo = _read_sys(SYS_CPU / "intel_pstate" / "no_turbo")
+    boost = _read_sys(SYS_CPU / "cpufreq" / "boost")
+    if no_turbo == "0" or boost == "1":
+        warnings.append("Turbo boost is enabled; clock speed depends on temperature and load.")
+
+    siblings = parse_cpu_list(_read_sys(SYS_CPU / f"cpu{cpu}" / "topology" / "thread_siblings_list") or "")
+    others = [c for c in siblings if c != cpu]
+    if others:
+        warnings.append(f"CPU {cpu} shares a physical core with SMT sibling(s) {', '.join(map(str, others))}.")
+    return warnings
+
+
+def stable_prefix(cpu: int) -> Tuple[List[str], List[str]]:
+    """
+    Return (command prefix, warnings) pinning a run to cpu with ASLR disabled.
+
+    Without taskset, cmd_bench pins its own process instead (children inherit it).
+    """
+    prefix: List[str] = []
+    warnings = []
+    taskset = shutil.which("taskset")
+    if taskset:
+        prefix += [taskset, "-c", str(cpu)]
+    setarch = shutil.which("setarch")
+    if setarch:
+        prefix += [setarch, platform.machine(), "-R"]
+    else:
+        warnings.append("setarch not found; address space layout randomization stays enabled.")
+    return prefix, warnings
+
+
+def enter_stable_mode() -> List[str]:
+    """
+    Pin benchmark runs to one core with ASLR disabled and print noise warnings.
+
+    Returns the command prefix for benchmark runs.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        print_warning("--stable pinning and ASLR control need Linux; running unpinned.")
+        return []
+
+    cpu, isolated = pick_cpu()
+    prefix, warnings = stable_prefix(cpu)
+    if not prefix or Path(prefix[0]).name != "taskset":
+        # Children inherit our affinity
+        os.sched_setaffinity(0, {cpu})
+    warnings = noise_warnings(cpu, isolated) + warnings
+
+    print_box(
+        [
+            f"Pinned to:  {cyan(f'CPU {cpu}')} {dim('(isolated)' if isolated else '(shared)')}",
+            f"ASLR:       {cyan('disabled') if any(Path(a).name == 'setarch' for a in prefix) else dim('enabled')}",
+            f"Warmups:    {cyan(str(STABLE_WARMUPS))}",
+        ],
+        title="Stable Mode",
+    )
+    for warning in warnings:
+        print_warning(warning)
+    print()
+    return prefix
+
+
+def warm_up(executables: List[Path], benchmark_filter: Optional[str], prefix: List[str]) -> None:
+    """Run each executable untimed STABLE_WARMUPS times."""
+    for _ in range(STABLE_WARMUPS):
+        for executable in executables:
+            run_benchmarks(executable, 1, benchmark_filter, prefix=prefix)
+
+
+def coefficient_of_variation(values: List[float]) -> float:
+    """Return stdev / mean (0 for fewer than two values)."""
+    if len(values) < 2:
+        return 0.0
+    mean = statistics.fmean(values)
+    return statistics.stdev(values) / mean if mean else 0.0
+
+
+def noisy_benchmarks(samples: Dict[str, List[float]], noise: float) -> List[str]:
+    """Return the benchmarks whose repetitions vary more than noise."""
+    return sorted(name for name, values in samples.items() if coefficient_of_variation(values) > noise)
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+
+def open_history(root: Path) -> sqlite3.Connection:
+    """Open (and create) the benchmark history database."""
+    db = sqlite3.connect(str(project_state_dir(root) / DATABASE_FILE))
+    db.executescript(SCHEMA)
+    columns = {row[1] for row in db.execute("PRAGMA table_info(runs)")}
+    if "passed" not in columns:
+        with db:
+            db.execute("ALTER TABLE runs ADD COLUMN passed INTEGER NOT NULL DEFAULT 1")
+    return db
+
+
+def store_run(db: sqlite3.Connection, key: Dict[str, str], runs: Dict[str, List[Dict[str, float]]], repetitions: int) -> int:
+    """Store one benchmark run and return its id."""
+    with db:
+        cursor = db.execute(
+            "INSERT INTO runs (time, commit_hash, preset, compiler, host, repetitions) VALUES (?, ?, ?, ?, ?, ?)",
+            (int(time.time()), key["commit"], key["preset"], key["compiler"], key["host"], repetitions),
+        )
+        run_id = int(cursor.lastrowid or 0)
+        db.executemany(
+            "INSERT INTO samples (run_id, benchmark, real_ns, cpu_ns, iterations) VALUES (?, ?, ?, ?, ?)",
+            [(run_id, name, s["real_ns"], s["cpu_ns"], s["iterations"]) for name, samples in runs.items() for s in samples],
+        )
+    return run_id
+
+
+def mark_failed(db: sqlite3.Connection, run_id: int) -> None:
+    """Record that a run failed the gate, so it never becomes a baseline."""
+    with db:
+        db.execute("UPDATE runs SET passed = 0 WHERE id = ?", (run_id,))
+
+
+def find_baseline(
+    db: sqlite3.Connection,
+    key: Dict[str, str],
+    before: int,
+    commit: Optional[str] = None,
+    candidates: Optional[List[str]] = None,
+    noise: Optional[float] = None,
+) -> Optional[Tuple[int, str]]:
+    """
+    Return (run id, commit) of an earlier run with the same preset, compiler
+    and host to compare against.
+
+    Runs that failed the gate, runs of modified trees ('-dirty') and, with
+    noise, runs with a benchmark noisier than that are never used. With
+    commit, the latest run of that commit is returned; with candidates (full
+    hashes, nearest first), the latest run of the nearest candidate that has
+    one; otherwise the latest run.
+    """
+    query = (
+        "SELECT id, commit_hash FROM runs WHERE preset = ? AND compiler = ? AND host = ? AND id < ?"
+        " AND passed != 0 AND commit_hash NOT LIKE '%-dirty'"
+    )
+    params: List[Any] = [key["preset"], key["compiler"], key["host"], before]
+    if commit:
+        query += " AND commit_hash = ?"
+        params.append(commit)
+    rows = [(int(run_id), str(stored)) for run_id, stored in db.execute(query + " ORDER BY id DESC", params)]
+
+    def usable(run_id: int) -> bool:
+        # Runs recorded before noisy runs were marked failed may still be too noisy to compare against
+        return noise is None or not noisy_benchmarks(load_samples(db, run_id), noise)
+
+    if commit or candidates is None:
+        return next((run for run in rows if usable(run[0])), None)
+
+    # Stored hashes are abbreviated; the newest usable run per commit wins
+    by_commit: Dict[str, List[Tuple[int, str]]] = {}
+    for run in rows:
+        by_commit.setdefault(run[1], []).append(run)
+    for full in candidates:
+        for stored, runs in by_commit.items():
+            if full.startswith(stored):
+                run = next((r for r in runs if usable(r[0])), None)
+                if run:
+                    return run
+    return None
+
+
+def load_samples(db: sqlite3.Connection, run_id: int) -> Dict[str, List[float]]:
+    """Return real-time samples (ns) per benchmark of a stored run."""
+    samples: Dict[str, List[float]] = {}
+    for name, real_ns in db.execute("SELECT benchmark, real_ns FROM samples WHERE run_id = ?", (run_id,)):
+        samples.setdefault(name, []).append(real_ns)
+    return samples
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+
+def mann_whitney_u(a: List[float], b: List[float]) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test (normal approximation with tie and continuity correction).
+
+    Returns (U of a, p-value). Robust to the outliers and skew typical of timings.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    ties = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        count = j - i + 1
+        ties += count**3 - count
+        i = j + 1
+
+    rank_sum = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_ci(
+    a: List[float],
+    b: List[float],
+    confidence: float = CONFIDENCE,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+) -> Tuple[float, float]:
+    """
+    Return a percentile-bootstrap confidence interval for the relative change
+    of the median from a to b (0.05 = 5% slower).
+    """
+    rng = random.Random(0)  # reproducible tables
+    changes = []
+    for _ in range(resamples):
+        before = statistics.median(rng.choices(a, k=len(a)))
+        after = statistics.median(rng.choices(b, k=len(b)))
+        if before:
+            changes.append((after - before) / before)
+    if not changes:
+        return 0.0, 0.0
+    changes.sort()
+    tail = (1 - confidence) / 2
+    return changes[int(tail * (len(changes) - 1))], changes[int((1 - tail) * (len(changes) - 1))]
+
+
+def compare_runs(
+    baseline: Dict[str, List[float]],
+    current: Dict[str, List[float]],
+    threshold: float,
+    alpha: float,
+    noise: float = DEFAULT_NOISE,
+) -> List[Dict[str, Any]]:
+    """
+    Compare medians of every benchmark present in both runs.
+
+    Benchmarks whose repetitions vary more than noise (coefficient of
+    variation) on either side get the verdict 'noisy' instead of a comparison.
+    """
+    rows = []
+    for name in sorted(current):
+        if name not in baseline:
+            continue
+        before = statistics.median(baseline[name])
+        after = statistics.median(current[name])
+        change = (after - before) / before if before else 0.0
+        _, p = mann_whitney_u(baseline[name], current[name])
+        significant = p < alpha and abs(change) >= threshold
+        cv = max(coefficient_of_variation(baseline[name]), coefficient_of_variation(current[name]))
+        rows.append(
+            {
+                "name": name,
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "ci": bootstrap_ci(baseline[name], current[name]),
+                "p": p,
+                "cv": cv,
+                "verdict": "noisy"
+                if cv > noise
+                else ("regression" if change > 0 else "improvement")
+                if significant
+                else "same",
+            }
+        )
+    return rows
+
+
+def format_ns(value: float) -> str:
+    """Format a duration in nanoseconds with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value:.1f} ns"
+
+
+def comparison_rows(rows: List[Dict[str, Any]], labels: Tuple[str, str] = ("Baseline", "Current")) -> List[str]:
+    """Render compare_runs() output as table lines."""
+    width = max([len(r["name"]) for r in rows] + [9])
+    ci_header = f"{CONFIDENCE * 100:.0f}% CI"
+    lines = [
+        dim(
+            f"{'Benchmark':<{width}} {labels[0][:11]:>11} {labels[1][:11]:>11} "
+            f"{'Change':>8} {ci_header:>17} {'p':>7} {'CV':>6}"
+        )
+    ]
+    for r in rows:
+        change = f"{r['change'] * 100:+.1f}%"
+        if r["verdict"] == "regression":
+            change = red(f"{change:>8}")
+        elif r["verdict"] == "improvement":
+            change = green(f"{change:>8}")
+        else:
+            change = dim(f"{change:>8}")
+        ci = f"[{r['ci'][0] * 100:+.1f}, {r['ci'][1] * 100:+.1f}]"
+        cv = f"{r['cv'] * 100:.1f}%"
+        cv = yellow(f"{cv:>6}") if r["verdict"] == "noisy" else dim(f"{cv:>6}")
+        lines.append(
+            f"{r['name']:<{width}} {format_ns(r['baseline']):>11} {format_ns(r['current']):>11} "
+            f"{change} {dim(f'{ci:>17}')} {r['p']:>7.3f} {cv}"
+        )
+    return lines
+
+
+def report_noisy(rows: List[Dict[str, Any]], noise: float) -> None:
+    """Warn about benchmarks left uncompared because their results are too noisy."""
+    noisy = [r["name"] for r in rows if r["verdict"] == "noisy"]
+    if noisy:
+        print_warning(
+            f"Untrustworthy (CV > {noise * 100:.0f}%), not compared: {', '.join(noisy)}. "
+            "Try --stable or more repetitions."
+        )
+
+
+# ============================================================================
+# Revision Comparison
+# ============================================================================
+
+
+def parse_range(spec: str) -> Tuple[str, str]:
+    """Split 'A..B' into its revisions (an empty side means HEAD)."""
+    if ".." not in spec or "..." in spec:
+        raise ValueError(f"Expected a revision range A..B, got: {spec}")
+    a, b = spec.split("..", 1)
+    return a or "HEAD", b or "HEAD"
+
+
+def build_revision(
+    worktree: Path,
+    preset: str,
+    cache_vars: Dict[str, str],
+    env: Dict[str, str],
+) -> Tuple[Optional[Path], List[str]]:
+    """Build the benchmarks of a worktree quietly, returning (executable, output)."""
+    binary_dir = variant_binary_dir(worktree, preset, "bench")
+    output: List[str] = []
+    for cmd in (configure_command(preset, binary_dir, cache_vars), build_command(binary_dir, [BENCH_TARGET])):
+        code, lines = run_streamed(cmd, cwd=worktree, env=env, echo=False)
+        output += lines
+        if code != 0:
+            return None, output
+    return find_executable(binary_dir, BENCH_TARGET), output
+
+
+def interleaved_runs(
+    executables: List[Path],
+    labels: List[str],
+    rounds: int,
+    benchmark_filter: Optional[str],
+    prefix: Optional[List[str]] = None,
+) -> List[Dict[str, List[Dict[str, float]]]]:
+    """
+    Run the executables alternately (ABAB...), one repetition per turn, so
+    slow drift (thermal throttling, background load) affects both sides alike.
+    """
+    results: List[Dict[str, List[Dict[str, float]]]] = [{} for _ in executables]
+    with ProgressBar(rounds * len(executables), prefix="  ") as progress:
+        for i in range(rounds):
+            for side, executable in enumerate(executables):
+                for name, samples in run_benchmarks(executable, 1, benchmark_filter, prefix=prefix).items():
+                    results[side].setdefault(name, []).extend(samples)
+                progress.update(message=f"round {i + 1}/{rounds}: {labels[side]}")
+    return results
+
+
+def run_comparison(
+    root: Path,
+    preset: str,
+    spec: str,
+    rounds: int,
+    benchmark_filter: Optional[str],
+    threshold: float,
+    alpha: float,
+    noise: float,
+    prefix: Optional[List[str]] = None,
+) -> bool:
+    """Build two revisions in parallel worktrees and compare them with interleaved runs."""
+    refs = parse_range(spec)
+    commits = [resolve_commit(root, ref) for ref in refs]
+
+    worktrees = [project_state_dir(root) / WORKTREE_DIR / f"bench-{side}" for side in ("a", "b")]
+    for worktree, commit in zip(worktrees, commits):
+        checkout_worktree(root, worktree, commit)
+        if preset not in configure_presets(worktree):
+            print_error(f"Preset {preset} does not exist at {commit}")
+            return False
+
+    # Both sides share the user's compiler cache; a common base dir makes hits path-independent
+    cache_vars = dict(BENCH_CACHE_VARIABLES)
+    env = dict(os.environ)
+    launcher = detect_accelerators()["launcher"]
+    if launcher:
+        cache_vars["CMAKE_C_COMPILER_LAUNCHER"] = launcher
+        cache_vars["CMAKE_CXX_COMPILER_LAUNCHER"] = launcher
+        env.setdefault("CCACHE_BASEDIR", str(root))
+        env.setdefault("CCACHE_NOHASHDIR", "true")
+
+    with Spinner(f"Building {refs[0]} ({commits[0]}) and {refs[1]} ({commits[1]}) in parallel...") as spinner:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            builds = list(pool.map(lambda w: build_revision(w, preset, cache_vars, env), worktrees))
+        failed = [commit for commit, (executable, _) in zip(commits, builds) if executable is None]
+        if failed:
+            spinner.fail(f"Build failed at {', '.join(failed)}")
+        else:
+            spinner.succeed(f"Built both revisions{f' (with {launcher})' if launcher else ''}")
+    for commit, (executable, output) in zip(commits, builds):
+        if executable is None:
+            print(dim(f"--- {commit} ---"))
+            for line in output[-30:]:
+                print(f"  {line}")
+    if failed:
+        return False
+    print()
+
+    executables = [executable for executable, _ in builds if executable is not None]
+    if prefix is not None:
+        warm_up(executables, benchmark_filter, prefix)
+    print_info(f"Running {cyan(str(rounds))} interleaved rounds (ABAB...)")
+    results = interleaved_runs(executables, list(refs), rounds, benchmark_filter, prefix)
+    print()
+
+    db = open_history(root)
+    try:
+        for worktree, commit, runs in zip(worktrees, commits, results):
+            key = {
+                "commit": commit,
+                "preset": preset,
+                "compiler": compiler_id(variant_binary_dir(worktree, preset, "bench")),
+                "host": host_id(),
+            }
+            run_id = store_run(db, key, runs, rounds)
+            if noisy_benchmarks({name: [s["real_ns"] for s in samples] for name, samples in runs.items()}, noise):
+                mark_failed(db, run_id)
+    finally:
+        db.close()
+
+    samples = [{name: [s["real_ns"] for s in runs] for name, runs in side.items()} for side in results]
+    rows = compare_runs(samples[0], samples[1], threshold, alpha, noise)
+    if not rows:
+        print_error("The two revisions have no benchmarks in common.")
+        return False
+    print_box(comparison_rows(rows, refs), title=f"{refs[0]} ({commits[0]}) .. {refs[1]} ({commits[1]})")
+    print()
+    report_noisy(rows, noise)
+
+    regressions = [r for r in rows if r["verdict"] == "regression"]
+    improvements = [r for r in rows if r["verdict"] == "improvement"]
+    if improvements:
+        print_success(f"Faster in {refs[1]}: {', '.join(r['name'] for r in improvements)}")
+    if regressions:
+        print_error(f"Slower in {refs[1]}: {', '.join(r['name'] for r in regressions)}")
+    noisy = [r for r in rows if r["verdict"] == "noisy"]
+    if noisy:
+        print_error(NOISY_FAILURE)
+    if regressions or noisy:
+        return False
+    print_success("No significant regressions.")
+    return True
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_bench(
+    root: Optional[Path] = None,
+    preset: str = "ninja-release",
+    repetitions: int = DEFAULT_REPETITIONS,
+    benchmark_filter: Optional[str] = None,
+    baseline: Optional[str] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    build: bool = True,
+    compare: Optional[str] = None,
+    stable: bool = False,
+    noise: float = DEFAULT_NOISE,
+) -> bool:
+    """Run benchmarks, record them, and fail on significant regressions."""
+    print_banner(
+        "Benchmarks",
+        f"Google Benchmark for preset {preset}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+    prefix = enter_stable_mode() if stable else None
+    if compare:
+        return run_comparison(root, preset, compare, repetitions, benchmark_filter, threshold, alpha, noise, prefix)
+    if baseline:
+        baseline = resolve_commit(root, baseline)
+        candidates = None
+    else:
+        # The mainline commit this branch forks from (or its nearest benchmarked
+        # ancestor) is a stable reference: retrying a failed run cannot lower it
+        candidates = first_parents(root, merge_base(root) or "HEAD", BASELINE_SEARCH_DEPTH)
+
+    binary_dir = variant_binary_dir(root, preset, "bench")
+    executable = build_benchmarks(root, preset, binary_dir) if build else find_executable(binary_dir, BENCH_TARGET)
+    if executable is None:
+        print_error("Benchmark build failed." if build else "Benchmarks not built yet; run without --no-build.")
+        return False
+    print()
+
+    if prefix is not None:
+        warm_up([executable], benchmark_filter, prefix)
+    print_info(f"Running {cyan(executable.name)} with {cyan(str(repetitions))} repetitions...")
+    runs = run_benchmarks(executable, repetitions, benchmark_filter, prefix=prefix)
+    if not runs:
+        print_error("No benchmark results.")
+        return False
+
+    key = {
+        # Runs of uncommitted trees are stored as <commit>-dirty and never serve as a baseline
+        "commit": current_commit(root) + ("-dirty" if is_dirty(root) else ""),
+        "preset": preset,
+        "compiler": compiler_id(binary_dir),
+        "host": host_id(),
+    }
+    current = {name: [s["real_ns"] for s in samples] for name, samples in runs.items()}
+    noisy_names = noisy_benchmarks(current, noise)
+    db = open_history(root)
+    try:
+        run_id = store_run(db, key, runs, repetitions)
+        if noisy_names:
+            # A noisy run would make every later comparison against it noisy too
+            mark_failed(db, run_id)
+        reference = find_baseline(db, key, run_id, baseline, candidates, noise)
+        baseline_samples = load_samples(db, reference[0]) if reference else {}
+    finally:
+        db.close()
+    print()
+    print_box(
+        [
+            f"Commit:    {cyan(key['commit'])}",
+            f"Compiler:  {cyan(key['compiler'])}",
+            f"Host:      {cyan(key['host'])}",
+            f"Baseline:  {cyan(reference[1]) if reference else dim('none')}",
+        ],
+        title="Run",
+    )
+    print()
+
+    if not reference:
+        lines = []
+        for name, values in sorted(current.items()):
+            cv = coefficient_of_variation(values)
+            cv_text = f"CV {cv * 100:.1f}%"
+            lines.append(f"{name:<40} {format_ns(statistics.median(values)):>11}  {yellow(cv_text) if cv > noise else dim(cv_text)}")
+        print_box(lines, title="Medians")
+        print()
+        if baseline:
+            print_error(f"No stored passing run of {baseline} for this preset, compiler and host.")
+            return False
+        if noisy_names:
+            print_error(f"Too noisy to serve as a baseline (CV > {noise * 100:.0f}%): {', '.join(noisy_names)}.")
+            print_error(NOISY_FAILURE)
+            return False
+        print_info(
+            "No baseline for this preset, compiler and host yet. Passing runs of mainline commits "
+            "become the baseline of later runs; --baseline REF picks one explicitly."
+        )
+        return True
+
+    rows = compare_runs(baseline_samples, current, threshold, alpha, noise)
+    if rows:
+        print_box(comparison_rows(rows), title=f"vs {reference[1]}")
+        print()
+    report_noisy(rows, noise)
+    new = sorted(set(current) - set(baseline_samples))
+    if new:
+        print_info(f"New benchmarks without a baseline: {', '.join(new)}")
+
+    regressions = [r for r in rows if r["verdict"] == "regression"]
+    if regressions:
+        print_error(
+            f"{len(regressions)} significant regression(s) "
+            f"(slower by >= {threshold * 100:.0f}%, p < {alpha}): {', '.join(r['name'] for r in regressions)}"
+        )
+    noisy = [r for r in rows if r["verdict"] == "noisy"]
+    if noisy:
+        print_error(NOISY_FAILURE)
+    if regressions or noisy:
+        db = open_history(root)
+        try:
+            mark_failed(db, run_id)
+        finally:
+            db.close()
+        return False
+
+    if any(r["verdict"] == "same" and r["change"] >= threshold for r in rows):
+        print_warning("Some medians moved beyond the threshold but not significantly; consider more repetitions.")
+    print_success("No significant regressions.")
+    return True
@@ -0,0 +1,499 @@
+"""
+Binary cache command - file-based vcpkg/Conan binary caching.
+
+Conan gets a project-scoped CONAN_HOME (.cqs/conan) whose global.conf moves
+the package storage into the shared cache and which links the user's
+profiles and remotes; the user's own Conan home is never modified.
+
+    cqs cache setup [--dir PATH]
+    cqs cache stats
+    cqs cache prune [--max-age DAYS] [--max-size SIZE] [--dry-run]
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_list,
+    print_success,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    green,
+    dim,
+)
+from .presets import configure_presets, resolve_cache_variables, update_user_presets
+from .state import (
+    user_cache_dir,
+    project_state_dir,
+    load_json,
+    save_json,
+    format_size,
+)
+
+
+ENV_FILE = "cache.env"
+CONFIG_FILE = "bincache.json"
+PRESET_SUFFIX = "-bincache"
+
+# Project-scoped Conan home under .cqs/, and the user-home entries it links to
+CONAN_HOME_DIR = "conan"
+CONAN_SHARED_ENTRIES = ("profiles", "remotes.json", "settings_user.yml")
+CONAN_STORAGE_CONF = "core.cache:storage_path"
+CONAN_TIMEOUT = 30.0
+
+# Hook in the project Conan home that records package use and builds for cache stats
+CONAN_EVENTS_FILE = "conan-events.jsonl"
+CONAN_HOOK = """\
+import json
+import time
+
+EVENTS = {events!r}
+
+
+def _record(conanfile, event):
+    ref = str(getattr(conanfile, "ref", None) or conanfile.name)
+    with open(EVENTS, "a", encoding="utf-8") as f:
+        f.write(json.dumps({{"time": int(time.time()), "ref": ref, "event": event}}) + "\\n")
+
+
+def post_build(conanfile):
+    _record(conanfile, "build")
+
+
+def post_package_info(conanfile):
+    _record(conanfile, "use")
+"""
+
+
+# ============================================================================
+# Manifest Detection
+# ============================================================================
+
+
+def vcpkg_dependencies(root: Path) -> List[str]:
+    """Return dependency names from vcpkg.json."""
+    data = load_json(root / "vcpkg.json", {}) or {}
+    deps = []
+    for dep in data.get("dependencies", []):
+        deps.append(dep["name"] if isinstance(dep, dict) else dep)
+    return deps
+
+
+def conan_requirements(root: Path) -> List[str]:
+    """Return the [requires] entries of conanfile.txt."""
+    conan_path = root / "conanfile.txt"
+    if not conan_path.exists():
+        return []
+
+    requires = []
+    section = ""
+    for line in conan_path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1]
+        elif section == "requires":
+            requires.append(line)
+    return requires
+
+
+def _escape_vcpkg_path(path: Path) -> str:
+    """Escape a path for use inside VCPKG_BINARY_SOURCES."""
+    return re.sub(r"([,;`])", r"`\1", str(path))
+
+
+def _cache_dirs(root: Path) -> Dict[str, Path]:
+    """Return the configured cache directories for this project."""
+    config = load_json(root / ".cqs" / CONFIG_FILE, {}) or {}
+    base = Path(config["dir"]) if "dir" in config else user_cache_dir() / "binary"
+    return {"vcpkg": base / "vcpkg", "conan": base / "conan"}
+
+
+def user_conan_home(root: Path) -> Path:
+    """Return the user's own Conan home, ignoring CONAN_HOME when it is this project's."""
+    project_home = project_state_dir(root) / CONAN_HOME_DIR
+    env = dict(os.environ)
+    if env.get("CONAN_HOME") and Path(env["CONAN_HOME"]).expanduser().resolve() == project_home.resolve():
+        del env["CONAN_HOME"]
+
+    conan = shutil.which("conan")
+    if conan:
+        try:
+            result = subprocess.run([conan, "config", "home"], env=env, capture_output=True, text=True, timeout=CONAN_TIMEOUT)
+            if result.returncode == 0 and result.stdout.strip():
+                return Path(result.stdout.strip().splitlines()[-1])
+        except subprocess.TimeoutExpired:
+            pass
+    return Path(env["CONAN_HOME"]).expanduser() if env.get("CONAN_HOME") else Path.home() / ".conan2"
+
+
+def write_conan_home(root: Path, storage: Path) -> Tuple[Path, List[str]]:
+    """
+    Create the project Conan home: the user's global.conf with the storage
+    moved to storage, links to the user's profiles and remotes, and the
+    statistics hook. Returns (home, names of the linked user entries).
+    """
+    user_home = user_conan_home(root)
+    home = project_state_dir(root) / CONAN_HOME_DIR
+    home.mkdir(parents=True, exist_ok=True)
+
+    user_conf = user_home / "global.conf"
+    lines = user_conf.read_text(encoding="utf-8").splitlines() if user_conf.exists() else []
+    lines = [line for line in lines if not line.strip().startswith(f"{CONAN_STORAGE_CONF}=")]
+    lines.append(f"{CONAN_STORAGE_CONF}={storage}")
+    (home / "global.conf").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    linked = []
+    for name in CONAN_SHARED_ENTRIES:
+        source, target = user_home / name, home / name
+        if not source.exists():
+            continue
+        if target.is_symlink() or target.is_file():
+            target.unlink()
+        elif target.is_dir():
+            shutil.rmtree(target)
+        try:
+            target.symlink_to(source, target_is_directory=source.is_dir())
+        except OSError:
+            # No symlink privilege (Windows): fall back to a snapshot
+            if source.is_dir():
+                shutil.copytree(source, target)
+            else:
+                shutil.copy2(source, target)
+        linked.append(name)
+
+    hooks = home / "extensions" / "hooks"
+    hooks.mkdir(parents=True, exist_ok=True)
+    events = project_state_dir(root) / CONAN_EVENTS_FILE
+    (hooks / "hook_cqs_stats.py").write_text(CONAN_HOOK.format(events=str(events)), encoding="utf-8")
+    return home, linked
+
+
+# ============================================================================
+# Setup
+# ============================================================================
+
+
+def cmd_cache_setup(root: Optional[Path] = None, cache_dir: Optional[str] = None) -> bool:
+    """Configure file-based binary caches for vcpkg and Conan."""
+    print_banner(
+        "Binary Cache",
+        "Reuse prebuilt vcpkg/Conan packages across builds",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+
+    vcpkg_deps = vcpkg_dependencies(root)
+    conan_deps = conan_requirements(root)
+    has_vcpkg = (root / "vcpkg.json").exists()
+    has_conan = (root / "conanfile.txt").exists()
+
+    if not has_vcpkg and not has_conan:
+        print_error("No package manager configuration found.")
+        print_info("Create vcpkg.json or conanfile.txt first.")
+        return False
+
+    state_dir = project_state_dir(root)
+    if cache_dir:
+        save_json(state_dir / CONFIG_FILE, {"dir": str(Path(cache_dir).expanduser().resolve())}, indent=2)
+    dirs = _cache_dirs(root)
+
+    env: Dict[str, str] = {}
+    if has_vcpkg:
+        dirs["vcpkg"].mkdir(parents=True, exist_ok=True)
+        env["VCPKG_BINARY_SOURCES"] = f"clear;files,{_escape_vcpkg_path(dirs['vcpkg'])},readwrite"
+    linked: List[str] = []
+    if has_conan:
+        dirs["conan"].mkdir(parents=True, exist_ok=True)
+        home, linked = write_conan_home(root, dirs["conan"])
+        env["CONAN_HOME"] = str(home)
+
+    # Environment file for CI and shells (dotenv syntax, GITHUB_ENV compatible)
+    env_path = state_dir / ENV_FILE
+    env_path.write_text("".join(f"{k}={v}\n" for k, v in env.items()), encoding="utf-8")
+
+    # User presets that inherit the vcpkg presets and add the cache environment
+    created: List[str] = []
+    if has_vcpkg:
+        presets = configure_presets(root)
+        configure, build = [], []
+        for name, preset in presets.items():
+            if preset.get("hidden") or name.endswith(PRESET_SUFFIX):
+                continue
+            toolchain = resolve_cache_variables(presets, name).get("CMAKE_TOOLCHAIN_FILE", "")
+            if "vcpkg" not in toolchain:
+                continue
+            cached_name = name + PRESET_SUFFIX
+            configure.append(
+                {
+                    "name": cached_name,
+                    "displayName": f"{preset.get('displayName', name)} (binary cache)",
+                    "inherits": name,
+                    "environment": {"VCPKG_BINARY_SOURCES": env["VCPKG_BINARY_SOURCES"]},
+                }
+            )
+            build.append({"name": cached_name, "configurePreset": cached_name})
+            created.append(cached_name)
+        if configure:
+            update_user_presets(root, configure=configure, build=build)
+
+    print_box(
+        [f"{k}={cyan(v)}" for k, v in env.items()]
+        + ([f"{CONAN_STORAGE_CONF}={cyan(str(dirs['conan']))} {dim('(in CONAN_HOME/global.conf)')}"] if has_conan else []),
+        title="Cache Environment",
+    )
+    print()
+
+    if has_vcpkg:
+        print_info(f"vcpkg dependencies: {cyan(', '.join(vcpkg_deps) or '(none)')}")
+    if has_conan:
+        print_info(f"Conan requirements: {cyan(', '.join(conan_deps) or '(none)')}")
+    print()
+
+    print_success(f"Wrote {cyan(str(env_path.relative_to(root)))}")
+    if has_conan:
+        shared = f"; linked {', '.join(linked)} from your Conan home" if linked else ""
+        print_success(f"Wrote project Conan home {cyan(env['CONAN_HOME'])}{shared}")
+    if created:
+        print_success(f"Added user presets: {cyan(', '.join(created))}")
+
+    print()
+    print_list(
+        [
+            f"Shell: {dim('set -a; . .cqs/cache.env; set +a')}",
+            f"GitHub Actions: {dim('cat .cqs/cache.env >> $GITHUB_ENV')}",
+        ]
+        + ([f"CMake: {dim(f'cmake --preset {created[0]}')}"] if created else [])
+        + ([f"Conan: {dim('conan profile detect --exist-ok')} (no profiles found)"] if has_conan and "profiles" not in linked else [])
+    )
+    print()
+
+    return True
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+
+def _scan_files(directory: Path, pattern: str = "*") -> List[Tuple[Path, os.stat_result]]:
+    if not directory.exists():
+        return []
+    return [(p, p.stat()) for p in directory.rglob(pattern) if p.is_file()]
+
+
+def _last_use(st: os.stat_result) -> float:
+    return max(st.st_atime, st.st_mtime)
+
+
+def vcpkg_log_stats(root: Path) -> Dict[str, int]:
+    """Sum restored (hit) and built (miss) packages from vcpkg manifest logs."""
+    hits = misses = 0
+    build_dir = root / "build"
+    logs = list(build_dir.glob("vcpkg-manifest-install.log")) + list(
+        build_dir.glob("*/vcpkg-manifest-install.log")
+    )
+    for log in logs:
+        try:
+            content = log.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        hits += sum(int(n) for n in re.findall(r"Restored (\d+) package", content))
+        misses += len(re.findall(r"^Building \S+", content, flags=re.MULTILINE))
+    return {"hits": hits, "misses": misses, "logs": len(logs)}
+
+
+def conan_event_stats(root: Path) -> Dict[str, int]:
+    """Count packages reused (hit) and built (miss) from the project Conan home's hook log."""
+    events = root / ".cqs" / CONAN_EVENTS_FILE
+    uses = builds = 0
+    if events.exists():
+        for line in events.read_text(encoding="utf-8", errors="replace").splitlines():
+            try:
+                event = json.loads(line).get("event")
+            except (ValueError, AttributeError):
+                continue
+            uses += event == "use"
+            builds += event == "build"
+    # Built packages also report their package_info, so every build is one of the uses
+    return {"hits": max(uses - builds, 0), "misses": builds}
+
+
+def cmd_cache_stats(root: Optional[Path] = None) -> bool:
+    """Report binary cache size and hit/miss statistics."""
+    print_banner(
+        "Binary Cache",
+        "Cache statistics",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    dirs = _cache_dirs(root)
+
+    for backend, directory in dirs.items():
+        files = _scan_files(directory, "*.zip" if backend == "vcpkg" else "*")
+        total = sum(st.st_size for _, st in files)
+        lines = [
+            f"Location:  {cyan(str(directory))}",
+            f"Size:      {cyan(format_size(total))}",
+        ]
+
+        if backend == "vcpkg":
+            lines.append(f"Archives:  {cyan(str(len(files)))}")
+            log_stats = vcpkg_log_stats(root)
+            lookups = log_stats["hits"] + log_stats["misses"]
+            if lookups:
+                rate = 100.0 * log_stats["hits"] / lookups
+                logs = log_stats["logs"]
+                lines.append(
+                    f"Hits:      {green(str(log_stats['hits']))} / {lookups} ({rate:.0f}%) "
+                    + dim(f"from {logs} log(s)")
+                )
+                lines.append(f"Misses:    {cyan(str(log_stats['misses']))}")
+            else:
+                lines.append(f"Hits:      {dim('no vcpkg-manifest-install.log under build/')}")
+        else:
+            # With core.cache:storage_path, package folders sit directly in the storage ("b" holds builds)
+            count = sum(1 for p in directory.iterdir() if p.is_dir() and p.name != "b") if directory.exists() else 0
+            lines.append(f"Packages:  {cyan(str(count))}")
+            event_stats = conan_event_stats(root)
+            lookups = event_stats["hits"] + event_stats["misses"]
+            if lookups:
+                rate = 100.0 * event_stats["hits"] / lookups
+                lines.append(f"Hits:      {green(str(event_stats['hits']))} / {lookups} ({rate:.0f}%)")
+                lines.append(f"Misses:    {cyan(str(event_stats['misses']))}")
+            else:
+                lines.append(f"Hits:      {dim('no conan install with the project CONAN_HOME yet')}")
+
+        if files:
+            oldest = min(_last_use(st) for _, st in files)
+            age_days = (time.time() - oldest) / 86400
+            lines.append(f"Oldest:    {cyan(f'{age_days:.1f} days')}")
+
+        print_box(lines, title=backend)
+        print()
+
+    return True
+
+
+# ============================================================================
+# Prune
+# ============================================================================
+
+
+def prune_files(
+    directory: Path,
+    pattern: str,
+    max_age_days: Optional[float],
+    max_size: Optional[int],
+    dry_run: bool = False,
+) -> Tuple[int, int]:
+    """
+    Delete cache files older than max_age_days, then least recently used
+    files until the total is under max_size.
+
+    Returns (files removed, bytes freed).
+    """
+    files = sorted(_scan_files(directory, pattern), key=lambda item: _last_use(item[1]))
+    now = time.time()
+    doomed: List[Tuple[Path, os.stat_result]] = []
+    kept: List[Tuple[Path, os.stat_result]] = []
+
+    for path, st in files:
+        if max_age_days is not None and now - _last_use(st) > max_age_days * 86400:
+            doomed.append((path, st))
+        else:
+            kept.append((path, st))
+
+    if max_size is not None:
+        total = sum(st.st_size for _, st in kept)
+        while kept and total > max_size:
+            path, st = kept.pop(0)
+            doomed.append((path, st))
+            total -= st.st_size
+
+    freed = 0
+    for path, st in doomed:
+        freed += st.st_size
+        if not dry_run:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    if not dry_run:
+        for sub in sorted(directory.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+            if sub.is_dir() and not any(sub.iterdir()):
+                sub.rmdir()
+
+    return len(doomed), freed
+
+
+def cmd_cache_prune(
+    root: Optional[Path] = None,
+    max_age_days: Optional[float] = None,
+    max_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> bool:
+    """Prune binary caches by age and size."""
+    print_banner(
+        "Binary Cache",
+        "Prune cached binaries",
+        "",
+    )
+
+    if max_age_days is None and max_size is None:
+        print_error("Nothing to do. Pass --max-age DAYS and/or --max-size SIZE.")
+        return False
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    dirs = _cache_dirs(root)
+
+    with Spinner("Pruning vcpkg archives...") as spinner:
+        removed, freed = prune_files(dirs["vcpkg"], "*.zip", max_age_days, max_size, dry_run)
+        verb = "Would remove" if dry_run else "Removed"
+        spinner.succeed(f"{verb} {removed} vcpkg archive(s), {format_size(freed)}")
+
+    # The project Conan home is the one whose storage points at the shared cache
+    conan_home = root / ".cqs" / CONAN_HOME_DIR
+    if dirs["conan"].exists() and conan_home.exists():
+        conan = shutil.which("conan")
+        if max_age_days is not None and conan:
+            cmd = [conan, "remove", "*", f"--lru={max(1, int(max_age_days))}d", "-c"]
+            if dry_run:
+                print_info(f"Would run: {dim(' '.join(cmd))}")
+            else:
+                with Spinner("Pruning Conan cache...") as spinner:
+                    env = dict(os.environ, CONAN_HOME=str(conan_home))
+                    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+                    if result.returncode == 0:
+                        spinner.succeed(f"Pruned Conan packages unused for {max_age_days:g} days")
+                    else:
+                        spinner.fail("conan remove failed")
+                        print(dim(result.stderr.strip()))
+        if max_size is not None:
+            print_warning("Conan caches are pruned by age only (conan remove --lru).")
+
+    return True
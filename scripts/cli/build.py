@@ -0,0 +1,295 @@
+"""
+Build command - configure and build with per-phase timing.
+
+    cqs build [preset] [--target T] [--jobs N] [--clean] [--xmake]
+
+Output is streamed live. Each phase (configure, generate, compile, link) is
+timed and appended to .cqs/build-history.jsonl, and the run is compared
+against the rolling median of earlier builds of the same preset.
+"""
+
+import json
+import shutil
+import statistics
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    green,
+    red,
+    dim,
+)
+from .compdb import link_compile_commands
+from .git import current_commit
+from .ninja_log import NINJA_LOG, analyze_new_builds, wall_ms_by_kind
+from .presets import load_presets, configure_presets, binary_dir as preset_binary_dir
+from .runner import run_streamed, build_command
+from .state import project_state_dir
+
+
+HISTORY_FILE = "build-history.jsonl"
+
+# Comparable builds (same preset, target and clean/incremental) the rolling median is taken over
+MEDIAN_WINDOW = 20
+
+# Comparable builds needed before a median and change are shown
+MIN_HISTORY = 3
+
+PHASES = ("configure", "generate", "compile", "link", "total")
+
+XMAKE_MODES = ("debug", "release", "releasedbg", "minsizerel")
+
+
+# ============================================================================
+# Phase Timing
+# ============================================================================
+
+
+class LineClock:
+    """on_line callback that timestamps marker lines of a streamed command."""
+
+    def __init__(self) -> None:
+        self.lines: List[Tuple[float, str]] = []
+
+    def __call__(self, line: str) -> None:
+        self.lines.append((time.perf_counter(), line))
+
+    def first(self, marker: str) -> Optional[float]:
+        return next((t for t, line in self.lines if marker in line), None)
+
+
+def run_cmake(
+    root: Path,
+    preset: str,
+    target: Optional[str],
+    jobs: Optional[int],
+) -> Tuple[bool, Dict[str, float]]:
+    """Configure and build a CMake preset, returning (success, phase seconds)."""
+    phases: Dict[str, float] = {}
+    binary_dir = preset_binary_dir(root, preset)
+
+    clock = LineClock()
+    cmd = ["cmake", "--preset", preset]
+    print(dim(f"$ {' '.join(cmd)}"))
+    start = time.perf_counter()
+    code, _ = run_streamed(cmd, cwd=root, on_line=clock)
+    end = time.perf_counter()
+    configured = clock.first("-- Configuring done") or end
+    phases["configure"] = configured - start
+    phases["generate"] = end - configured
+    if code != 0:
+        return False, phases
+    link_compile_commands(root, binary_dir)
+
+    if preset in {p["name"] for p in load_presets(root)["buildPresets"]}:
+        cmd = ["cmake", "--build", "--preset", preset]
+        if target:
+            cmd += ["--target", target]
+        if jobs:
+            cmd += ["-j", str(jobs)]
+    else:
+        cmd = build_command(binary_dir, [target] if target else None, jobs)
+    print()
+    print(dim(f"$ {' '.join(cmd)}"))
+    start = time.perf_counter()
+    code, _ = run_streamed(cmd, cwd=root)
+    build_seconds = time.perf_counter() - start
+
+    # Split the build phase using the edges Ninja just logged
+    phases["compile"] = build_seconds
+    phases["link"] = 0.0
+    if (binary_dir / NINJA_LOG).exists():
+        results = analyze_new_builds(root, binary_dir)
+        if results:
+            walls = wall_ms_by_kind(results[-1][1])
+            phases["compile"] = walls["compile"] / 1000
+            phases["link"] = walls["link"] / 1000
+    return code == 0, phases
+
+
+def run_xmake(
+    root: Path,
+    mode: str,
+    target: Optional[str],
+    jobs: Optional[int],
+) -> Tuple[bool, Dict[str, float]]:
+    """Configure and build with xmake, returning (success, phase seconds)."""
+    phases: Dict[str, float] = {}
+
+    cmd = ["xmake", "f", "-m", mode, "-y"]
+    print(dim(f"$ {' '.join(cmd)}"))
+    start = time.perf_counter()
+    code, _ = run_streamed(cmd, cwd=root)
+    phases["configure"] = time.perf_counter() - start
+    phases["generate"] = 0.0
+    if code != 0:
+        return False, phases
+
+    clock = LineClock()
+    cmd = ["xmake", "-y"] + (["-j", str(jobs)] if jobs else []) + ([target] if target else [])
+    print()
+    print(dim(f"$ {' '.join(cmd)}"))
+    code, _ = run_streamed(cmd, cwd=root, on_line=clock)
+    clock(" ")  # closes the interval after the last progress line
+
+    # Attribute the time between progress lines to the step the earlier line started
+    phases["compile"] = phases["link"] = 0.0
+    for (t0, line), (t1, _) in zip(clock.lines, clock.lines[1:]):
+        if "compiling." in line:
+            phases["compile"] += t1 - t0
+        elif "linking." in line or "archiving." in line:
+            phases["link"] += t1 - t0
+    return code == 0, phases
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+
+def load_history(path: Path, system: str, preset: str, target: Optional[str], clean: bool) -> List[Dict[str, Any]]:
+    """
+    Return earlier successful builds comparable to this one: same system,
+    preset and target, and both clean or both incremental.
+    """
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if (
+                entry.get("ok")
+                and entry.get("system") == system
+                and entry.get("preset") == preset
+                and entry.get("target") == target
+                and bool(entry.get("clean")) == clean
+            ):
+                entries.append(entry)
+    return entries[-MEDIAN_WINDOW:]
+
+
+def rolling_medians(history: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Return the median of each phase across history (nothing until MIN_HISTORY builds)."""
+    medians: Dict[str, float] = {}
+    if len(history) < MIN_HISTORY:
+        return medians
+    for phase in PHASES:
+        values = [e["phases"][phase] for e in history if phase in e.get("phases", {})]
+        if values:
+            medians[phase] = statistics.median(values)
+    return medians
+
+
+def _delta(value: float, median: Optional[float]) -> str:
+    if median is None or median < 0.05:
+        return dim("-")
+    change = (value - median) / median * 100
+    text = f"{change:+.0f}%"
+    if change > 10:
+        return red(text)
+    if change < -10:
+        return green(text)
+    return dim(text)
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_build(
+    root: Optional[Path] = None,
+    preset: Optional[str] = None,
+    target: Optional[str] = None,
+    jobs: Optional[int] = None,
+    clean: bool = False,
+    use_xmake: bool = False,
+) -> bool:
+    """Build the project, timing each phase against the rolling median."""
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    system = "xmake" if use_xmake or not (root / "CMakePresets.json").exists() else "cmake"
+    if system == "xmake" and not (root / "xmake.lua").exists():
+        print_error("Neither CMakePresets.json nor xmake.lua found.")
+        return False
+
+    preset = preset or ("debug" if system == "xmake" else "ninja-debug")
+    print_banner(
+        "Build",
+        f"{system} {preset}",
+        "",
+    )
+
+    if system == "cmake":
+        if preset not in configure_presets(root):
+            print_error(f"Unknown configure preset: {preset}")
+            return False
+        if clean:
+            shutil.rmtree(preset_binary_dir(root, preset), ignore_errors=True)
+    else:
+        if preset not in XMAKE_MODES:
+            print_error(f"Unknown xmake mode: {preset} (expected one of {', '.join(XMAKE_MODES)})")
+            return False
+        if clean:
+            shutil.rmtree(root / "build", ignore_errors=True)
+            shutil.rmtree(root / ".xmake", ignore_errors=True)
+
+    start = time.perf_counter()
+    runner = run_cmake if system == "cmake" else run_xmake
+    ok, phases = runner(root, preset, target, jobs)
+    phases["total"] = time.perf_counter() - start
+    print()
+
+    history_path = project_state_dir(root) / HISTORY_FILE
+    medians = rolling_medians(load_history(history_path, system, preset, target, clean))
+    entry = {
+        "time": int(time.time()),
+        "commit": current_commit(root),
+        "system": system,
+        "preset": preset,
+        "target": target,
+        "clean": clean,
+        "ok": ok,
+        "phases": {k: round(v, 3) for k, v in phases.items()},
+    }
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    rows = []
+    for phase in PHASES:
+        if phase not in phases:
+            continue
+        median = medians.get(phase)
+        median_text = f"{median:>8.2f} s" if median is not None else f"{'-':>10}"
+        rows.append(f"{phase.capitalize():<10} {phases[phase]:>8.2f} s   {dim(median_text)}   {_delta(phases[phase], median)}")
+    print_box(
+        [dim(f"{'Phase':<10} {'This run':>10}   {'Median':>10}   Change")] + rows,
+        title="Build Timing",
+    )
+    print()
+
+    if not ok:
+        print_error("Build failed.")
+        return False
+
+    if not medians:
+        kind = "clean" if clean else "incremental"
+        print_info(
+            f"Fewer than {MIN_HISTORY} earlier {kind} builds of this preset{f' and target {target}' if target else ''}; "
+            "timings are compared once there are enough."
+        )
+    print_success(f"Build completed in {phases['total']:.1f} s")
+    print(dim(f"  History: {history_path.relative_to(root)}"))
+    return True
@@ -30,6 +30,7 @@ from .ui import (
     Symbols,
 )
 from . import prompts
+from .deps import FETCHCONTENT_PACKAGES, add_fetchcontent_dependency
 
 
 # ============================================================================
@@ -699,10 +700,11 @@ def cmd_add_dependency(root: Optional[Path] = None) -> bool:
     # Detect available package managers
     has_vcpkg = (root / "vcpkg.json").exists()
     has_conan = (root / "conanfile.txt").exists()
+    has_cmake = (root / "CMakeLists.txt").exists()
 
-    if not has_vcpkg and not has_conan:
-        print_error("No package manager configuration found.")
-        print_info("Create vcpkg.json or conanfile.txt first.")
+    if not has_vcpkg and not has_conan and not has_cmake:
+        print_error("No dependency configuration found.")
+        print_info("Create vcpkg.json, conanfile.txt or a CMakeLists.txt (for FetchContent) first.")
         return False
 
     pkg_managers = []
@@ -710,6 +712,8 @@ def cmd_add_dependency(root: Optional[Path] = None) -> bool:
         pkg_managers.append("vcpkg")
     if has_conan:
         pkg_managers.append("Conan")
+    if has_cmake:
+        pkg_managers.append("FetchContent")
 
     if len(pkg_managers) > 1:
         _, pkg_manager = prompts.select(
@@ -742,12 +746,25 @@ def cmd_add_dependency(root: Optional[Path] = None) -> bool:
     else:
         package_name = pkg_choice
 
+    archive_url = ""
+    if pkg_manager == "FetchContent":
+        archive_url = FETCHCONTENT_PACKAGES.get(package_name, "")
+        if not archive_url:
+            archive_url = prompts.text(
+                "Source archive URL",
+                placeholder="e.g., https://github.com/owner/repo/archive/refs/tags/v1.0.0.zip",
+                validate=lambda x: bool(re.match(r"^[A-Za-z][A-Za-z0-9+.-]*://\S+$", x)),
+                validate_message="Enter a full archive URL (scheme://...)",
+            )
+
     # Add to configuration
     print()
     with Spinner(f"Adding {package_name} to {pkg_manager}...") as spinner:
         try:
             if pkg_manager == "vcpkg":
                 add_vcpkg_dependency(root, package_name)
+            elif pkg_manager == "FetchContent":
+                add_fetchcontent_dependency(root, package_name, archive_url)
             else:
                 add_conan_dependency(root, package_name)
             spinner.succeed(f"Added {package_name}")
@@ -760,6 +777,8 @@ def cmd_add_dependency(root: Optional[Path] = None) -> bool:
 
     if pkg_manager == "vcpkg":
         print_info(f"Run: {dim('vcpkg install')}")
+    elif pkg_manager == "FetchContent":
+        print_info("Sources are mirrored locally; link the target with target_link_libraries().")
     else:
         print_info(f"Run: {dim('conan install . --output-folder=build --build=missing')}")
 
@@ -0,0 +1,104 @@
+"""
+Compilation database helpers - locate, read and link compile_commands.json.
+"""
+
+import os
+import shlex
+import shutil
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .state import load_json
+
+
+COMPDB_FILE = "compile_commands.json"
+
+
+def find_compile_commands(root: Path, build_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Locate compile_commands.json.
+
+    Looks in build_dir if given, otherwise uses the active preset's database
+    (build/compile_commands.json), falling back to the most recently written
+    one in the project root or build/*/.
+    """
+    if build_dir is not None:
+        candidate = build_dir / COMPDB_FILE
+        return candidate if candidate.exists() else None
+
+    active = root / "build" / COMPDB_FILE
+    if active.exists():
+        return active
+
+    candidates = [root / COMPDB_FILE]
+    candidates += list((root / "build").glob(f"*/{COMPDB_FILE}"))
+    existing = [c for c in candidates if c.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda c: c.stat().st_mtime)
+
+
+def link_compile_commands(root: Path, build_dir: Path) -> Optional[Path]:
+    """
+    Point build/compile_commands.json (where clangd looks) at build_dir's database.
+
+    A relative symlink is used so the tree can move; where symlinks are not
+    allowed (Windows without developer mode) the database is copied instead.
+    """
+    source = build_dir / COMPDB_FILE
+    link = root / "build" / COMPDB_FILE
+    if not source.exists() or source.resolve() == link.resolve():
+        return None
+    if link.is_symlink() or link.exists():
+        link.unlink()
+    try:
+        link.symlink_to(os.path.relpath(source, link.parent))
+    except OSError:
+        shutil.copyfile(source, link)
+    return link
+
+
+def active_build_dir(root: Path) -> Optional[Path]:
+    """Return the build directory build/compile_commands.json links to."""
+    link = root / "build" / COMPDB_FILE
+    if not link.is_symlink():
+        return None
+    return (link.parent / os.readlink(link)).parent.resolve()
+
+
+def load_compile_commands(path: Path) -> List[Dict[str, Any]]:
+    """Load entries, normalizing 'command' strings into 'arguments' lists."""
+    entries = load_json(path, []) or []
+    for entry in entries:
+        if "arguments" not in entry:
+            entry["arguments"] = shlex.split(entry.get("command", ""), posix=sys.platform != "win32")
+        file_path = Path(entry["file"])
+        if not file_path.is_absolute():
+            file_path = Path(entry.get("directory", ".")) / file_path
+        entry["file"] = os.path.normpath(str(file_path))
+    return entries
+
+
+def include_dirs(entry: Dict[str, Any]) -> List[Path]:
+    """Return the include directories (-I, -isystem, -iquote, /I) of an entry."""
+    dirs: List[Path] = []
+    args = entry.get("arguments", [])
+    directory = Path(entry.get("directory", "."))
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = None
+        for flag in ("-I", "-isystem", "-iquote", "/I", "-external:I", "/external:I"):
+            if arg == flag and i + 1 < len(args):
+                value = args[i + 1]
+                i += 1
+                break
+            if arg.startswith(flag) and len(arg) > len(flag):
+                value = arg[len(flag) :]
+                break
+        if value is not None:
+            path = Path(value)
+            dirs.append(path if path.is_absolute() else directory / path)
+        i += 1
+    return dirs
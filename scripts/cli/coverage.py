@@ -0,0 +1,605 @@
+"""
+Coverage command - instrumented test runs with parallel report aggregation.
+
+    cqs coverage [preset] [--jobs N] [--html] [--diff [REF]] [--fail-under PCT]
+                 [--filter REGEX] [--no-build]
+
+Builds the tests in build/cqs/<preset>-coverage with GCC '--coverage' or
+Clang source-based coverage ('-fprofile-instr-generate -fcoverage-mapping'),
+runs them with ctest, and merges the results into one report:
+
+    GCC     .gcda files are split into batches processed by concurrent
+            'gcov --json-format' processes
+    Clang   .profraw files are merged with 'llvm-profdata merge' and
+            exported with 'llvm-cov export -format=lcov', both threaded
+
+The report has per-file line and branch summaries and is written to
+.cqs/coverage/<preset>/ as coverage.json and an lcov tracefile
+(coverage.info); --html adds a self-contained HTML view. --diff REF reports
+coverage of the lines changed since REF only; a bare --diff compares against
+the commit the branch forks from the mainline.
+"""
+
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple, Set
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_error,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    red,
+    yellow,
+    dim,
+)
+from .bench import compiler_id
+from .git import changed_lines, merge_base
+from .jobpools import usable_cores
+from .pgo import toolchain, find_profdata, flag_variables
+from .presets import configure_presets
+from .runner import variant_binary_dir, configure_command, configure_and_build, run_streamed, require_tool
+from .state import project_state_dir, save_json
+
+
+COVERAGE_DIR = "coverage"
+
+# Only sources below these directories are reported
+COVERAGE_SOURCE_DIRS = ("src", "include")
+
+COVERAGE_CACHE_VARIABLES = {
+    "CPP_QUICK_STARTER_BUILD_TESTS": "ON",
+    "CPP_QUICK_STARTER_BUILD_BENCHMARKS": "OFF",
+    "CPP_QUICK_STARTER_BUILD_EXAMPLES": "OFF",
+}
+
+PROFRAW_DIR = "profraw"
+
+# Coverage at or above this is shown green, below LOW_COVERAGE red
+GOOD_COVERAGE = 0.9
+LOW_COVERAGE = 0.75
+
+# One file's coverage: {"lines": {line: hits}, "branches": {line: [hits per branch]}}
+FileCoverage = Dict[str, Dict[int, Any]]
+
+
+def coverage_flags(kind: str) -> str:
+    """Return the compile/link flags of a coverage build."""
+    if kind == "gcc":
+        # Absolute paths in the notes files keep gcov output independent of its working directory
+        return "--coverage -fprofile-abs-path -fprofile-update=atomic"
+    return "-fprofile-instr-generate -fcoverage-mapping"
+
+
+# ============================================================================
+# Merging
+# ============================================================================
+
+
+def _empty() -> FileCoverage:
+    return {"lines": {}, "branches": {}}
+
+
+def add_line(coverage: FileCoverage, line: int, hits: int) -> None:
+    coverage["lines"][line] = coverage["lines"].get(line, 0) + hits
+
+
+def add_branches(coverage: FileCoverage, line: int, hits: List[int]) -> None:
+    """Add branch hit counts of one line, position by position."""
+    merged = coverage["branches"].setdefault(line, [])
+    for index, value in enumerate(hits):
+        if index < len(merged):
+            merged[index] += value
+        else:
+            merged.append(value)
+
+
+def merge(into: Dict[str, FileCoverage], part: Dict[str, FileCoverage]) -> None:
+    """Merge one partial report into another (headers appear in many translation units)."""
+    for name, coverage in part.items():
+        target = into.setdefault(name, _empty())
+        for line, hits in coverage["lines"].items():
+            add_line(target, line, hits)
+        for line, hits in coverage["branches"].items():
+            add_branches(target, line, hits)
+
+
+def _source_name(root: Path, path: str, base: str = "") -> Optional[str]:
+    """Return a source path relative to root, or None for files outside the reported directories."""
+    full = Path(base, path) if base and not os.path.isabs(path) else Path(path)
+    try:
+        relative = Path(os.path.normpath(full)).relative_to(root)
+    except ValueError:
+        return None
+    return relative.as_posix() if relative.parts and relative.parts[0] in COVERAGE_SOURCE_DIRS else None
+
+
+# ============================================================================
+# GCC (gcov)
+# ============================================================================
+
+
+def parse_gcov_json(root: Path, text: str) -> Dict[str, FileCoverage]:
+    """
+    Parse 'gcov --json-format --stdout' output, one JSON document per .gcda.
+
+    Lines of a function that is instantiated several times are listed once
+    per instantiation; their counts add up. Branches of exception edges are
+    left out, as they are not meaningful to cover.
+    """
+    report: Dict[str, FileCoverage] = {}
+    for document in text.splitlines():
+        if not document.strip():
+            continue
+        data = json.loads(document)
+        base = data.get("current_working_directory", "")
+        for entry in data.get("files", []):
+            name = _source_name(root, entry.get("file", ""), base)
+            if name is None:
+                continue
+            coverage = report.setdefault(name, _empty())
+            for line in entry.get("lines", []):
+                number = line["line_number"]
+                add_line(coverage, number, line.get("count", 0))
+                branches = [b.get("count", 0) for b in line.get("branches", []) if not b.get("throw")]
+                if branches:
+                    add_branches(coverage, number, branches)
+    return report
+
+
+def gcov_batch(gcov: str, root: Path, files: List[Path]) -> Dict[str, FileCoverage]:
+    """Run gcov on a batch of .gcda files and return their coverage."""
+    result = subprocess.run(
+        [gcov, "--json-format", "--stdout", "--branch-probabilities"] + [str(f) for f in files],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    if result.returncode != 0:
+        raise ValueError(f"gcov failed: {result.stderr.strip()}")
+    return parse_gcov_json(root, result.stdout)
+
+
+def gcov_report(gcov: str, root: Path, binary_dir: Path, jobs: int) -> Tuple[Dict[str, FileCoverage], int]:
+    """Process all .gcda files of a build in parallel batches; returns (report, file count)."""
+    files = sorted(binary_dir.rglob("*.gcda"))
+    # A few batches per worker keeps the pool busy when batch sizes differ
+    batches = [files[i :: jobs * 4] for i in range(min(len(files), jobs * 4))]
+    report: Dict[str, FileCoverage] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for part in pool.map(lambda batch: gcov_batch(gcov, root, batch), batches):
+            merge(report, part)
+    return report, len(files)
+
+
+# ============================================================================
+# Clang (llvm-cov)
+# ============================================================================
+
+
+def parse_lcov(root: Path, text: str) -> Dict[str, FileCoverage]:
+    """Parse an lcov tracefile ('SF:', 'DA:', 'BRDA:' records)."""
+    report: Dict[str, FileCoverage] = {}
+    coverage: Optional[FileCoverage] = None
+    branch_lines: Dict[int, List[int]] = {}
+    for line in text.splitlines():
+        if line.startswith("SF:"):
+            name = _source_name(root, line[3:])
+            coverage = report.setdefault(name, _empty()) if name else None
+            branch_lines = {}
+        elif coverage is None:
+            continue
+        elif line.startswith("DA:"):
+            fields = line[3:].split(",")
+            add_line(coverage, int(fields[0]), int(fields[1]))
+        elif line.startswith("BRDA:"):
+            fields = line[5:].split(",")
+            branch_lines.setdefault(int(fields[0]), []).append(0 if fields[3] == "-" else int(fields[3]))
+        elif line == "end_of_record":
+            for number, hits in branch_lines.items():
+                add_branches(coverage, number, hits)
+            coverage = None
+    return report
+
+
+def llvm_cov_report(
+    profdata: List[str],
+    llvm_cov: str,
+    root: Path,
+    binary_dir: Path,
+    executables: List[Path],
+    jobs: int,
+) -> Tuple[Dict[str, FileCoverage], int]:
+    """Merge .profraw files and export coverage of the test executables; returns (report, file count)."""
+    raw = sorted((binary_dir / PROFRAW_DIR).glob("*.profraw"))
+    if not raw:
+        return {}, 0
+    merged = binary_dir / "coverage.profdata"
+    cmd = profdata + ["merge", "-sparse", f"--num-threads={jobs}", "-o", str(merged)] + [str(p) for p in raw]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"llvm-profdata merge failed: {result.stderr.strip()}")
+
+    objects = [str(executables[0])] + [arg for exe in executables[1:] for arg in ("-object", str(exe))]
+    cmd = [llvm_cov, "export", "-format=lcov", f"-instr-profile={merged}", f"-num-threads={jobs}"] + objects
+    result = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
+    if result.returncode != 0:
+        raise ValueError(f"llvm-cov export failed: {result.stderr.strip()}")
+    return parse_lcov(root, result.stdout), len(raw)
+
+
+def find_llvm_cov(compiler: str) -> Optional[List[str]]:
+    """Return the llvm-cov command matching a Clang compiler id."""
+    profdata = find_profdata(compiler)
+    if profdata is None:
+        return None
+    if profdata[0] == "xcrun":
+        return ["xcrun", "llvm-cov"]
+    # llvm-cov ships next to llvm-profdata, with the same version suffix
+    candidate = Path(profdata[0]).with_name(Path(profdata[0]).name.replace("llvm-profdata", "llvm-cov"))
+    found = str(candidate) if candidate.exists() else require_tool("llvm-cov")
+    return [found] if found else None
+
+
+def test_executables(binary_dir: Path) -> List[Path]:
+    """Return the test executables of a build (everything linked below tests/)."""
+    tests = binary_dir / "tests"
+    return sorted(
+        p
+        for p in tests.rglob("*")
+        if p.is_file() and os.access(p, os.X_OK) and "CMakeFiles" not in p.parts and p.suffix in ("", ".exe")
+    )
+
+
+# ============================================================================
+# Summaries
+# ============================================================================
+
+
+def summarize(coverage: FileCoverage, only: Optional[Set[int]] = None) -> Dict[str, int]:
+    """Count lines and branches (optionally restricted to some line numbers) and how many were hit."""
+    lines = {n: h for n, h in coverage["lines"].items() if only is None or n in only}
+    branches = [h for n, hits in coverage["branches"].items() if only is None or n in only for h in hits]
+    return {
+        "lines": len(lines),
+        "lines_hit": sum(1 for h in lines.values() if h > 0),
+        "branches": len(branches),
+        "branches_hit": sum(1 for h in branches if h > 0),
+    }
+
+
+def _ratio(hit: int, total: int) -> Optional[float]:
+    return hit / total if total else None
+
+
+def _percent(hit: int, total: int, width: int = 7) -> str:
+    ratio = _ratio(hit, total)
+    if ratio is None:
+        return dim("-".rjust(width))
+    text = f"{ratio * 100:.1f}%".rjust(width)
+    return green(text) if ratio >= GOOD_COVERAGE else yellow(text) if ratio >= LOW_COVERAGE else red(text)
+
+
+def _cell(totals: Dict[str, int], kind: str) -> str:
+    """Format 'percent hit/total' for 'lines' or 'branches'."""
+    hit, count = totals[f"{kind}_hit"], totals[kind]
+    return f"{_percent(hit, count)} " + dim(f"{hit:>4}/{count:<4}")
+
+
+def line_ranges(numbers: List[int]) -> str:
+    """Compress sorted line numbers into '3-5, 9'."""
+    ranges: List[str] = []
+    start = previous = None
+    for number in numbers + [None]:
+        if start is not None and number is not None and number == previous + 1:
+            previous = number
+            continue
+        if start is not None:
+            ranges.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = number
+    return ", ".join(ranges)
+
+
+def write_lcov(report: Dict[str, FileCoverage], root: Path, path: Path) -> None:
+    """Write the merged report as an lcov tracefile for other tools (CI uploaders, genhtml)."""
+    out = ["TN:"]
+    for name in sorted(report):
+        coverage = report[name]
+        out.append(f"SF:{root / name}")
+        for number in sorted(coverage["branches"]):
+            for index, hits in enumerate(coverage["branches"][number]):
+                out.append(f"BRDA:{number},0,{index},{hits}")
+        totals = summarize(coverage)
+        out += [f"BRF:{totals['branches']}", f"BRH:{totals['branches_hit']}"]
+        out += [f"DA:{number},{hits}" for number, hits in sorted(coverage["lines"].items())]
+        out += [f"LF:{totals['lines']}", f"LH:{totals['lines_hit']}", "end_of_record"]
+    path.write_text("\n".join(out) + "\n", encoding="utf-8")
+
+
+# ============================================================================
+# HTML
+# ============================================================================
+
+HTML_STYLE = """
+body { font-family: -apple-system, "Segoe UI", sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; }
+th, td { padding: 2px 10px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+tr:nth-child(even) { background: #f4f4f4; }
+.good { color: #1a7f37; } .mid { color: #9a6700; } .low { color: #cf222e; }
+pre { font-size: 13px; line-height: 1.35; }
+.src > span { display: block; white-space: pre; }
+.hit { background: #dafbe1; } .miss { background: #ffebe9; } .part { background: #fff8c5; }
+.no { color: #888; display: inline-block; width: 5em; text-align: right; margin-right: 1em; }
+.cnt { color: #888; display: inline-block; width: 6em; text-align: right; margin-right: 1em; }
+"""
+
+
+def _html_percent(hit: int, total: int) -> str:
+    ratio = _ratio(hit, total)
+    if ratio is None:
+        return "-"
+    css = "good" if ratio >= GOOD_COVERAGE else "mid" if ratio >= LOW_COVERAGE else "low"
+    return f'<span class="{css}">{ratio * 100:.1f}%</span> ({hit}/{total})'
+
+
+def _html_page(title: str, body: str) -> str:
+    return (
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+        f"<style>{HTML_STYLE}</style></head>\n<body>\n<h1>{html.escape(title)}</h1>\n{body}\n</body></html>\n"
+    )
+
+
+def write_html(report: Dict[str, FileCoverage], root: Path, out_dir: Path, title: str) -> Path:
+    """Write a self-contained HTML report (index plus one annotated page per source file)."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True)
+    rows = []
+    for name in sorted(report):
+        totals = summarize(report[name])
+        page = re.sub(r"[^\w.-]", "_", name) + ".html"
+        rows.append(
+            f'<tr><td><a href="{page}">{html.escape(name)}</a></td>'
+            f"<td>{_html_percent(totals['lines_hit'], totals['lines'])}</td>"
+            f"<td>{_html_percent(totals['branches_hit'], totals['branches'])}</td></tr>"
+        )
+
+        coverage = report[name]
+        try:
+            source = (root / name).read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            source = []
+        lines = []
+        for number, text in enumerate(source, 1):
+            hits = coverage["lines"].get(number)
+            branches = coverage["branches"].get(number, [])
+            css = ""
+            if hits is not None:
+                css = "miss" if hits == 0 else "part" if branches and min(branches) == 0 else "hit"
+            count = "" if hits is None else str(hits)
+            if branches:
+                count = f"{sum(1 for b in branches if b)}/{len(branches)} " + count
+            lines.append(
+                f'<span class="{css}"><span class="no">{number}</span><span class="cnt">{count}</span>'
+                f"{html.escape(text)}</span>"
+            )
+        body = (
+            f'<p><a href="index.html">index</a> &middot; lines {_html_percent(totals["lines_hit"], totals["lines"])}'
+            f' &middot; branches {_html_percent(totals["branches_hit"], totals["branches"])}</p>\n'
+            f'<pre class="src">{"".join(lines)}</pre>'
+        )
+        (out_dir / page).write_text(_html_page(name, body), encoding="utf-8")
+
+    totals = _total(report)
+    body = (
+        "<table><tr><th>File</th><th>Lines</th><th>Branches</th></tr>\n"
+        + "\n".join(rows)
+        + f"\n<tr><th>Total</th><th>{_html_percent(totals['lines_hit'], totals['lines'])}</th>"
+        f"<th>{_html_percent(totals['branches_hit'], totals['branches'])}</th></tr></table>"
+    )
+    index = out_dir / "index.html"
+    index.write_text(_html_page(title, body), encoding="utf-8")
+    return index
+
+
+def _total(report: Dict[str, FileCoverage], only: Optional[Dict[str, Set[int]]] = None) -> Dict[str, int]:
+    totals = {"lines": 0, "lines_hit": 0, "branches": 0, "branches_hit": 0}
+    for name, coverage in report.items():
+        if only is not None and name not in only:
+            continue
+        for key, value in summarize(coverage, only[name] if only is not None else None).items():
+            totals[key] += value
+    return totals
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_coverage(
+    root: Optional[Path] = None,
+    preset: str = "ninja-debug",
+    jobs: Optional[int] = None,
+    html_report: bool = False,
+    diff: Optional[str] = None,
+    fail_under: Optional[float] = None,
+    test_filter: Optional[str] = None,
+    build: bool = True,
+) -> bool:
+    """
+    Run the tests with coverage instrumentation and report merged line and branch coverage.
+
+    diff is a git ref to report changed lines against; an empty string means
+    the mainline fork point.
+    """
+    print_banner(
+        "Coverage",
+        f"Test coverage of {preset}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+    diff_label = diff
+    if diff == "":
+        # Diffing against HEAD would miss everything already committed on the branch
+        diff = merge_base(root)
+        if diff is None:
+            print_error("No mainline branch (origin/HEAD, main or master) to diff against; pass --diff REF.")
+            return False
+        diff_label = f"fork point {diff[:10]}"
+    jobs = jobs or usable_cores()
+
+    binary_dir = variant_binary_dir(root, preset, "coverage")
+    if build:
+        # Configure once to learn the compiler, which decides the instrumentation flags
+        cmd = configure_command(preset, binary_dir, COVERAGE_CACHE_VARIABLES)
+        print(dim(f"$ {' '.join(cmd)}"))
+        code, _ = run_streamed(cmd, cwd=root, echo=False)
+        if code != 0:
+            print_error(f"Configuring {preset} failed.")
+            return False
+    compiler = compiler_id(binary_dir)
+    kind = toolchain(compiler)
+    if kind is None:
+        print_error(f"Coverage is supported with GCC and Clang, not {compiler}.")
+        return False
+
+    gcov = require_tool("gcov") if kind == "gcc" else None
+    profdata = find_profdata(compiler) if kind == "clang" else None
+    llvm_cov = find_llvm_cov(compiler) if kind == "clang" else None
+    if kind == "gcc" and not gcov:
+        print_error("gcov not found.")
+        return False
+    if kind == "clang" and (not profdata or not llvm_cov):
+        print_error("llvm-profdata and llvm-cov are required for Clang coverage.")
+        return False
+
+    if build:
+        cache_vars = {**COVERAGE_CACHE_VARIABLES, **flag_variables(root, preset, coverage_flags(kind))}
+        if not configure_and_build(root, preset, binary_dir, cache_vars):
+            print_error("Coverage build failed.")
+            return False
+        print()
+
+    # Counters accumulate across runs; start every report from zero
+    for stale in binary_dir.rglob("*.gcda"):
+        stale.unlink()
+    shutil.rmtree(binary_dir / PROFRAW_DIR, ignore_errors=True)
+    env = dict(os.environ)
+    env["LLVM_PROFILE_FILE"] = str(binary_dir / PROFRAW_DIR / "cqs-%p-%m.profraw")
+
+    cmd = ["ctest", "--test-dir", str(binary_dir), "-j", str(jobs), "--output-on-failure"]
+    if test_filter:
+        cmd += ["-R", test_filter]
+    print(dim(f"$ {' '.join(cmd)}"))
+    start = time.perf_counter()
+    code, _ = run_streamed(cmd, cwd=root, env=env)
+    test_time = time.perf_counter() - start
+    print()
+    if code != 0:
+        print_warning("Some tests failed; coverage reflects the tests that ran.")
+
+    start = time.perf_counter()
+    with Spinner(f"Processing coverage data with {jobs} workers...") as spinner:
+        if kind == "gcc":
+            report, data_files = gcov_report(gcov or "gcov", root, binary_dir, jobs)
+        else:
+            report, data_files = llvm_cov_report(
+                profdata or [], (llvm_cov or ["llvm-cov"])[0], root, binary_dir, test_executables(binary_dir), jobs
+            )
+        spinner.succeed(f"Merged {data_files} {'.gcda' if kind == 'gcc' else '.profraw'} file(s)")
+    process_time = time.perf_counter() - start
+    if not report:
+        print_error("No coverage data for sources in " + ", ".join(f"{d}/" for d in COVERAGE_SOURCE_DIRS))
+        return False
+    print()
+
+    rows = [dim(f"{'File':<44} {'Lines':>17} {'Branches':>17}")]
+    for name in sorted(report):
+        totals = summarize(report[name])
+        shown = name if len(name) <= 44 else "..." + name[-41:]
+        rows.append(f"{shown:<44} {_cell(totals, 'lines')} {_cell(totals, 'branches')}")
+    total = _total(report)
+    rows += ["", f"{'Total':<44} {_cell(total, 'lines')} {_cell(total, 'branches')}"]
+    print_box(rows, title=f"Coverage ({compiler})")
+    print()
+
+    out_dir = project_state_dir(root) / COVERAGE_DIR / preset
+    out_dir.mkdir(parents=True, exist_ok=True)
+    save_json(
+        out_dir / "coverage.json",
+        {
+            "time": int(time.time()),
+            "preset": preset,
+            "compiler": compiler,
+            "total": total,
+            "files": {name: summarize(coverage) for name, coverage in report.items()},
+        },
+        indent=2,
+    )
+    write_lcov(report, root, out_dir / "coverage.info")
+    index = write_html(report, root, out_dir / "html", f"Coverage of {preset}") if html_report else None
+
+    gate = _ratio(total["lines_hit"], total["lines"])
+    gate_name = "Line coverage"
+    if diff is not None:
+        changed = {}
+        for path, numbers in changed_lines(root, diff).items():
+            name = _source_name(root, str(path))
+            if name in report:
+                changed[name] = numbers
+        diff_total = _total(report, changed)
+        lines = []
+        for name in sorted(changed):
+            coverage = report[name]
+            missed = sorted(n for n in changed[name] if coverage["lines"].get(n) == 0)
+            totals = summarize(coverage, changed[name])
+            if not totals["lines"]:
+                continue
+            lines.append(f"{name:<44} {_cell(totals, 'lines')}" + (f"  {red('missed')} {line_ranges(missed)}" if missed else ""))
+        if lines:
+            lines += [
+                "",
+                f"{'Changed lines':<44} {_cell(diff_total, 'lines')}  branches {_cell(diff_total, 'branches')}",
+            ]
+        else:
+            lines = [dim(f"No changed executable lines since {diff_label}.")]
+        print_box(lines, title=f"Diff Coverage (since {diff_label})")
+        print()
+        gate = _ratio(diff_total["lines_hit"], diff_total["lines"])
+        gate_name = "Diff coverage"
+
+    details = [
+        f"Tests:       {cyan(f'{test_time:.1f} s')}" + (dim("  (failures)") if code else ""),
+        f"Processing:  {cyan(f'{process_time:.2f} s')} " + dim(f"({jobs} workers, {data_files} files)"),
+        f"lcov:        {dim(str((out_dir / 'coverage.info').relative_to(root)))}",
+    ]
+    if index is not None:
+        details.append(f"HTML:        {cyan(str(index.relative_to(root)))}")
+    print_box(details, title="Coverage")
+    print()
+
+    if fail_under is not None and gate is not None and gate * 100 < fail_under:
+        print_error(f"{gate_name} {gate * 100:.1f}% is below {fail_under:g}%")
+        return False
+    if gate is not None:
+        print_success(f"{gate_name}: {gate * 100:.1f}%")
+    return True
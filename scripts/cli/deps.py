@@ -0,0 +1,306 @@
+"""
+Dependency mirror command - shared FetchContent sources.
+
+    cqs deps mirror [--dir PATH]
+
+Every FetchContent_Declare(<name> URL ...) in CMakeLists.txt is downloaded once
+into a per-user mirror keyed by name, version and archive SHA-256, and
+.cqs/fetchcontent.cmake points FETCHCONTENT_SOURCE_DIR_<NAME> at it so no
+preset downloads again. A <version>-<url hash>.json record next to the trees
+maps each URL to its tree; a URL_HASH SHA256=... in the declaration is checked.
+"""
+
+import io
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_success,
+    print_error,
+    print_info,
+    cyan,
+    green,
+    red,
+    dim,
+    Symbols,
+)
+from .state import (
+    user_cache_dir,
+    project_state_dir,
+    load_json,
+    save_json,
+    hash_bytes,
+)
+
+
+MIRROR_INCLUDE = "fetchcontent.cmake"
+
+# Archive URLs for the common packages offered by 'add dep'
+FETCHCONTENT_PACKAGES = {
+    "fmt": "https://github.com/fmtlib/fmt/archive/refs/tags/10.2.1.zip",
+    "spdlog": "https://github.com/gabime/spdlog/archive/refs/tags/v1.13.0.zip",
+    "nlohmann-json": "https://github.com/nlohmann/json/releases/download/v3.11.3/json.tar.xz",
+    "cxxopts": "https://github.com/jarro2783/cxxopts/archive/refs/tags/v3.2.0.zip",
+    "catch2": "https://github.com/catchorg/Catch2/archive/refs/tags/v3.5.2.zip",
+}
+
+_MIRROR_HOOK_RE = re.compile(r"if\(EXISTS \"[^\"]*/\.cqs/fetchcontent\.cmake\"\)\n.*?endif\(\)\n", re.DOTALL)
+_DECLARE_RE = re.compile(r"FetchContent_Declare\s*\(\s*(\w+)\s+URL\s+([^\s)]+)", re.IGNORECASE)
+_URL_HASH_RE = re.compile(
+    r"FetchContent_Declare\s*\(\s*(\w+)\s[^)]*?URL_HASH\s+SHA256=([0-9a-fA-F]{64})", re.IGNORECASE
+)
+
+
+# ============================================================================
+# Mirror Layout
+# ============================================================================
+
+
+def mirror_dir() -> Path:
+    """Return the shared FetchContent mirror directory."""
+    override = os.environ.get("CQS_DEPS_MIRROR")
+    return Path(override).expanduser() if override else user_cache_dir() / "fetchcontent"
+
+
+def version_from_url(url: str) -> str:
+    """Derive a version key from an archive URL (falls back to a URL hash)."""
+    tail = "/".join(url.split("/")[-2:])
+    match = re.search(r"v?(\d+(?:\.\d+)+)", tail)
+    return match.group(1) if match else "url-" + hash_bytes(url.encode())[:12]
+
+
+def _record_path(mirror: Path, name: str, url: str) -> Path:
+    """Return the record mapping a dependency URL to its mirrored tree."""
+    return mirror / name.lower() / f"{version_from_url(url)}-{hash_bytes(url.encode())[:12]}.json"
+
+
+def mirrored_source(mirror: Path, name: str, url: str, sha256: Optional[str] = None) -> Optional[Path]:
+    """
+    Return the mirrored source directory of a dependency, or None unless a
+    completed download of url (with the expected SHA-256, if given) is recorded.
+    """
+    record = load_json(_record_path(mirror, name, url))
+    if not isinstance(record, dict) or record.get("url") != url or not record.get("dir"):
+        return None
+    if sha256 and record.get("sha256") != sha256.lower():
+        return None
+    path = mirror / name.lower() / record["dir"]
+    return path if path.is_dir() else None
+
+
+def declared_dependencies(root: Path) -> Dict[str, str]:
+    """Return {name: url} for every URL-based FetchContent_Declare in CMakeLists.txt."""
+    cmake_file = root / "CMakeLists.txt"
+    if not cmake_file.exists():
+        return {}
+    return {name: url for name, url in _DECLARE_RE.findall(cmake_file.read_text(encoding="utf-8"))}
+
+
+def declared_hashes(root: Path) -> Dict[str, str]:
+    """Return {name: sha256} for every FetchContent_Declare with a URL_HASH SHA256=..."""
+    cmake_file = root / "CMakeLists.txt"
+    if not cmake_file.exists():
+        return {}
+    return {name: digest.lower() for name, digest in _URL_HASH_RE.findall(cmake_file.read_text(encoding="utf-8"))}
+
+
+# ============================================================================
+# Population
+# ============================================================================
+
+
+def _extract(data: bytes, url: str, dest: Path) -> None:
+    """Extract an archive, stripping a single top-level directory like CMake does."""
+    if url.endswith(".zip"):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            archive.extractall(dest)
+    else:
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            if hasattr(tarfile, "data_filter"):
+                archive.extractall(dest, filter="data")
+            else:
+                archive.extractall(dest)
+
+    entries = list(dest.iterdir())
+    if len(entries) == 1 and entries[0].is_dir():
+        inner = entries[0]
+        for child in inner.iterdir():
+            child.rename(dest / child.name)
+        inner.rmdir()
+
+
+def populate(mirror: Path, name: str, url: str, sha256: Optional[str] = None) -> Path:
+    """Download and extract a dependency into the mirror unless a verified copy is recorded."""
+    existing = mirrored_source(mirror, name, url, sha256)
+    if existing:
+        return existing
+
+    with urllib.request.urlopen(url, timeout=120) as response:
+        data = response.read()
+    digest = hash_bytes(data)
+    if sha256 and digest != sha256.lower():
+        raise ValueError(f"SHA256 mismatch for {url}: expected {sha256.lower()}, got {digest}")
+
+    # Trees are named by content and only ever appear through an atomic rename of a
+    # fully extracted staging directory, so an existing tree is always complete
+    target = mirror / name.lower() / f"{version_from_url(url)}-{digest[:12]}"
+    if not target.is_dir():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=str(target.parent), prefix=f".{target.name}."))
+        try:
+            _extract(data, url, staging)
+            try:
+                staging.rename(target)
+            except OSError:
+                # A concurrent run extracted the same archive first
+                if not target.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    # The record is written last and marks the download as complete
+    save_json(_record_path(mirror, name, url), {"url": url, "sha256": digest, "dir": target.name}, indent=2)
+    return target
+
+
+def write_mirror_include(root: Path, sources: Dict[str, Path]) -> Path:
+    """Write .cqs/fetchcontent.cmake mapping each dependency to its mirrored sources."""
+    lines = ["# Generated by `cqs deps mirror` - do not edit.\n"]
+    for name, path in sorted(sources.items()):
+        var = f"FETCHCONTENT_SOURCE_DIR_{name.upper()}"
+        lines.append(f'if(NOT DEFINED {var} AND EXISTS "{path.as_posix()}")\n')
+        lines.append(f'  set({var} "{path.as_posix()}")\n')
+        lines.append("endif()\n")
+    include = project_state_dir(root) / MIRROR_INCLUDE
+    include.write_text("".join(lines), encoding="utf-8")
+    return include
+
+
+def refresh_mirror_include(root: Path, mirror: Path) -> Path:
+    """Rewrite the mirror include for every declared dependency already mirrored."""
+    sources = {}
+    hashes = declared_hashes(root)
+    for name, url in declared_dependencies(root).items():
+        path = mirrored_source(mirror, name, url, hashes.get(name))
+        if path:
+            sources[name] = path
+    return write_mirror_include(root, sources)
+
+
+def mirror_dependencies(
+    mirror: Path,
+    deps: Dict[str, str],
+    hashes: Optional[Dict[str, str]] = None,
+) -> Dict[str, object]:
+    """Populate the mirror concurrently; returns {name: Path or Exception}."""
+    results: Dict[str, object] = {}
+    hashes = hashes or {}
+
+    def _job(item):
+        name, url = item
+        try:
+            return name, populate(mirror, name, url, hashes.get(name))
+        except Exception as e:  # reported per dependency
+            return name, e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(deps)))) as pool:
+        for name, result in pool.map(_job, deps.items()):
+            results[name] = result
+    return results
+
+
+# ============================================================================
+# Add Dependency Backend
+# ============================================================================
+
+
+def add_fetchcontent_dependency(root: Path, package: str, url: str) -> str:
+    """
+    Declare a FetchContent dependency in CMakeLists.txt and mirror its sources.
+
+    Returns the FetchContent content name.
+    """
+    if not url.strip():
+        raise ValueError(f"No source archive URL for {package}")
+    name = re.sub(r"\W", "_", package)
+    cmake_file = root / "CMakeLists.txt"
+    content = cmake_file.read_text(encoding="utf-8")
+
+    if name.lower() not in (n.lower() for n in declared_dependencies(root)):
+        block = f"\nFetchContent_Declare({name}\n  URL {url}\n)\nFetchContent_MakeAvailable({name})\n"
+        hook = _MIRROR_HOOK_RE.search(content)
+        anchor = re.search(r"^include\(FetchContent\)\n", content, re.MULTILINE)
+        if hook:
+            content = content[: hook.end()] + block + content[hook.end() :]
+        elif anchor:
+            content = content[: anchor.end()] + block + content[anchor.end() :]
+        else:
+            content += "\ninclude(FetchContent)\n" + block
+        cmake_file.write_text(content, encoding="utf-8")
+
+    mirror = mirror_dir()
+    populate(mirror, name, url)
+    refresh_mirror_include(root, mirror)
+    return name
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_deps_mirror(root: Optional[Path] = None, directory: Optional[str] = None) -> bool:
+    """Populate the shared FetchContent mirror and point the project at it."""
+    print_banner(
+        "Dependency Mirror",
+        "Shared FetchContent sources for every project and preset",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    mirror = Path(directory).expanduser().resolve() if directory else mirror_dir()
+
+    deps = declared_dependencies(root)
+    if not deps:
+        print_error("No URL-based FetchContent_Declare() found in CMakeLists.txt.")
+        return False
+
+    with Spinner(f"Mirroring {len(deps)} dependencies...") as spinner:
+        results = mirror_dependencies(mirror, deps, declared_hashes(root))
+        failed = [name for name, r in results.items() if isinstance(r, Exception)]
+        if failed:
+            spinner.fail(f"Failed to mirror: {', '.join(failed)}")
+        else:
+            spinner.succeed(f"Mirrored {len(deps)} dependencies")
+
+    sources = {name: r for name, r in results.items() if isinstance(r, Path)}
+    include = write_mirror_include(root, sources)
+
+    print()
+    lines = []
+    for name, result in results.items():
+        if isinstance(result, Path):
+            lines.append(f"{green(Symbols.SUCCESS)} {name.ljust(14)} {dim(str(result))}")
+        else:
+            lines.append(f"{red(Symbols.ERROR)} {name.ljust(14)} {red(str(result))}")
+    print_box(lines, title=f"Mirror: {mirror}")
+    print()
+
+    print_success(f"Wrote {cyan(str(include.relative_to(root)))}")
+    print_info("Re-run cmake --preset <name>; FetchContent now uses the mirrored sources.")
+
+    return not failed
@@ -0,0 +1,419 @@
+"""
+Doctor command - concurrent environment probing.
+
+    cqs doctor [--json] [--timeout SECONDS] [--refresh]
+
+Every tool is located and actually executed (with a timeout) on a thread
+pool, its version parsed, and the results checked against the project's
+requirements: CMake from cmakeMinimumRequired, C++20/23 compiler support
+and the clang-format major version. Results are cached per user and
+only re-probed when PATH or a tool binary changes.
+"""
+
+import json
+import os
+import re
+import subprocess
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_list,
+    print_success,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    green,
+    yellow,
+    red,
+    dim,
+    bold,
+    Symbols,
+)
+from .presets import load_presets
+from .state import user_cache_dir, load_json, save_json
+
+
+# Seconds a single probe may take before it is reported as hung
+PROBE_TIMEOUT = 5.0
+
+# (commands, name, required, description, version arguments)
+TOOLS: List[Tuple[Tuple[str, ...], str, bool, str, Tuple[str, ...]]] = [
+    (("cmake",), "CMake", True, "Build system", ("--version",)),
+    (("ninja",), "Ninja", False, "Fast build tool", ("--version",)),
+    (("g++",), "GCC", False, "GNU C++ Compiler", ("--version",)),
+    (("clang++",), "Clang", False, "LLVM C++ Compiler", ("--version",)),
+    (("cl",), "MSVC", False, "Microsoft C++ Compiler", ()),
+    (("xmake",), "xmake", False, "Build system", ("--version",)),
+    (("vcpkg",), "vcpkg", False, "Package manager", ("version",)),
+    (("conan",), "Conan", False, "Package manager", ("--version",)),
+    (("ccache",), "ccache", False, "Compiler cache", ("--version",)),
+    (("sccache",), "sccache", False, "Compiler cache", ("--version",)),
+    (("mold",), "mold", False, "Fast linker", ("--version",)),
+    (("ld.lld", "lld-link"), "lld", False, "Fast linker", ("--version",)),
+    (("clang-format",), "clang-format", False, "Code formatter", ("--version",)),
+    (("clang-tidy",), "clang-tidy", False, "Static analyzer", ("--version",)),
+    (("cppcheck",), "cppcheck", False, "Static analyzer", ("--version",)),
+    (("doxygen",), "Doxygen", False, "Documentation generator", ("--version",)),
+    (("mkdocs",), "MkDocs", False, "Documentation generator", ("--version",)),
+    (("git",), "Git", True, "Version control", ("--version",)),
+    (("python", "python3"), "Python", True, "Scripting", ("--version",)),
+]
+
+COMPILERS = ("g++", "clang++", "cl")
+
+# Probe results cache in the user cache directory
+CACHE_FILE = "doctor.json"
+
+# Minimum MSVC (cl) versions for /std:c++20 and /std:c++latest with C++23 features
+MSVC_STANDARDS = {"c++20": (19, 29), "c++23": (19, 37)}
+
+_NAMED_VERSION_RE = re.compile(r"\bversion\s+v?(\d[\w.+-]*)", re.IGNORECASE)
+_DOTTED_VERSION_RE = re.compile(r"\bv?(\d+\.\d+(?:\.\d+)*)")
+
+
+# ============================================================================
+# Versions
+# ============================================================================
+
+
+def parse_version(output: str) -> str:
+    """Extract a version string from a tool's --version output."""
+    match = _NAMED_VERSION_RE.search(output) or _DOTTED_VERSION_RE.search(output)
+    return match.group(1).rstrip(".,-") if match else ""
+
+
+def version_tuple(version: str) -> Tuple[int, ...]:
+    """Return the leading numeric components of a version ('3.28.3-rc1' -> (3, 28, 3))."""
+    parts = []
+    for part in re.split(r"[.]", version):
+        match = re.match(r"\d+", part)
+        if not match:
+            break
+        parts.append(int(match.group()))
+        if match.group() != part:
+            break
+    return tuple(parts)
+
+
+def cmake_minimum(root: Path) -> Optional[Tuple[int, ...]]:
+    """Return cmakeMinimumRequired from CMakePresets.json."""
+    required = load_presets(root).get("cmakeMinimumRequired")
+    if not required:
+        return None
+    return (required.get("major", 0), required.get("minor", 0), required.get("patch", 0))
+
+
+# ============================================================================
+# Probes
+# ============================================================================
+
+
+def _run(cmd: List[str], timeout: float, stdin: Optional[str] = None) -> Tuple[Optional[int], str]:
+    """Run a probe command; returns (exit code or None on timeout, combined output)."""
+    try:
+        result = subprocess.run(
+            cmd,
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=None if stdin is not None else subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return None, ""
+    except OSError as e:
+        return -1, str(e)
+    return result.returncode, result.stdout
+
+
+def fingerprint(commands: Tuple[str, ...]) -> Optional[List[Any]]:
+    """Return [path, resolved path, mtime_ns, size] of the first tool found on PATH."""
+    path = next((p for p in map(shutil.which, commands) if p), None)
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, os.path.realpath(path), st.st_mtime_ns, st.st_size]
+
+
+def probe_tool(name: str, path: str, args: Tuple[str, ...], timeout: float) -> Dict[str, Any]:
+    """Run a tool and parse its version."""
+    start = time.perf_counter()
+    code, output = _run([path, *args], timeout)
+    # cl prints its banner and exits non-zero when run without sources
+    if code is None:
+        status = "timeout"
+    elif code == 0 or (name == "cl" and output):
+        status = "ok"
+    else:
+        status = "error"
+    return {
+        "status": status,
+        "path": path,
+        "version": parse_version(output) if status == "ok" else "",
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+_STANDARD_PROBE = "#if __cplusplus < {value}\n#error unsupported\n#endif\nint main() {{ return 0; }}\n"
+
+# (flags to try, minimum __cplusplus value)
+_STANDARD_FLAGS = {
+    "c++20": (("-std=c++20", "-std=c++2a"), "202002L"),
+    "c++23": (("-std=c++23", "-std=c++2b"), "202100L"),
+}
+
+
+def probe_cxx_standard(path: str, standard: str, timeout: float) -> bool:
+    """Check whether a GCC/Clang compiler accepts a C++ standard."""
+    flags, value = _STANDARD_FLAGS[standard]
+    for flag in flags:
+        code, _ = _run(
+            [path, flag, "-x", "c++", "-fsyntax-only", "-"],
+            timeout,
+            stdin=_STANDARD_PROBE.format(value=value),
+        )
+        if code == 0:
+            return True
+    return False
+
+
+def probe_environment(
+    timeout: float = PROBE_TIMEOUT,
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Probe every tool and compiler standard concurrently.
+
+    Tools whose fingerprint matches an entry in previous are not re-run.
+    """
+    start = time.perf_counter()
+    previous_tools = (previous or {}).get("tools", {})
+    tools: Dict[str, Dict[str, Any]] = {}
+    futures = {}
+
+    with ThreadPoolExecutor(max_workers=len(TOOLS) + 2 * len(COMPILERS)) as pool:
+        for commands, _, _, _, args in TOOLS:
+            name = commands[0]
+            fp = fingerprint(commands)
+            cached = previous_tools.get(name)
+            if cached and cached.get("fingerprint") == fp and cached["status"] != "timeout":
+                tools[name] = {**cached, "cached": True}
+            elif fp is None:
+                tools[name] = {"status": "missing", "path": None, "version": "", "seconds": 0.0, "fingerprint": None}
+            else:
+                futures[(name, None)] = pool.submit(probe_tool, name, fp[0], args, timeout)
+                if name in COMPILERS and name != "cl":
+                    for standard in _STANDARD_FLAGS:
+                        futures[(name, standard)] = pool.submit(probe_cxx_standard, fp[0], standard, timeout)
+                tools[name] = {"fingerprint": fp}
+
+        for (name, standard), future in futures.items():
+            if standard is None:
+                tools[name].update(future.result())
+            else:
+                tools[name].setdefault("standards", {})[standard] = future.result()
+
+    msvc = tools["cl"]
+    if msvc["status"] == "ok" and "standards" not in msvc:
+        version = version_tuple(msvc["version"])
+        msvc["standards"] = {s: version >= minimum for s, minimum in MSVC_STANDARDS.items()}
+
+    return {
+        "tools": tools,
+        "standards": {c: tools[c]["standards"] for c in COMPILERS if "standards" in tools[c]},
+        "wall_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+def load_environment(timeout: float = PROBE_TIMEOUT, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Return probe results, reusing the user-level cache.
+
+    The cache is discarded when PATH changes; otherwise only tools whose
+    binary path, mtime or size changed are probed again.
+    """
+    cache_path = user_cache_dir() / CACHE_FILE
+    search_path = os.environ.get("PATH", "")
+    cached = None if refresh else load_json(cache_path)
+    if not cached or cached.get("PATH") != search_path:
+        cached = None
+
+    env = probe_environment(timeout, cached)
+    if any(not t.get("cached") for t in env["tools"].values()):
+        tools = {name: {k: v for k, v in t.items() if k != "cached"} for name, t in env["tools"].items()}
+        save_json(cache_path, {"PATH": search_path, "tools": tools})
+    return env
+
+
+def tool_info(name: str) -> Dict[str, Any]:
+    """Return cached probe results for one tool (see TOOLS for names)."""
+    return load_environment()["tools"][name]
+
+
+# ============================================================================
+# Requirements
+# ============================================================================
+
+
+def check_requirements(root: Path, env: Dict[str, Any]) -> List[Tuple[bool, str]]:
+    """Check probed versions against project requirements; returns (ok, message) pairs."""
+    checks: List[Tuple[bool, str]] = []
+    tools = env["tools"]
+
+    minimum = cmake_minimum(root)
+    cmake = tools["cmake"]
+    if minimum and cmake["status"] == "ok":
+        wanted = ".".join(map(str, minimum))
+        ok = version_tuple(cmake["version"]) >= minimum
+        checks.append((ok, f"CMake {cmake['version']} {'>=' if ok else '<'} {wanted} (cmakeMinimumRequired)"))
+
+    supported = {s: [c for c, r in env["standards"].items() if r.get(s)] for s in _STANDARD_FLAGS}
+    checks.append(
+        (bool(supported["c++20"]), f"C++20 compiler: {', '.join(supported['c++20']) or 'none'}")
+    )
+    if supported["c++23"]:
+        checks.append((True, f"C++23 compiler: {', '.join(supported['c++23'])}"))
+
+    fmt = tools["clang-format"]
+    if fmt["status"] == "ok" and version_tuple(fmt["version"]):
+        checks.append(
+            (True, f"clang-format major version {version_tuple(fmt['version'])[0]} (output can differ across majors)")
+        )
+
+    return checks
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def _version_label(result: Dict[str, Any]) -> str:
+    if result["status"] == "timeout":
+        return red("[TIMEOUT]")
+    if result["status"] == "error":
+        return red("[FAILED TO RUN]")
+    return cyan(result["version"]) if result["version"] else ""
+
+
+def cmd_doctor(
+    root: Optional[Path] = None,
+    as_json: bool = False,
+    timeout: float = PROBE_TIMEOUT,
+    refresh: bool = False,
+) -> bool:
+    """Check development environment."""
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    env = load_environment(timeout, refresh)
+    checks = check_requirements(root, env)
+    tools = env["tools"]
+
+    all_required = all(tools[cmds[0]]["status"] == "ok" for cmds, _, required, _, _ in TOOLS if required)
+    compiler_found = any(tools[c]["status"] == "ok" for c in COMPILERS)
+    all_required = all_required and compiler_found and all(ok for ok, _ in checks)
+
+    if as_json:
+        report = {**env, "checks": [{"ok": ok, "message": m} for ok, m in checks], "ok": all_required}
+        print(json.dumps(report, indent=2))
+        return all_required
+
+    print_banner(
+        "Environment Doctor",
+        "Checking your development environment",
+        "",
+    )
+
+    print(f"  {bold('Required Tools:')}")
+    for cmds, name, required, desc, _ in TOOLS:
+        if not required:
+            continue
+        result = tools[cmds[0]]
+        if result["status"] == "ok":
+            print(f"    {green(Symbols.SUCCESS)} {name} {_version_label(result)} {dim(f'- {desc}')}")
+        elif result["status"] == "missing":
+            print(f"    {red(Symbols.ERROR)} {name} {dim(f'- {desc}')} {red('[MISSING]')}")
+        else:
+            print(f"    {red(Symbols.ERROR)} {name} {_version_label(result)} {dim(f'- {desc}')}")
+
+    print()
+    print(f"  {bold('Optional Tools:')}")
+    for cmds, name, required, desc, _ in TOOLS:
+        if required:
+            continue
+        result = tools[cmds[0]]
+        if result["status"] == "ok":
+            print(f"    {green(Symbols.SUCCESS)} {name} {_version_label(result)} {dim(f'- {desc}')}")
+        elif result["status"] == "missing":
+            print(f"    {yellow(Symbols.CIRCLE)} {name} {dim(f'- {desc}')}")
+        else:
+            print(f"    {yellow(Symbols.WARNING)} {name} {_version_label(result)} {dim(f'- {desc}')}")
+
+    print()
+    print(f"  {bold('Project Requirements:')}")
+    for ok, message in checks:
+        symbol = green(Symbols.SUCCESS) if ok else red(Symbols.ERROR)
+        print(f"    {symbol} {message}")
+
+    print()
+    probed = [t for t in tools.values() if not t.get("cached")]
+    probe_seconds = sum(t["seconds"] for t in probed)
+    print(
+        dim(
+            f"  Checked {len(tools)} tools in {env['wall_seconds']:.2f} s wall time "
+            f"({len(tools) - len(probed)} cached, {probe_seconds:.2f} s probing)"
+        )
+    )
+    print()
+
+    if not compiler_found:
+        print_error("No C++ compiler found!")
+        print_info("Install GCC, Clang, or MSVC to compile C++ code.")
+
+    slow = [cmds[0] for cmds, *_ in TOOLS if tools[cmds[0]]["status"] == "timeout"]
+    if slow:
+        print_warning(f"Timed out after {timeout:g} s: {', '.join(slow)}")
+
+    if all_required:
+        print_success("All required tools are available!")
+        print()
+        print_box(
+            [
+                f"cmake --preset ninja-debug",
+                f"cmake --build --preset ninja-debug",
+                f"ctest --preset ninja-debug",
+            ],
+            title="Quick Start",
+        )
+    else:
+        print_error("Some required tools are missing or outdated!")
+        print()
+        print_info("Installation suggestions:")
+        print_list(
+            [
+                "Windows: Install Visual Studio with C++ workload",
+                "Linux: sudo apt install build-essential cmake ninja-build",
+                "macOS: xcode-select --install && brew install cmake ninja",
+            ]
+        )
+
+    return all_required
@@ -0,0 +1,158 @@
+"""
+Folded stacks and flamegraphs - dependency-free rendering.
+
+Folded stacks use the common 'frame;frame;frame count' text format, one
+stack per line, root first. render_svg() turns them into a self-contained
+SVG (no scripts or external resources) with a tooltip on every frame.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Tuple
+from xml.sax.saxutils import escape
+
+
+SVG_WIDTH = 1200
+FRAME_HEIGHT = 16
+FONT_SIZE = 11
+MARGIN = 10
+TITLE_HEIGHT = 30
+
+# Frames narrower than this (pixels) are not drawn
+MIN_WIDTH = 0.3
+
+# Approximate width of one character at FONT_SIZE in Verdana
+CHAR_WIDTH = FONT_SIZE * 0.59
+
+
+# ============================================================================
+# Folded Stacks
+# ============================================================================
+
+
+def write_folded(stacks: Dict[Tuple[str, ...], float], path: Path) -> None:
+    """Write stacks as folded text, heaviest first."""
+    lines = [
+        f"{';'.join(frames)} {count:g}"
+        for frames, count in sorted(stacks.items(), key=lambda item: -item[1])
+        if frames and count > 0
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def read_folded(path: Path) -> Dict[Tuple[str, ...], float]:
+    """Read folded stacks written by write_folded() (or flamegraph.pl tooling)."""
+    stacks: Dict[Tuple[str, ...], float] = {}
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        frames, _, count = line.rpartition(" ")
+        if not frames:
+            continue
+        try:
+            value = float(count)
+        except ValueError:
+            continue
+        key = tuple(frames.split(";"))
+        stacks[key] = stacks.get(key, 0.0) + value
+    return stacks
+
+
+def top_functions(stacks: Dict[Tuple[str, ...], float], limit: int) -> List[Tuple[str, float, float]]:
+    """
+    Return (function, self share, total share) of the hottest functions by self cost.
+
+    Total counts each stack once per function, so recursion is not double-counted.
+    """
+    grand = sum(stacks.values()) or 1.0
+    self_cost: Dict[str, float] = {}
+    total_cost: Dict[str, float] = {}
+    for frames, count in stacks.items():
+        if not frames:
+            continue
+        self_cost[frames[-1]] = self_cost.get(frames[-1], 0.0) + count
+        for frame in set(frames):
+            total_cost[frame] = total_cost.get(frame, 0.0) + count
+    ranked = sorted(self_cost.items(), key=lambda item: -item[1])[:limit]
+    return [(name, value / grand, total_cost[name] / grand) for name, value in ranked]
+
+
+# ============================================================================
+# SVG
+# ============================================================================
+
+
+def _color(name: str) -> str:
+    """Return a stable warm color for a frame name."""
+    digest = hashlib.md5(name.encode("utf-8")).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 230},{digest[2] % 55})"
+
+
+class _Frame:
+    """A node of the merged call tree."""
+
+    __slots__ = ("name", "value", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value = 0.0
+        self.children: Dict[str, "_Frame"] = {}
+
+    def depth(self) -> int:
+        return 1 + max((c.depth() for c in self.children.values()), default=0)
+
+
+def _tree(stacks: Dict[Tuple[str, ...], float]) -> _Frame:
+    root = _Frame("all")
+    for frames, count in stacks.items():
+        node = root
+        node.value += count
+        for frame in frames:
+            node = node.children.setdefault(frame, _Frame(frame))
+            node.value += count
+    return root
+
+
+def render_svg(stacks: Dict[Tuple[str, ...], float], title: str, unit: str = "samples") -> str:
+    """Render folded stacks as a self-contained flamegraph SVG (root at the bottom)."""
+    root = _tree(stacks)
+    total = root.value or 1.0
+    depth = root.depth()
+    height = TITLE_HEIGHT + depth * FRAME_HEIGHT + 2 * MARGIN
+    scale = (SVG_WIDTH - 2 * MARGIN) / total
+
+    parts = [
+        '<?xml version="1.0" standalone="no"?>',
+        f'<svg version="1.1" width="{SVG_WIDTH}" height="{height}" viewBox="0 0 {SVG_WIDTH} {height}" '
+        'xmlns="http://www.w3.org/2000/svg">',
+        f'<rect x="0" y="0" width="{SVG_WIDTH}" height="{height}" fill="#f8f8f8"/>',
+        f'<text x="{SVG_WIDTH / 2}" y="{MARGIN + 14}" text-anchor="middle" font-family="Verdana" '
+        f'font-size="{FONT_SIZE + 4}">{escape(title)}</text>',
+        f'<g font-family="Verdana" font-size="{FONT_SIZE}">',
+    ]
+
+    # Iterative layout: (node, x, level)
+    pending: List[Tuple[_Frame, float, int]] = [(root, float(MARGIN), 0)]
+    while pending:
+        node, x, level = pending.pop()
+        value = node.value
+        width = value * scale
+        if width < MIN_WIDTH:
+            continue
+        y = height - MARGIN - (level + 1) * FRAME_HEIGHT
+        name = node.name
+        label = f"{name} ({value:g} {unit}, {value / total * 100:.2f}%)"
+        fits = int((width - 6) / CHAR_WIDTH)
+        text = name if len(name) <= fits else (name[: fits - 2] + ".." if fits > 3 else "")
+        parts.append(
+            f'<g><title>{escape(label)}</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FRAME_HEIGHT - 1}" '
+            f'fill="{_color(name) if level else "rgb(220,220,220)"}" rx="2"/>'
+            + (f'<text x="{x + 3:.1f}" y="{y + FRAME_HEIGHT - 4}">{escape(text)}</text>' if text else "")
+            + "</g>"
+        )
+        child_x = x
+        for child in sorted(node.children.values(), key=lambda c: c.name):
+            pending.append((child, child_x, level + 1))
+            child_x += child.value * scale
+
+    parts += ["</g>", "</svg>"]
+    return "\n".join(parts) + "\n"
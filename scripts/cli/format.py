@@ -0,0 +1,212 @@
+"""
+Format command - parallel, incremental clang-format.
+
+    cqs format [--check] [--changed [REF]] [--jobs N] [--verbose]
+
+Files are collected in a single walk and handed to clang-format in batches
+across a worker pool. Files whose content hash is known to be formatted
+under the current .clang-format and clang-format version are skipped.
+"""
+
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Set
+
+from .ui import (
+    print_banner,
+    print_success,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    yellow,
+    dim,
+)
+from .git import changed_files
+from .doctor import tool_info
+from .state import project_state_dir, load_json, save_json, hash_bytes, hash_file
+
+
+FORMAT_DIRECTORIES = ("include", "src", "tests", "benchmarks", "examples")
+FORMAT_EXTENSIONS = {".cpp", ".hpp", ".h", ".cc", ".cxx", ".hxx"}
+
+# Upper bound on files per clang-format invocation (keeps command lines short on Windows)
+MAX_BATCH = 64
+
+_VIOLATION_RE = re.compile(r"^(.+?):\d+:\d+: (?:warning|error): code should be clang-formatted")
+
+
+# ============================================================================
+# File Collection
+# ============================================================================
+
+
+def collect_sources(root: Path) -> List[Path]:
+    """Return all formattable files below the source directories."""
+    files: List[Path] = []
+    stack = [root / d for d in FORMAT_DIRECTORIES if (root / d).is_dir()]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif os.path.splitext(entry.name)[1].lower() in FORMAT_EXTENSIONS:
+                    files.append(Path(entry.path))
+    return sorted(files)
+
+
+def batches(files: List[Path], workers: int) -> List[List[Path]]:
+    """Split files into roughly equal batches, at least one per worker."""
+    size = max(1, min(MAX_BATCH, -(-len(files) // workers)))
+    return [files[i : i + size] for i in range(0, len(files), size)]
+
+
+# ============================================================================
+# clang-format
+# ============================================================================
+
+
+def check_batch(tool: str, files: List[Path]) -> Set[str]:
+    """Return the files in a batch that need formatting."""
+    result = subprocess.run(
+        [tool, "-style=file", "--dry-run", "--Werror", *map(str, files)],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    if result.returncode == 0:
+        return set()
+    dirty = set()
+    for line in result.stderr.splitlines():
+        match = _VIOLATION_RE.match(line)
+        if match:
+            dirty.add(os.path.normpath(match.group(1)))
+    # Unparseable failure: treat the whole batch as unformatted
+    return dirty or {str(f) for f in files}
+
+
+def format_batch(tool: str, files: List[Path]) -> Set[str]:
+    """Format a batch in place, returning files that clang-format failed on."""
+    result = subprocess.run(
+        [tool, "-style=file", "-i", *map(str, files)],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    return {str(f) for f in files} if result.returncode != 0 else set()
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_format(
+    root: Optional[Path] = None,
+    check: bool = False,
+    changed: Optional[str] = None,
+    jobs: Optional[int] = None,
+    verbose: bool = False,
+) -> bool:
+    """Format (or check) project sources, skipping files known to be formatted."""
+    print_banner(
+        "Format",
+        "Check formatting" if check else "Format source files",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+
+    info = tool_info("clang-format")
+    tool = info["path"]
+    if info["status"] != "ok":
+        print_error("clang-format not found in PATH.")
+        print_info("Install clang-format or add it to PATH.")
+        return False
+
+    start = time.perf_counter()
+    files = collect_sources(root)
+    if changed is not None:
+        wanted = set(changed_files(root, changed))
+        files = [f for f in files if f in wanted]
+    if not files:
+        print_success("No source files to format.")
+        return True
+
+    config = root / ".clang-format"
+    version = f"{info['version']} {info['fingerprint'][1]}"
+    stamp = hash_bytes(((hash_file(config) if config.exists() else "") + version).encode())
+
+    # Cache: rel path -> [mtime_ns, size, content hash] of files known to be formatted
+    cache_path = project_state_dir(root) / "format.json"
+    cache = load_json(cache_path, {})
+    known: Dict[str, List] = cache.get("files", {}) if cache.get("stamp") == stamp else {}
+
+    pending: List[Path] = []
+    digests: Dict[Path, str] = {}
+    for path in files:
+        rel = path.relative_to(root).as_posix()
+        st = path.stat()
+        cached = known.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            continue
+        digests[path] = hash_file(path)
+        if cached and cached[2] == digests[path]:
+            known[rel] = [st.st_mtime_ns, st.st_size, digests[path]]
+            continue
+        pending.append(path)
+
+    workers = jobs or os.cpu_count() or 1
+    print_info(
+        f"{cyan(str(len(files)))} file(s): {cyan(str(len(files) - len(pending)))} unchanged, "
+        f"{cyan(str(len(pending)))} to {'check' if check else 'format'}"
+    )
+
+    bad: Set[str] = set()
+    if pending:
+        worker = check_batch if check else format_batch
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(lambda batch: worker(tool, batch), batches(pending, workers)):
+                bad |= result
+
+    modified = []
+    for path in pending:
+        if str(path) in bad:
+            continue
+        rel = path.relative_to(root).as_posix()
+        digest = hash_file(path)
+        if digest != digests[path]:
+            modified.append(rel)
+        st = path.stat()
+        known[rel] = [st.st_mtime_ns, st.st_size, digest]
+
+    save_json(cache_path, {"stamp": stamp, "files": known})
+    elapsed = time.perf_counter() - start
+
+    if verbose:
+        for rel in modified:
+            print(f"  Formatted: {rel}")
+
+    if check:
+        for path in sorted(bad):
+            print(f"  {yellow('Needs formatting:')} {os.path.relpath(path, root)}")
+        print()
+        if bad:
+            print_error(f"{len(bad)} file(s) need formatting. Run: cqs format")
+            return False
+        print_success(f"All files are properly formatted {dim(f'({elapsed:.2f} s)')}")
+        return True
+
+    print()
+    if bad:
+        print_warning(f"clang-format failed on {len(bad)} file(s).")
+        return False
+    print_success(f"Formatted {len(modified)} of {len(files)} file(s) {dim(f'({elapsed:.2f} s)')}")
+    return True
@@ -0,0 +1,130 @@
+"""
+Git helpers - commits, changed files and lines, and worktrees.
+"""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Set, Optional
+
+
+def current_commit(root: Path, short: bool = True) -> str:
+    """Return the HEAD commit hash, or '' outside a git repository."""
+    cmd = ["git", "rev-parse", "--short", "HEAD"] if short else ["git", "rev-parse", "HEAD"]
+    result = subprocess.run(cmd, cwd=root, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def resolve_commit(root: Path, ref: str, short: bool = True) -> str:
+    """Return the commit hash a ref names."""
+    cmd = ["git", "rev-parse", "--verify", "--quiet"] + (["--short"] if short else []) + [f"{ref}^{{commit}}"]
+    result = subprocess.run(cmd, cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"Unknown git revision: {ref}")
+    return result.stdout.strip()
+
+
+def is_dirty(root: Path) -> bool:
+    """Return True if tracked files have uncommitted changes."""
+    result = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+    )
+    return result.returncode == 0 and bool(result.stdout.strip())
+
+
+# Refs tried, in order, as the mainline a branch forks from
+MAINLINE_REFS = ("origin/HEAD", "origin/main", "origin/master", "main", "master")
+
+
+def merge_base(root: Path, ref: str = "HEAD") -> Optional[str]:
+    """Return the commit where ref forks from the mainline, or None without one."""
+    for mainline in MAINLINE_REFS:
+        result = subprocess.run(["git", "merge-base", ref, mainline], cwd=root, capture_output=True, text=True)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    return None
+
+
+def first_parents(root: Path, ref: str, limit: int) -> List[str]:
+    """Return full hashes of ref and its first-parent ancestors, nearest first."""
+    result = subprocess.run(
+        ["git", "rev-list", "--first-parent", f"--max-count={limit}", ref], cwd=root, capture_output=True, text=True
+    )
+    return result.stdout.split() if result.returncode == 0 else []
+
+
+def changed_files(root: Path, ref: str = "HEAD") -> List[Path]:
+    """
+    Return existing files that differ from ref, including staged, unstaged
+    and untracked (but not ignored) files.
+    """
+    names = set()
+    for cmd in (
+        ["git", "diff", "--name-only", "--relative", ref],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ):
+        result = subprocess.run(cmd, cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ValueError(f"git failed: {result.stderr.strip() or ' '.join(cmd)}")
+        names.update(line for line in result.stdout.splitlines() if line)
+    return sorted(root / name for name in names if (root / name).is_file())
+
+
+def changed_lines(root: Path, ref: str = "HEAD") -> Dict[Path, Set[int]]:
+    """
+    Return the added or modified line numbers of every file that differs
+    from ref. Untracked files count as changed throughout.
+    """
+    result = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", "--no-ext-diff", "--relative", ref], cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise ValueError(f"git diff failed: {result.stderr.strip() or ref}")
+    lines: Dict[Path, Set[int]] = {}
+    current = None
+    for line in result.stdout.splitlines():
+        if line.startswith("+++ "):
+            name = line[4:]
+            current = root / name[2:] if name.startswith("b/") else None
+        elif line.startswith("@@") and current is not None:
+            match = re.match(r"@@ -\S+ \+(\d+)(?:,(\d+))? @@", line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                lines.setdefault(current, set()).update(range(start, start + count))
+    for path in changed_files(root, ref):
+        if path not in lines and path.is_file():
+            try:
+                count = len(path.read_text(encoding="utf-8", errors="replace").splitlines())
+            except OSError:
+                continue
+            lines[path] = set(range(1, count + 1))
+    return {path: numbers for path, numbers in lines.items() if numbers}
+
+
+def checkout_worktree(root: Path, path: Path, commit: str) -> None:
+    """
+    Check out commit (detached) in a linked worktree at path, creating it if needed.
+
+    Existing worktrees are reused, so their build directories stay incremental.
+    """
+    if (path / ".git").exists():
+        result = subprocess.run(
+            ["git", "checkout", "--quiet", "--force", "--detach", commit], cwd=path, capture_output=True, text=True
+        )
+        if result.returncode == 0:
+            return
+        subprocess.run(["git", "worktree", "remove", "--force", str(path)], cwd=root, capture_output=True)
+
+    # Drop a stale registration or leftover directory before re-adding
+    shutil.rmtree(path, ignore_errors=True)
+    subprocess.run(["git", "worktree", "prune"], cwd=root, capture_output=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    result = subprocess.run(
+        ["git", "worktree", "add", "--quiet", "--force", "--detach", str(path), commit],
+        cwd=root,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ValueError(f"git worktree add failed: {result.stderr.strip()}")
@@ -0,0 +1,303 @@
+"""
+Include graph command - #include dependency analysis and rebuild hotspots.
+
+    cqs graph [--format text|json|dot] [--top N]
+"""
+
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Set, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_warning,
+    print_info,
+    cyan,
+    dim,
+)
+from .compdb import find_compile_commands, load_compile_commands, include_dirs
+from .state import STATE_DIR_NAME, load_json, save_json, hash_bytes
+from .stats import HEADER_EXTENSIONS, SOURCE_EXTENSIONS
+
+
+GRAPH_CACHE_FILE = "graph-cache.json"
+SCAN_DIRECTORIES = ["include", "src", "tests", "benchmarks", "examples"]
+
+_INCLUDE_RE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\n]+)[>"]', re.MULTILINE)
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+
+def collect_files(root: Path) -> List[Path]:
+    """Return all C/C++ files below the scanned project directories."""
+    extensions = HEADER_EXTENSIONS | SOURCE_EXTENSIONS
+    files = []
+    for name in SCAN_DIRECTORIES:
+        directory = root / name
+        if directory.exists():
+            files.extend(p for p in directory.rglob("*") if p.suffix.lower() in extensions and p.is_file())
+    return sorted(files)
+
+
+def _parse(data: bytes) -> List[List[str]]:
+    return [[kind.decode(), name.decode("utf-8", "replace").strip()] for kind, name in _INCLUDE_RE.findall(data)]
+
+
+def parse_includes(files: List[Path], root: Path) -> Dict[Path, List[Tuple[str, str]]]:
+    """
+    Return the (kind, name) include directives of each file.
+
+    Parse results are cached by content hash in .cqs/graph-cache.json; an
+    mtime/size fingerprint avoids rehashing files that have not been touched.
+    """
+    cache_path = root / STATE_DIR_NAME / GRAPH_CACHE_FILE
+    cache = load_json(cache_path, {}) or {}
+    fingerprints: Dict[str, List[Any]] = cache.get("files", {})
+    parsed: Dict[str, List[List[str]]] = cache.get("parsed", {})
+
+    result: Dict[Path, List[Tuple[str, str]]] = {}
+    live_hashes: Set[str] = set()
+    dirty = False
+
+    for path in files:
+        rel = path.relative_to(root).as_posix()
+        st = path.stat()
+        fingerprint = fingerprints.get(rel)
+        if fingerprint and fingerprint[0] == st.st_mtime_ns and fingerprint[1] == st.st_size:
+            digest = fingerprint[2]
+        else:
+            data = path.read_bytes()
+            digest = hash_bytes(data)
+            fingerprints[rel] = [st.st_mtime_ns, st.st_size, digest]
+            dirty = True
+            if digest not in parsed:
+                parsed[digest] = _parse(data)
+        if digest not in parsed:
+            # Fingerprint survived but its parse entry was dropped
+            parsed[digest] = _parse(path.read_bytes())
+            dirty = True
+        live_hashes.add(digest)
+        result[path] = [(kind, name) for kind, name in parsed[digest]]
+
+    stale = set(fingerprints) - {p.relative_to(root).as_posix() for p in files}
+    if dirty or stale or set(parsed) != live_hashes:
+        for rel in stale:
+            del fingerprints[rel]
+        save_json(
+            cache_path,
+            {"files": fingerprints, "parsed": {h: parsed[h] for h in live_hashes}},
+        )
+
+    return result
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+
+def search_paths(root: Path, compdb: Optional[Path]) -> List[Path]:
+    """Return include search paths from compile_commands.json (or include/)."""
+    paths: List[Path] = []
+    if compdb:
+        seen = set()
+        for entry in load_compile_commands(compdb):
+            for d in include_dirs(entry):
+                key = os.path.normpath(str(d))
+                if key not in seen:
+                    seen.add(key)
+                    paths.append(Path(key))
+    if not paths:
+        paths = [root / "include"]
+    return paths
+
+
+def build_graph(root: Path) -> Dict[str, Any]:
+    """Build the project include graph (edges point from includer to header)."""
+    files = collect_files(root)
+    includes = parse_includes(files, root)
+    compdb = find_compile_commands(root)
+    paths = search_paths(root, compdb)
+    known = {os.path.normpath(str(p)): p for p in files}
+
+    edges: Dict[Path, Set[Path]] = {p: set() for p in files}
+    external: Dict[str, int] = {}
+
+    for path, directives in includes.items():
+        for kind, name in directives:
+            candidates = ([path.parent] if kind == '"' else []) + paths
+            target = None
+            for base in candidates:
+                key = os.path.normpath(str(base / name))
+                if key in known:
+                    target = known[key]
+                    break
+            if target is None:
+                external[name] = external.get(name, 0) + 1
+            elif target != path:
+                edges[path].add(target)
+
+    return {"files": files, "edges": edges, "external": external, "compdb": compdb}
+
+
+def _reachable(start: Path, edges: Dict[Path, Set[Path]]) -> Set[Path]:
+    seen: Set[Path] = set()
+    queue = deque(edges.get(start, ()))
+    while queue:
+        node = queue.popleft()
+        if node in seen or node == start:
+            continue
+        seen.add(node)
+        queue.extend(edges.get(node, ()))
+    return seen
+
+
+def transitive_includes(graph: Dict[str, Any], path: Path) -> Set[Path]:
+    """Return the project headers a file transitively includes."""
+    return _reachable(path, graph["edges"])
+
+
+def dependent_units(graph: Dict[str, Any], paths: List[Path]) -> Set[Path]:
+    """Return the translation units that transitively include any of paths."""
+    reverse: Dict[Path, Set[Path]] = {}
+    for src, targets in graph["edges"].items():
+        for target in targets:
+            reverse.setdefault(target, set()).add(src)
+    units: Set[Path] = set()
+    for path in paths:
+        for dependent in _reachable(path, reverse) | {path}:
+            if dependent.suffix.lower() in SOURCE_EXTENSIONS:
+                units.add(dependent)
+    return units
+
+
+def analyze(graph: Dict[str, Any], root: Path) -> Dict[str, Any]:
+    """Compute fan-in, transitive closure sizes and rebuild impact per file."""
+    files: List[Path] = graph["files"]
+    edges: Dict[Path, Set[Path]] = graph["edges"]
+
+    reverse: Dict[Path, Set[Path]] = {p: set() for p in files}
+    for src, targets in edges.items():
+        for target in targets:
+            reverse[target].add(src)
+
+    units = [p for p in files if p.suffix.lower() in SOURCE_EXTENSIONS]
+    closure = {p: _reachable(p, edges) for p in files}
+
+    def rel(p: Path) -> str:
+        return p.relative_to(root).as_posix()
+
+    nodes = []
+    for path in files:
+        dependents = _reachable(path, reverse)
+        rebuilt = [u for u in dependents if u.suffix.lower() in SOURCE_EXTENSIONS]
+        nodes.append(
+            {
+                "file": rel(path),
+                "header": path.suffix.lower() in HEADER_EXTENSIONS,
+                "includes": sorted(rel(t) for t in edges[path]),
+                "fan_in": len(reverse[path]),
+                "closure": len(closure[path]),
+                "rebuilds": len(rebuilt),
+            }
+        )
+
+    headers = [n for n in nodes if n["header"]]
+    return {
+        "nodes": nodes,
+        "translation_units": len(units),
+        "average_closure": round(sum(len(closure[u]) for u in units) / len(units), 2) if units else 0,
+        "hotspots": sorted(headers, key=lambda n: (n["rebuilds"], n["fan_in"]), reverse=True),
+        "external": dict(sorted(graph["external"].items(), key=lambda kv: -kv[1])),
+    }
+
+
+def to_dot(analysis: Dict[str, Any]) -> str:
+    """Render the graph in Graphviz DOT format (headers as boxes)."""
+    lines = ["digraph includes {", "  rankdir=LR;", '  node [fontname="Helvetica"];']
+    for node in analysis["nodes"]:
+        shape = "box" if node["header"] else "ellipse"
+        label = f"{node['file']}\\nrebuilds={node['rebuilds']}" if node["header"] else node["file"]
+        lines.append(f'  "{node["file"]}" [shape={shape}, label="{label}"];')
+    for node in analysis["nodes"]:
+        for target in node["includes"]:
+            lines.append(f'  "{node["file"]}" -> "{target}";')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_graph(root: Optional[Path] = None, output_format: str = "text", top: int = 10) -> bool:
+    """Analyze the #include graph and report build-cost hotspots."""
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+
+    if output_format not in ("text", "json", "dot"):
+        raise ValueError(f"Unknown format: {output_format} (use text, json or dot)")
+
+    graph = build_graph(root)
+    analysis = analyze(graph, root)
+
+    if output_format == "json":
+        print(json.dumps(analysis, indent=2))
+        return True
+    if output_format == "dot":
+        print(to_dot(analysis))
+        return True
+
+    print_banner(
+        "Include Graph",
+        "Header fan-in and rebuild hotspots",
+        "",
+    )
+
+    if graph["compdb"]:
+        print_info(f"Include paths from {cyan(str(graph['compdb'].relative_to(root)))}")
+    else:
+        print_warning("compile_commands.json not found; resolving against include/ only.")
+    print()
+
+    print_box(
+        [
+            f"Files:              {cyan(str(len(graph['files'])))}",
+            f"Translation units:  {cyan(str(analysis['translation_units']))}",
+            f"Avg. TU closure:    {cyan(str(analysis['average_closure']))} project headers",
+            f"External includes:  {cyan(str(len(analysis['external'])))} distinct",
+        ],
+        title="Summary",
+    )
+    print()
+
+    rows = [
+        f"{'rebuilds'.rjust(8)} {'fan-in'.rjust(6)} {'closure'.rjust(7)}  header",
+    ]
+    for node in analysis["hotspots"][:top]:
+        rows.append(
+            f"{str(node['rebuilds']).rjust(8)} {str(node['fan_in']).rjust(6)} "
+            f"{str(node['closure']).rjust(7)}  {node['file']}"
+        )
+    print_box(rows, title="Rebuild Hotspots")
+    print()
+
+    units = sorted((n for n in analysis["nodes"] if not n["header"]), key=lambda n: -n["closure"])
+    print_box(
+        [f"{str(n['closure']).rjust(7)}  {n['file']}" for n in units[:top]],
+        title="Largest TU Include Closures",
+    )
+    print()
+    print(dim("  Use --format json or --format dot for machine-readable output."))
+
+    return True
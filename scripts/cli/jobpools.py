@@ -0,0 +1,245 @@
+"""
+Jobs command - memory-aware Ninja job pools.
+
+    cqs jobs [--record | --no-record] [--reset]
+
+Measures usable cores and RAM (honoring cgroup limits) and writes
+.cqs/jobpools.cmake, which CMakeLists.txt includes. Compile and link pools
+are sized from the 95th percentile of peak RSS recorded by earlier builds
+(see rss.py); --record installs the recorder as RULE_LAUNCH_COMPILE/LINK.
+"""
+
+import ctypes
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_success,
+    print_info,
+    print_warning,
+    cyan,
+    dim,
+)
+from .state import project_state_dir, load_json, save_json, format_size
+
+
+INCLUDE_FILE = "jobpools.cmake"
+CONFIG_FILE = "jobpools.json"
+SAMPLES_DIR = "rss"
+
+# Peak RSS assumed per job until builds have been recorded
+DEFAULT_PEAKS = {"compile": 1 << 30, "link": 2 << 30}
+
+# Memory kept free for the OS and everything else
+MIN_RESERVE = 1 << 30
+RESERVE_FRACTION = 0.1
+
+# Links may use at most this share of usable memory
+LINK_SHARE = 0.5
+
+PERCENTILE = 0.95
+MAX_SAMPLES = 2000
+
+
+# ============================================================================
+# Machine
+# ============================================================================
+
+
+def usable_cores() -> int:
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _cgroup_limit() -> Optional[int]:
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value)
+    return None
+
+
+def total_memory() -> int:
+    """Return physical memory in bytes, capped by a container memory limit."""
+    if sys.platform == "win32":
+
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(status)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))  # type: ignore[attr-defined]
+        return int(status.ullTotalPhys)
+
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    limit = _cgroup_limit()
+    return min(memory, limit) if limit else memory
+
+
+# ============================================================================
+# Samples
+# ============================================================================
+
+
+def load_samples(samples_dir: Path, kind: str) -> List[int]:
+    """Return recorded peak RSS values for compile or link jobs, compacting the log."""
+    path = samples_dir / f"{kind}.jsonl"
+    if not path.exists():
+        return []
+    lines = path.read_text(encoding="utf-8").splitlines()
+    if len(lines) > MAX_SAMPLES:
+        lines = lines[-MAX_SAMPLES:]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    peaks = []
+    for line in lines:
+        try:
+            peaks.append(int(json.loads(line)["peak"]))
+        except (ValueError, KeyError, TypeError):
+            continue
+    return peaks
+
+
+def percentile(values: List[int], fraction: float) -> int:
+    """Return the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+# ============================================================================
+# Sizing
+# ============================================================================
+
+
+def plan_pools(cores: int, memory: int, compile_peak: int, link_peak: int) -> Dict[str, int]:
+    """
+    Size compile and link pools so that both running at full depth fit in memory.
+
+    Links are budgeted first (they are fewer but heavier); compiles get the rest.
+    """
+    usable = memory - max(MIN_RESERVE, int(memory * RESERVE_FRACTION))
+    link = max(1, min(cores, int(usable * LINK_SHARE // link_peak)))
+    compile_jobs = max(1, min(cores, int((usable - link * link_peak) // compile_peak)))
+    return {"compile": compile_jobs, "link": link}
+
+
+def render_include(pools: Dict[str, int], recorder: Optional[List[str]]) -> str:
+    """Return the contents of .cqs/jobpools.cmake."""
+    lines = [
+        "# Generated by `cqs jobs`; machine-specific, do not commit.",
+        f"set_property(GLOBAL APPEND PROPERTY JOB_POOLS cqs_compile={pools['compile']} cqs_link={pools['link']})",
+        "set(CMAKE_JOB_POOL_COMPILE cqs_compile)",
+        "set(CMAKE_JOB_POOL_LINK cqs_link)",
+    ]
+    if recorder:
+        python, script, samples = recorder
+        for kind, prop in (("compile", "RULE_LAUNCH_COMPILE"), ("link", "RULE_LAUNCH_LINK")):
+            lines.append(f'set_property(GLOBAL PROPERTY {prop} "\\"{python}\\" \\"{script}\\" {kind} \\"{samples}\\"")')
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_jobs(
+    root: Optional[Path] = None,
+    record: Optional[bool] = None,
+    reset: bool = False,
+) -> bool:
+    """Generate memory-aware Ninja job pools for this machine."""
+    print_banner(
+        "Job Pools",
+        "Memory-aware build parallelism",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    state_dir = project_state_dir(root)
+    samples_dir = state_dir / SAMPLES_DIR
+    config = load_json(state_dir / CONFIG_FILE, {}) or {}
+
+    if reset:
+        for kind in DEFAULT_PEAKS:
+            (samples_dir / f"{kind}.jsonl").unlink(missing_ok=True)
+    if record is None:
+        record = bool(config.get("record"))
+
+    cores = usable_cores()
+    memory = total_memory()
+
+    peaks: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    for kind, default in DEFAULT_PEAKS.items():
+        samples = load_samples(samples_dir, kind)
+        counts[kind] = len(samples)
+        peaks[kind] = percentile(samples, PERCENTILE) if samples else default
+
+    pools = plan_pools(cores, memory, peaks["compile"], peaks["link"])
+
+    recorder = None
+    if record:
+        samples_dir.mkdir(parents=True, exist_ok=True)
+        recorder = [
+            Path(sys.executable).as_posix(),
+            Path(__file__).with_name("rss.py").as_posix(),
+            samples_dir.as_posix(),
+        ]
+
+    include = state_dir / INCLUDE_FILE
+    include.write_text(render_include(pools, recorder), encoding="utf-8")
+    save_json(
+        state_dir / CONFIG_FILE,
+        {"record": record, "cores": cores, "memory": memory, "peaks": peaks, "pools": pools},
+        indent=2,
+    )
+
+    def _peak(kind: str) -> str:
+        source = f"p95 of {counts[kind]} recorded jobs" if counts[kind] else "assumed, nothing recorded yet"
+        return f"{cyan(format_size(peaks[kind]))} {dim(f'({source})')}"
+
+    print_box(
+        [
+            f"Cores:          {cyan(str(cores))}",
+            f"Memory:         {cyan(format_size(memory))}",
+            f"Compile peak:   {_peak('compile')}",
+            f"Link peak:      {_peak('link')}",
+            f"Compile pool:   {cyan(str(pools['compile']))}",
+            f"Link pool:      {cyan(str(pools['link']))}",
+        ],
+        title="Job Pools",
+    )
+    print()
+
+    print_success(f"Wrote {cyan(str(include.relative_to(root)))}")
+    if record:
+        print_info(f"Recording peak RSS of every compile and link into {cyan(str(samples_dir.relative_to(root)))}")
+        print_info("Re-run 'cqs jobs' after a few builds to resize the pools from the recordings.")
+    elif not any(counts.values()):
+        print_warning("No recorded builds yet; pools use default per-job estimates.")
+        print_info("Run 'cqs jobs --record', build, then 'cqs jobs' again for measured pools.")
+    print_info("Reconfigure existing build directories to pick up the pools.")
+    return True
@@ -0,0 +1,153 @@
+"""
+Presets command - per-preset build directories and the active preset.
+
+    cqs presets                 List presets, their build trees and the active one
+    cqs presets split           Give every preset its own build/<preset> tree
+    cqs presets use <preset>    Configure if needed and make preset the active one
+
+With one build tree per preset, switching between presets is an incremental
+no-op instead of a reconfigure and full rebuild. build/compile_commands.json,
+where clangd looks, is a symlink to the active preset's database.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    dim,
+)
+from .compdb import COMPDB_FILE, link_compile_commands, active_build_dir
+from .presets import (
+    PER_PRESET_BINARY_DIR,
+    configure_presets,
+    condition_matches,
+    visible_configure_presets,
+    shared_binary_dirs,
+    use_per_preset_binary_dirs,
+    binary_dir,
+)
+from .runner import configure_command, run_streamed
+
+
+def _relative(root: Path, path: Path) -> str:
+    try:
+        return str(path.relative_to(root))
+    except ValueError:
+        return str(path)
+
+
+def cmd_presets_list(root: Optional[Path] = None) -> bool:
+    """List configure presets with their build directories."""
+    print_banner(
+        "Presets",
+        "Build trees per configure preset",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if not (root / "CMakePresets.json").exists():
+        print_error("CMakePresets.json not found.")
+        return False
+
+    presets = configure_presets(root)
+    active = active_build_dir(root)
+    names = [name for name in visible_configure_presets(root) if condition_matches(presets, name)]
+    width = max([len(name) for name in names] + [6])
+    rows = [dim(f"  {'Preset':<{width}}  {'Configured':<10}  Build directory")]
+    for name in names:
+        path = binary_dir(root, name)
+        marker = green("*") if active is not None and path.resolve() == active else " "
+        configured = green("yes".ljust(10)) if (path / "CMakeCache.txt").exists() else dim("no".ljust(10))
+        rows.append(f"{marker} {name:<{width}}  {configured}  {_relative(root, path)}")
+    print_box(rows, title="Configure Presets")
+    print()
+
+    shared = shared_binary_dirs(root)
+    for path, users in shared.items():
+        print_warning(f"{_relative(root, path)} is shared by {', '.join(users)}")
+    if shared:
+        print_info(f"Switching between them rebuilds from scratch. Run {cyan('cqs presets split')} to separate them.")
+    elif active is None:
+        print_info(f"No active preset yet. Run {cyan('cqs presets use <preset>')} to link {COMPDB_FILE} for clangd.")
+    return True
+
+
+def cmd_presets_split(root: Optional[Path] = None) -> bool:
+    """Rewrite shared binaryDir entries so every preset gets its own build tree."""
+    print_banner(
+        "Presets",
+        "Per-preset build directories",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if not (root / "CMakePresets.json").exists():
+        print_error("CMakePresets.json not found.")
+        return False
+
+    changed = use_per_preset_binary_dirs(root)
+    if not changed:
+        print_success("Every preset already has its own build directory.")
+        return True
+
+    print_box(
+        [f"{name:<24} {dim('binaryDir ->')} {PER_PRESET_BINARY_DIR}" for name in changed],
+        title="CMakePresets.json",
+    )
+    print()
+    if (root / "build" / "CMakeCache.txt").exists():
+        print_info("The old shared tree in build/ is no longer used; remove it with ./scripts/clean.sh.")
+    print_success(f"Updated {len(changed)} preset(s). Switching presets no longer rebuilds from scratch.")
+    return True
+
+
+def cmd_presets_use(root: Optional[Path] = None, preset: str = "ninja-debug") -> bool:
+    """Make preset the active one, configuring it first if its tree does not exist."""
+    print_banner(
+        "Presets",
+        f"Activate {preset}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    path = binary_dir(root, preset)
+    if not (path / COMPDB_FILE).exists():
+        cmd = configure_command(preset)
+        print(dim(f"$ {' '.join(cmd)}"))
+        code, _ = run_streamed(cmd, cwd=root)
+        print()
+        if code != 0:
+            print_error(f"Configuring {preset} failed.")
+            return False
+
+    if path == root / "build":
+        print_warning(f"{preset} builds directly in build/; nothing to link.")
+        return True
+    if not (path / COMPDB_FILE).exists():
+        print_error(f"{preset} does not export {COMPDB_FILE} (CMAKE_EXPORT_COMPILE_COMMANDS is off).")
+        return False
+
+    link_compile_commands(root, path)
+    print_success(f"{preset} is active: build/{COMPDB_FILE} -> {_relative(root, path / COMPDB_FILE)}")
+    return True
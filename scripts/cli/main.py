@@ -7,28 +7,26 @@ Usage:
     python -m cli init          Initialize a new project
     python -m cli add module    Add a new module
     python -m cli add dep       Add a dependency
-    python -m cli info          Show project information
+    python -m cli info [--json] Show project information
     python -m cli doctor        Check development environment
+    python -m cli cache setup   Configure vcpkg/Conan binary caches
 """
 
 import argparse
+import json
 import sys
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 from . import __version__
 from .ui import (
     print_banner,
     print_box,
-    print_list,
-    print_success,
     print_error,
     print_warning,
     print_info,
     cyan,
     green,
-    yellow,
-    red,
     dim,
     bold,
     magenta,
@@ -44,9 +42,79 @@ from .commands import (
     cmd_strip_language,
     detect_project_info,
 )
-
-
-def cmd_info(root: Optional[Path] = None) -> bool:
+from .deps import cmd_deps_mirror
+from .graph import cmd_graph
+from .timetrace import cmd_build_profile
+from .ninja_log import cmd_build_stats
+from .tidy import cmd_tidy
+from .doctor import cmd_doctor, PROBE_TIMEOUT
+from .accelerate import cmd_accelerate
+from .jobpools import cmd_jobs
+from .build import cmd_build
+from .test import cmd_test
+from .matrix import cmd_matrix
+from .pgo import cmd_pgo
+from .size import cmd_size, SIZE_TARGET, NAMESPACE_DEPTH
+from .memprofile import cmd_memprofile, DEFAULT_GROWTH
+from .coverage import cmd_coverage
+from .layout import cmd_presets_list, cmd_presets_split, cmd_presets_use
+from .profile import cmd_profile, PROFILE_PRESET, DEFAULT_FREQUENCY
+from .bench import cmd_bench, DEFAULT_REPETITIONS, DEFAULT_THRESHOLD, DEFAULT_ALPHA, DEFAULT_NOISE
+from .format import cmd_format
+from .bincache import cmd_cache_setup, cmd_cache_stats, cmd_cache_prune
+from .state import parse_size, format_size
+from .stats import scan
+
+
+def _option(args: List[str], *names: str, default: Optional[str] = None) -> Optional[str]:
+    """Return the value of an option given as '--name VALUE' or '--name=VALUE'."""
+    for i, arg in enumerate(args):
+        for name in names:
+            if arg == name and i + 1 < len(args):
+                return args[i + 1]
+            if arg.startswith(name + "="):
+                return arg[len(name) + 1 :]
+    return default
+
+
+def _optional_value(args: List[str], name: str, implicit: str) -> Optional[str]:
+    """
+    Return the value of an option whose value is optional: None when absent,
+    implicit for a bare '--name', otherwise '--name VALUE' or '--name=VALUE'.
+    """
+    for i, arg in enumerate(args):
+        if arg.startswith(name + "="):
+            return arg[len(name) + 1 :]
+        if arg == name:
+            if i + 1 < len(args) and not args[i + 1].startswith("-"):
+                return args[i + 1]
+            return implicit
+    return None
+
+
+def _passthrough(args: List[str]) -> Tuple[List[str], List[str]]:
+    """Split arguments at '--' into (cqs arguments, arguments for the target)."""
+    if "--" in args:
+        index = args.index("--")
+        return args[:index], args[index + 1 :]
+    return args, []
+
+
+def _positionals(args: List[str], *value_options: str) -> List[str]:
+    """Return positional arguments after the command, skipping option values."""
+    result = []
+    skip = False
+    for arg in args[1:]:
+        if skip:
+            skip = False
+        elif arg in value_options:
+            skip = True
+        elif not arg.startswith("-"):
+            result.append(arg)
+    return result
+
+
+def cmd_info(root: Optional[Path] = None, as_json: bool = False, use_cache: bool = True) -> bool:
     """Show project information."""
     if root is None:
         root = Path.cwd()
@@ -56,33 +124,48 @@ def cmd_info(root: Optional[Path] = None) -> bool:
     project_info = detect_project_info(root)
 
     if not project_info:
+        if as_json:
+            print(json.dumps({"error": "Could not detect project information."}))
+            return False
         print_error("Could not detect project information.")
         print_info("Are you in a cpp-quick-starter project directory?")
         return False
 
+    # Detect features
+    feature_files = [
+        ("CMakeLists.txt", "CMake"),
+        ("xmake.lua", "xmake"),
+        ("vcpkg.json", "vcpkg"),
+        ("conanfile.txt", "Conan"),
+        ("tests", "Tests"),
+        ("benchmarks", "Benchmarks"),
+        ("docs", "Documentation"),
+    ]
+    detected = [name for path, name in feature_files if (root / path).exists()]
+
+    stats = scan(root, use_cache=use_cache)
+
+    if as_json:
+        print(
+            json.dumps(
+                {
+                    "name": project_info["name"],
+                    "root": str(root),
+                    "header_dir": project_info["header_dir"],
+                    "features": detected,
+                    **stats,
+                },
+                indent=2,
+            )
+        )
+        return True
+
     print_banner(
         project_info["name"],
         f"Project Information",
         "",
     )
 
-    # Detect features
-    features = []
-    if (root / "CMakeLists.txt").exists():
-        features.append(f"{green(Symbols.SUCCESS)} CMake")
-    if (root / "xmake.lua").exists():
-        features.append(f"{green(Symbols.SUCCESS)} xmake")
-    if (root / "vcpkg.json").exists():
-        features.append(f"{green(Symbols.SUCCESS)} vcpkg")
-    if (root / "conanfile.txt").exists():
-        features.append(f"{green(Symbols.SUCCESS)} Conan")
-    if (root / "tests").exists():
-        features.append(f"{green(Symbols.SUCCESS)} Tests")
-    if (root / "benchmarks").exists():
-        features.append(f"{green(Symbols.SUCCESS)} Benchmarks")
-    if (root / "docs").exists():
-        features.append(f"{green(Symbols.SUCCESS)} Documentation")
-
     print_box(
         [
             f"Name:       {cyan(project_info['name'])}",
@@ -94,123 +177,51 @@ def cmd_info(root: Optional[Path] = None) -> bool:
 
     print()
     print(f"  {bold('Features:')}")
-    for feature in features:
-        print(f"    {feature}")
-
-    # Count files
-    src_files = list((root / "src").rglob("*.cpp")) if (root / "src").exists() else []
-    header_files = (
-        list((root / "include").rglob("*.hpp")) if (root / "include").exists() else []
-    )
-    test_files = (
-        list((root / "tests").rglob("*.cpp")) if (root / "tests").exists() else []
-    )
+    for feature in detected:
+        print(f"    {green(Symbols.SUCCESS)} {feature}")
 
+    totals = stats["totals"]
+    ratio = stats["header_source_ratio"]
     print()
     print_box(
         [
-            f"Source files:  {cyan(str(len(src_files)))}",
-            f"Header files:  {cyan(str(len(header_files)))}",
-            f"Test files:    {cyan(str(len(test_files)))}",
+            f"Files:         {cyan(str(totals['files']))}",
+            f"Lines:         {cyan(str(totals['lines']))}",
+            f"Size:          {cyan(format_size(totals['bytes']))}",
+            f"Headers:       {cyan(str(stats['headers']))}",
+            f"Sources:       {cyan(str(stats['sources']))}",
+            f"Header/Source: {cyan(f'{ratio:.2f}' if ratio is not None else 'n/a')}",
         ],
         title="Statistics",
     )
 
-    return True
-
-
-def cmd_doctor(root: Optional[Path] = None) -> bool:
-    """Check development environment."""
-    import shutil
-    import subprocess
-
-    print_banner(
-        "Environment Doctor",
-        "Checking your development environment",
-        "",
-    )
-
-    tools = [
-        ("cmake", "CMake", True, "Build system"),
-        ("ninja", "Ninja", False, "Fast build tool"),
-        ("g++", "GCC", False, "GNU C++ Compiler"),
-        ("clang++", "Clang", False, "LLVM C++ Compiler"),
-        ("cl", "MSVC", False, "Microsoft C++ Compiler"),
-        ("xmake", "xmake", False, "Build system"),
-        ("vcpkg", "vcpkg", False, "Package manager"),
-        ("conan", "Conan", False, "Package manager"),
-        ("clang-format", "clang-format", False, "Code formatter"),
-        ("clang-tidy", "clang-tidy", False, "Static analyzer"),
-        ("cppcheck", "cppcheck", False, "Static analyzer"),
-        ("doxygen", "Doxygen", False, "Documentation generator"),
-        ("mkdocs", "MkDocs", False, "Documentation generator"),
-        ("git", "Git", True, "Version control"),
-        ("python", "Python", True, "Scripting"),
-    ]
-
-    print(f"  {bold('Required Tools:')}")
-    all_required = True
-    for cmd, name, required, desc in tools:
-        if not required:
-            continue
-
-        found = shutil.which(cmd) is not None
-
-        if found:
-            print(f"    {green(Symbols.SUCCESS)} {name} {dim(f'- {desc}')}")
-        else:
-            print(f"    {red(Symbols.ERROR)} {name} {dim(f'- {desc}')} {red('[MISSING]')}")
-            all_required = False
+    def _rows(buckets: Dict[str, Dict[str, int]], limit: int) -> List[str]:
+        return [
+            f"{name.ljust(16)} {str(b['files']).rjust(6)} files "
+            f"{str(b['lines']).rjust(8)} lines {format_size(b['bytes']).rjust(11)}"
+            for name, b in list(buckets.items())[:limit]
+        ]
 
     print()
-    print(f"  {bold('Optional Tools:')}")
-    compiler_found = False
-    for cmd, name, required, desc in tools:
-        if required:
-            continue
-
-        found = shutil.which(cmd) is not None
-
-        if cmd in ("g++", "clang++", "cl"):
-            if found:
-                compiler_found = True
-
-        if found:
-            print(f"    {green(Symbols.SUCCESS)} {name} {dim(f'- {desc}')}")
-        else:
-            print(f"    {yellow(Symbols.CIRCLE)} {name} {dim(f'- {desc}')}")
-
+    print_box(_rows(stats["by_directory"], 12), title="By Directory")
     print()
+    print_box(_rows(stats["by_extension"], 10), title="By Extension")
+    print()
+    print_box(
+        [f"{format_size(f['bytes']).rjust(11)}  {f['path']}" for f in stats["largest"][:5]],
+        title="Largest Files",
+    )
 
-    if not compiler_found:
-        print_error("No C++ compiler found!")
-        print_info("Install GCC, Clang, or MSVC to compile C++ code.")
-        all_required = False
-
-    if all_required:
-        print_success("All required tools are available!")
-        print()
-        print_box(
-            [
-                f"cmake --preset ninja-debug",
-                f"cmake --build --preset ninja-debug",
-                f"ctest --preset ninja-debug",
-            ],
-            title="Quick Start",
-        )
-    else:
-        print_error("Some required tools are missing!")
-        print()
-        print_info("Installation suggestions:")
-        print_list(
-            [
-                "Windows: Install Visual Studio with C++ workload",
-                "Linux: sudo apt install build-essential cmake ninja-build",
-                "macOS: xcode-select --install && brew install cmake ninja",
-            ]
+    scan_info = stats["scan"]
+    print()
+    print(
+        dim(
+            f"  Scanned in {scan_info['elapsed_ms']:.0f} ms "
+            f"({scan_info['cached']} cached, {scan_info['files_rescanned']} rescanned)"
         )
+    )
 
-    return all_required
+    return True
 
 
 def cmd_help() -> None:
@@ -234,10 +245,31 @@ def cmd_help() -> None:
         ("strip zh", "Remove Chinese from bilingual docs"),
         ("info", "Show project information"),
         ("doctor", "Check development environment"),
+        ("cache setup", "Configure vcpkg/Conan binary caches"),
+        ("cache stats", "Show binary cache hit/miss statistics"),
+        ("cache prune", "Prune binary caches by age and size"),
+        ("deps mirror", "Mirror FetchContent sources for offline reuse"),
+        ("graph", "Analyze the #include graph and rebuild hotspots"),
+        ("build-profile", "Aggregate clang -ftime-trace compile-time reports"),
+        ("build-stats", "Analyze the active build's .ninja_log: critical path, history"),
+        ("tidy", "Run clang-tidy in parallel with per-file caching"),
+        ("format", "Run clang-format in parallel, skipping clean files"),
+        ("accelerate", "Set up ccache/sccache and mold/lld presets"),
+        ("jobs", "Generate memory-aware Ninja job pools"),
+        ("build", "Configure and build with per-phase timing"),
+        ("test", "Run tests in parallel, longest first"),
+        ("bench", "Run benchmarks and gate on regressions"),
+        ("profile", "CPU-profile a target into a flamegraph"),
+        ("matrix", "Build several presets concurrently under one job budget"),
+        ("presets", "List presets, split build trees, switch the active one"),
+        ("pgo", "Profile-guided build trained on the benchmarks"),
+        ("size", "Size by section, namespace and template; diff snapshots"),
+        ("memprofile", "Heap profile with heaptrack/valgrind, flag allocation growth"),
+        ("coverage", "Instrumented test run with merged, diffable coverage report"),
         ("help", "Show this help message"),
     ]
     for cmd, desc in commands:
-        print(f"    {cyan(cmd.ljust(12))} {desc}")
+        print(f"    {cyan(cmd.ljust(14))} {desc}")
 
     print()
     print(f"  {bold('Examples:')}")
@@ -297,11 +329,261 @@ def main(args: Optional[List[str]] = None) -> int:
                 return 1
 
         elif command == "info":
-            success = cmd_info()
+            success = cmd_info(as_json="--json" in args, use_cache="--no-cache" not in args)
             return 0 if success else 1
 
         elif command == "doctor":
-            success = cmd_doctor()
+            timeout = _option(args, "--timeout")
+            success = cmd_doctor(
+                as_json="--json" in args,
+                timeout=float(timeout) if timeout else PROBE_TIMEOUT,
+                refresh="--refresh" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "cache":
+            subcommand = args[1] if len(args) > 1 else ""
+            if subcommand == "setup":
+                success = cmd_cache_setup(cache_dir=_option(args, "--dir"))
+            elif subcommand == "stats":
+                success = cmd_cache_stats()
+            elif subcommand == "prune":
+                max_age = _option(args, "--max-age")
+                max_size = _option(args, "--max-size")
+                success = cmd_cache_prune(
+                    max_age_days=float(max_age) if max_age else None,
+                    max_size=parse_size(max_size) if max_size else None,
+                    dry_run="--dry-run" in args,
+                )
+            else:
+                print_error("Missing subcommand. Use 'cache setup', 'cache stats' or 'cache prune'.")
+                return 1
+            return 0 if success else 1
+
+        elif command == "deps":
+            if len(args) < 2 or args[1] != "mirror":
+                print_error("Missing subcommand. Use 'deps mirror'.")
+                return 1
+            success = cmd_deps_mirror(directory=_option(args, "--dir"))
+            return 0 if success else 1
+
+        elif command == "graph":
+            success = cmd_graph(
+                output_format=_option(args, "--format", "-f", default="text"),
+                top=int(_option(args, "--top", default="10")),
+            )
+            return 0 if success else 1
+
+        elif command == "build-profile":
+            positional = _positionals(args, "--top")
+            success = cmd_build_profile(
+                preset=positional[0] if positional else "ninja-debug",
+                build="--no-build" not in args,
+                top=int(_option(args, "--top", default="15")),
+                as_json="--json" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "build-stats":
+            positional = _positionals(args, "--top")
+            success = cmd_build_stats(
+                target=positional[0] if positional else None,
+                top=int(_option(args, "--top", default="10")),
+                as_json="--json" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "tidy":
+            jobs = _option(args, "--jobs", "-j")
+            success = cmd_tidy(
+                preset=_option(args, "--preset"),
+                changed=_optional_value(args, "--changed", "HEAD"),
+                jobs=int(jobs) if jobs else None,
+            )
+            return 0 if success else 1
+
+        elif command == "format":
+            jobs = _option(args, "--jobs", "-j")
+            success = cmd_format(
+                check="--check" in args,
+                changed=_optional_value(args, "--changed", "HEAD"),
+                jobs=int(jobs) if jobs else None,
+                verbose="--verbose" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "accelerate":
+            max_size = _option(args, "--max-size")
+            success = cmd_accelerate(
+                max_size=parse_size(max_size) if max_size else None,
+                benchmark_preset=_optional_value(args, "--benchmark", "ninja-debug"),
+            )
+            return 0 if success else 1
+
+        elif command == "jobs":
+            record = True if "--record" in args else False if "--no-record" in args else None
+            success = cmd_jobs(record=record, reset="--reset" in args)
+            return 0 if success else 1
+
+        elif command == "build":
+            positional = _positionals(args, "--target", "--jobs", "-j")
+            jobs = _option(args, "--jobs", "-j")
+            success = cmd_build(
+                preset=positional[0] if positional else None,
+                target=_option(args, "--target"),
+                jobs=int(jobs) if jobs else None,
+                clean="--clean" in args,
+                use_xmake="--xmake" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "test":
+            positional = _positionals(args, "--jobs", "-j", "--filter", "-f", "--top", "--shard")
+            jobs = _option(args, "--jobs", "-j")
+            shards = _option(args, "--shard")
+            success = cmd_test(
+                preset=positional[0] if positional else "ninja-debug",
+                jobs=int(jobs) if jobs else None,
+                regex=_option(args, "--filter", "-f"),
+                build="--build" in args,
+                top=int(_option(args, "--top", default="10")),
+                shards=int(shards) if shards else None,
+            )
+            return 0 if success else 1
+
+        elif command == "bench":
+            positional = _positionals(
+                args,
+                "--repetitions",
+                "--filter",
+                "-f",
+                "--baseline",
+                "--threshold",
+                "--alpha",
+                "--compare",
+                "--noise",
+            )
+            threshold = _option(args, "--threshold")
+            noise = _option(args, "--noise")
+            success = cmd_bench(
+                preset=positional[0] if positional else "ninja-release",
+                repetitions=int(_option(args, "--repetitions", default=str(DEFAULT_REPETITIONS))),
+                benchmark_filter=_option(args, "--filter", "-f"),
+                baseline=_option(args, "--baseline"),
+                threshold=float(threshold) / 100 if threshold else DEFAULT_THRESHOLD,
+                alpha=float(_option(args, "--alpha", default=str(DEFAULT_ALPHA))),
+                build="--no-build" not in args,
+                compare=_option(args, "--compare"),
+                stable="--stable" in args,
+                noise=float(noise) / 100 if noise else DEFAULT_NOISE,
+            )
+            return 0 if success else 1
+
+        elif command == "profile":
+            args, target_args = _passthrough(args)
+            positional = _positionals(args, "--preset", "--tool", "--frequency", "--top")
+            if not positional:
+                print_error("Missing target. Use 'profile <target> [-- args]'.")
+                return 1
+            success = cmd_profile(
+                target=positional[0],
+                args=target_args,
+                preset=_option(args, "--preset", default=PROFILE_PRESET),
+                tool=_option(args, "--tool"),
+                frequency=int(_option(args, "--frequency", default=str(DEFAULT_FREQUENCY))),
+                top=int(_option(args, "--top", default="20")),
+                build="--no-build" not in args,
+            )
+            return 0 if success else 1
+
+        elif command == "matrix":
+            names = _option(args, "--presets", "-p")
+            jobs = _option(args, "--jobs", "-j")
+            success = cmd_matrix(
+                presets=[name.strip() for name in names.split(",") if name.strip()] if names else None,
+                jobs=int(jobs) if jobs else None,
+                target=_option(args, "--target", "-t"),
+            )
+            return 0 if success else 1
+
+        elif command == "presets":
+            subcommand = args[1] if len(args) > 1 else ""
+            if not subcommand:
+                success = cmd_presets_list()
+            elif subcommand == "split":
+                success = cmd_presets_split()
+            elif subcommand == "use":
+                if len(args) < 3:
+                    print_error("Missing preset. Use 'presets use <preset>'.")
+                    return 1
+                success = cmd_presets_use(preset=args[2])
+            else:
+                print_error("Unknown subcommand. Use 'presets', 'presets split' or 'presets use <preset>'.")
+                return 1
+            return 0 if success else 1
+
+        elif command == "pgo":
+            positional = _positionals(args, "--repetitions", "--filter", "-f")
+            success = cmd_pgo(
+                preset=positional[0] if positional else "ninja-release",
+                repetitions=int(_option(args, "--repetitions", default=str(DEFAULT_REPETITIONS))),
+                benchmark_filter=_option(args, "--filter", "-f"),
+                retrain="--retrain" in args,
+            )
+            return 0 if success else 1
+
+        elif command == "size":
+            positional = _positionals(args, "--preset", "--top", "--depth", "--label", "--diff")
+            success = cmd_size(
+                target=positional[0] if positional else SIZE_TARGET,
+                preset=_option(args, "--preset", default="ninja-release"),
+                top=int(_option(args, "--top", default="15")),
+                depth=int(_option(args, "--depth", default=str(NAMESPACE_DEPTH))),
+                label=_option(args, "--label"),
+                diff=_option(args, "--diff"),
+                build="--no-build" not in args,
+            )
+            return 0 if success else 1
+
+        elif command == "memprofile":
+            args, target_args = _passthrough(args)
+            positional = _positionals(args, "--preset", "--tool", "--case", "--threshold", "--top", "--label")
+            if not positional:
+                print_error("Missing target. Use 'memprofile <target> [--case PATTERN] [-- args]'.")
+                return 1
+            threshold = _option(args, "--threshold")
+            success = cmd_memprofile(
+                target=positional[0],
+                args=target_args,
+                preset=_option(args, "--preset", default=PROFILE_PRESET),
+                tool=_option(args, "--tool"),
+                case=_option(args, "--case"),
+                threshold=float(threshold) / 100 if threshold else DEFAULT_GROWTH,
+                top=int(_option(args, "--top", default="10")),
+                label=_option(args, "--label"),
+                build="--no-build" not in args,
+            )
+            return 0 if success else 1
+
+        elif command == "coverage":
+            # A bare --diff means the mainline fork point
+            diff = _optional_value(args, "--diff", "")
+            positional = [
+                arg
+                for arg in _positionals(args, "--jobs", "-j", "--fail-under", "--filter", "-f")
+                if arg != diff
+            ]
+            jobs = _option(args, "--jobs", "-j")
+            fail_under = _option(args, "--fail-under")
+            success = cmd_coverage(
+                preset=positional[0] if positional else "ninja-debug",
+                jobs=int(jobs) if jobs else None,
+                html_report="--html" in args,
+                diff=diff,
+                fail_under=float(fail_under) if fail_under else None,
+                test_filter=_option(args, "--filter", "-f"),
+                build="--no-build" not in args,
+            )
             return 0 if success else 1
 
         elif command == "strip":
@@ -334,6 +616,10 @@ def main(args: Optional[List[str]] = None) -> int:
         print_warning("Aborted.")
         return 130
 
+    except ValueError as e:
+        print_error(str(e))
+        return 2
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Matrix command - build several presets concurrently under one CPU budget.
+
+    cqs matrix --presets ninja-debug,ninja-release,... [--jobs N] [--target T]
+
+All presets are configured and built at the same time. Their jobs share a
+global budget (the usable core count by default): with Ninja >= 1.13 the
+builds draw tokens from one GNU make jobserver, so a preset that is linking
+or configuring leaves its cores to the others; older Ninja versions get a
+static -j split instead. Output is multiplexed with a per-preset prefix and
+each build's full log is kept in .cqs/matrix/<preset>.log.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    blue,
+    cyan,
+    green,
+    magenta,
+    red,
+    yellow,
+    dim,
+    strip_ansi,
+)
+from .jobpools import usable_cores
+from .presets import configure_presets, resolve_field, binary_dir as preset_binary_dir
+from .runner import variant_binary_dir, configure_command, build_command, run_streamed, require_tool
+from .state import project_state_dir
+
+
+MATRIX_DIR = "matrix"
+
+# First Ninja release that can act as a jobserver client
+JOBSERVER_NINJA = (1, 13)
+
+PREFIX_COLORS = (cyan, magenta, yellow, blue, green)
+
+
+# ============================================================================
+# Job Budget
+# ============================================================================
+
+
+def ninja_version() -> Optional[Tuple[int, int]]:
+    """Return the (major, minor) version of ninja on PATH."""
+    ninja = require_tool("ninja")
+    if not ninja:
+        return None
+    result = subprocess.run([ninja, "--version"], capture_output=True, text=True)
+    match = re.match(r"(\d+)\.(\d+)", result.stdout.strip())
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def split_jobs(budget: int, count: int) -> List[int]:
+    """Split a job budget as evenly as possible, giving every build at least one job."""
+    share, extra = divmod(max(budget, count), count)
+    return [share + (1 if i < extra else 0) for i in range(count)]
+
+
+class JobServer:
+    """
+    A GNU make 4.4 style FIFO jobserver.
+
+    Every client owns one implicit job slot, so the FIFO holds budget minus
+    the number of clients tokens. The server keeps the FIFO open for reading
+    and writing so clients never see end-of-file between builds.
+    """
+
+    def __init__(self, budget: int, clients: int) -> None:
+        self.budget = budget
+        self._dir = Path(tempfile.mkdtemp(prefix="cqs-jobserver-"))
+        self.path = self._dir / "fifo"
+        os.mkfifo(self.path)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        tokens = max(budget - clients, 0)
+        if tokens:
+            os.write(self._fd, b"+" * tokens)
+
+    def env(self, base: Dict[str, str]) -> Dict[str, str]:
+        """Return base with MAKEFLAGS pointing at this jobserver."""
+        env = dict(base)
+        env["MAKEFLAGS"] = f" -j{self.budget} --jobserver-auth=fifo:{self.path}"
+        # An explicit parallel level would make cmake pass -j and bypass the jobserver
+        env.pop("CMAKE_BUILD_PARALLEL_LEVEL", None)
+        return env
+
+    def __enter__(self) -> "JobServer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        os.close(self._fd)
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+class _NoJobServer:
+    """Stand-in for JobServer when builds get a static -j share."""
+
+    def env(self, base: Dict[str, str]) -> Dict[str, str]:
+        return base
+
+    def __enter__(self) -> "_NoJobServer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+# ============================================================================
+# Builds
+# ============================================================================
+
+
+class Multiplexer:
+    """Prints lines from concurrent builds with an aligned, colored prefix."""
+
+    def __init__(self, names: List[str]) -> None:
+        self._lock = threading.Lock()
+        width = max(len(name) for name in names)
+        self._prefixes = {
+            name: PREFIX_COLORS[i % len(PREFIX_COLORS)](name.ljust(width)) + dim(" | ") for i, name in enumerate(names)
+        }
+
+    def printer(self, name: str, log: Any) -> Callable[[str], None]:
+        prefix = self._prefixes[name]
+
+        def _print(line: str) -> None:
+            log.write(strip_ansi(line) + "\n")
+            with self._lock:
+                print(f"{prefix}{line}", flush=True)
+
+        return _print
+
+
+def matrix_binary_dirs(root: Path, presets: List[str]) -> Dict[str, Path]:
+    """
+    Return a build directory per preset.
+
+    Presets whose binaryDir collides with another selected preset's are
+    redirected to build/cqs/<preset>-matrix so concurrent builds never share
+    a tree.
+    """
+    dirs = {preset: preset_binary_dir(root, preset) for preset in presets}
+    counts: Dict[Path, int] = {}
+    for path in dirs.values():
+        counts[path] = counts.get(path, 0) + 1
+    return {
+        preset: path if counts[path] == 1 else variant_binary_dir(root, preset, "matrix")
+        for preset, path in dirs.items()
+    }
+
+
+def build_preset(
+    root: Path,
+    preset: str,
+    binary_dir: Path,
+    target: Optional[str],
+    jobs: Optional[int],
+    env: Dict[str, str],
+    out: Callable[[str], None],
+) -> Dict[str, Any]:
+    """Configure and build one preset, returning its timing and status."""
+    result: Dict[str, Any] = {"preset": preset, "ok": False, "configure": 0.0, "build": 0.0}
+    redirect = binary_dir if binary_dir != preset_binary_dir(root, preset) else None
+    steps = [
+        ("configure", configure_command(preset, redirect)),
+        ("build", build_command(binary_dir, [target] if target else None, jobs)),
+    ]
+    for step, cmd in steps:
+        out(dim(f"$ {' '.join(cmd)}"))
+        start = time.perf_counter()
+        code, lines = run_streamed(cmd, cwd=root, env=env, echo=False, on_line=out)
+        result[step] = time.perf_counter() - start
+        if code != 0:
+            result["tail"] = lines[-20:]
+            return result
+    result["ok"] = True
+    return result
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_matrix(
+    root: Optional[Path] = None,
+    presets: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+    target: Optional[str] = None,
+) -> bool:
+    """Configure and build several presets concurrently within one job budget."""
+    print_banner(
+        "Build Matrix",
+        "Concurrent preset builds",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    presets = list(dict.fromkeys(presets or []))
+    if not presets:
+        print_error("No presets given. Use --presets a,b,...")
+        return False
+    known = configure_presets(root)
+    unknown = [preset for preset in presets if preset not in known]
+    if unknown:
+        print_error(f"Unknown configure preset(s): {', '.join(unknown)}")
+        return False
+
+    budget = jobs or usable_cores()
+    all_ninja = all("Ninja" in (resolve_field(known, preset, "generator") or "") for preset in presets)
+    version = ninja_version()
+    use_jobserver = all_ninja and os.name != "nt" and version is not None and version >= JOBSERVER_NINJA
+    dirs = matrix_binary_dirs(root, presets)
+
+    log_dir = project_state_dir(root) / MATRIX_DIR
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    if use_jobserver:
+        print_info(f"Sharing {cyan(str(budget))} job tokens across {len(presets)} presets via a jobserver")
+        shares: List[Optional[int]] = [None] * len(presets)
+    else:
+        shares = list(split_jobs(budget, len(presets)))
+        reason = "Ninja < 1.13" if all_ninja and version else "no jobserver support"
+        print_info(f"Splitting {cyan(str(budget))} jobs across {len(presets)} presets ({reason})")
+    for preset, path in dirs.items():
+        if path != preset_binary_dir(root, preset):
+            print_warning(f"{preset} shares its binaryDir with another preset; building in {path.relative_to(root)}")
+    print()
+
+    mux = Multiplexer(presets)
+    logs = {preset: open(log_dir / f"{preset}.log", "w", encoding="utf-8") for preset in presets}
+    start = time.perf_counter()
+    try:
+        with (JobServer(budget, len(presets)) if use_jobserver else _NoJobServer()) as server:
+            env = server.env(dict(os.environ))
+            with ThreadPoolExecutor(max_workers=len(presets)) as pool:
+                futures = [
+                    pool.submit(build_preset, root, preset, dirs[preset], target, share, env, mux.printer(preset, logs[preset]))
+                    for preset, share in zip(presets, shares)
+                ]
+                results = [future.result() for future in futures]
+    finally:
+        for log in logs.values():
+            log.close()
+    wall = time.perf_counter() - start
+    print()
+
+    for result in results:
+        if not result["ok"]:
+            print(dim(f"--- {result['preset']} (last lines) ---"))
+            for line in result.get("tail", []):
+                print(f"  {line}")
+            print()
+
+    width = max(len(preset) for preset in presets)
+    rows = [dim(f"{'Preset':<{width}}  {'Status':<6} {'Jobs':>5} {'Configure':>10} {'Build':>9} {'Total':>9}")]
+    for result, share in zip(results, shares):
+        status = green("ok".ljust(6)) if result["ok"] else red("failed")
+        total = result["configure"] + result["build"]
+        jobs_text = str(share) if share else "pool"
+        rows.append(
+            f"{result['preset']:<{width}}  {status} {jobs_text:>5} "
+            f"{result['configure']:>8.1f} s {result['build']:>7.1f} s {total:>7.1f} s"
+        )
+    serial = sum(r["configure"] + r["build"] for r in results)
+    rows += [
+        "",
+        f"Wall time:  {cyan(f'{wall:.1f} s')}  " + dim(f"(sum of presets {serial:.1f} s, {serial / max(wall, 0.001):.1f}x)"),
+        f"Logs:       {dim(str(log_dir.relative_to(root)))}",
+    ]
+    print_box(rows, title="Build Matrix")
+    print()
+
+    failed = [r["preset"] for r in results if not r["ok"]]
+    if failed:
+        print_error(f"Failed: {', '.join(failed)}")
+        return False
+    print_success(f"Built {len(presets)} presets in {wall:.1f} s")
+    return True
@@ -0,0 +1,457 @@
+"""
+Memprofile command - heap profiling with per-commit allocation history.
+
+    cqs memprofile <target> [--preset P] [--tool heaptrack|valgrind] [--case PATTERN]
+                   [--threshold PCT] [--top N] [--label NAME] [--no-build] [-- args...]
+
+Builds the target like 'cqs profile' (RelWithDebInfo with frame pointers)
+and runs it under heaptrack, or under valgrind when heaptrack is not
+installed: massif for the peak heap and DHAT for allocation counts, since
+massif only records bytes. The report shows peak heap, the number of
+allocations (and temporary ones with heaptrack), bytes allocated and leaked,
+and the call stacks making the most allocations.
+
+With --case PATTERN the target is a GoogleTest binary and every test
+matching the --gtest_filter pattern is profiled on its own, so a regression
+is attributed to a single test.
+
+Summaries are stored in .cqs/memprofile/<target>/<case>/<key>@<preset>.json,
+keyed by commit (or --label), and compared with the previous one; growth
+of the peak or the allocation count beyond the threshold fails the command
+(exit code 1). The raw data and an allocation flamegraph of the last run
+are kept in a 'latest' directory next to them.
+"""
+
+import json
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    red,
+    dim,
+)
+from .flamegraph import write_folded, render_svg
+from .git import current_commit, is_dirty
+from .pgo import COMPILE_FLAG_VARIABLES, flag_variables
+from .presets import configure_presets
+from .profile import PROFILE_PRESET, FRAME_POINTER_FLAGS, build_target
+from .runner import require_tool
+from .state import project_state_dir, load_json, save_json, format_size
+
+
+MEMPROFILE_DIR = "memprofile"
+
+# Growth of the peak heap or the allocation count that is flagged
+DEFAULT_GROWTH = 0.05
+
+MASSIF_DEPTH = 30
+
+# Leaf frames that only forward to the allocator; stacks are attributed to their caller
+ALLOCATOR_FRAMES = re.compile(
+    r"^(?:malloc|calloc|realloc|aligned_alloc|memalign|posix_memalign|operator new(?:\[\])?)\b"
+)
+
+_ADDRESS = re.compile(r"^0x[0-9a-fA-F]+: ")
+_LOCATION = re.compile(r" \((?:in )?[^()]*\)$")
+_SIZE = re.compile(r"([\d.]+)\s*([KMGT]?)i?B?$")
+
+
+def clean_frame(frame: str) -> str:
+    """Strip the address and source location from a valgrind or heaptrack frame."""
+    frame = _ADDRESS.sub("", frame.strip())
+    return _LOCATION.sub("", frame) or frame
+
+
+def _folded(frames: List[str]) -> Tuple[str, ...]:
+    """Turn a leaf-first frame list into a root-first stack without allocator frames."""
+    while len(frames) > 1 and ALLOCATOR_FRAMES.match(frames[0]):
+        frames = frames[1:]
+    return tuple(reversed(frames))
+
+
+def _parse_size(text: str) -> int:
+    """Parse heaptrack's human-readable sizes (e.g. 73.73K, 1.20M, 512B)."""
+    match = _SIZE.search(text.strip())
+    if not match:
+        return 0
+    factor = {"": 1, "K": 1000, "M": 1000**2, "G": 1000**3, "T": 1000**4}[match.group(2)]
+    return int(float(match.group(1)) * factor)
+
+
+# ============================================================================
+# GoogleTest
+# ============================================================================
+
+
+def list_gtest_cases(executable: Path, pattern: str) -> List[str]:
+    """Return the full names of the tests in a GoogleTest binary matching a filter."""
+    result = subprocess.run(
+        [str(executable), "--gtest_list_tests", f"--gtest_filter={pattern}"],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    cases = []
+    suite = ""
+    for line in result.stdout.splitlines():
+        if not line.strip():
+            continue
+        name = line.split("#", 1)[0].rstrip()
+        if not line.startswith(" "):
+            suite = name.strip()
+        elif suite:
+            cases.append(suite + name.strip())
+    return cases
+
+
+# ============================================================================
+# heaptrack
+# ============================================================================
+
+
+def record_heaptrack(heaptrack: str, command: List[str], out_dir: Path) -> Tuple[int, Optional[Path]]:
+    """Run command under heaptrack; returns (exit code, data file)."""
+    for old in out_dir.glob("heaptrack.*"):
+        old.unlink()
+    code = subprocess.run([heaptrack, "-o", str(out_dir / "heaptrack")] + command).returncode
+    # heaptrack appends the compression suffix (.zst or .gz) itself
+    data = sorted(out_dir.glob("heaptrack.*"))
+    return code, data[0] if data else None
+
+
+def heaptrack_summary(text: str) -> Dict[str, int]:
+    """Parse the summary heaptrack_print writes at the end of its report."""
+    fields = {
+        "allocations": r"calls to allocation functions: (\d+)",
+        "temporary": r"temporary memory allocations: (\d+)",
+        "peak_bytes": r"peak heap memory consumption: (\S+)",
+        "leaked_bytes": r"total memory leaked: (\S+)",
+    }
+    summary = {}
+    for key, pattern in fields.items():
+        match = re.search(pattern, text)
+        if match:
+            value = match.group(1)
+            summary[key] = int(value) if value.isdigit() and key in ("allocations", "temporary") else _parse_size(value)
+    return summary
+
+
+def heaptrack_profile(heaptrack_print: str, data: Path, out_dir: Path) -> Tuple[Dict[str, int], Dict[Tuple[str, ...], float]]:
+    """Return (summary, allocation-count stacks) of a heaptrack recording."""
+    folded = out_dir / "heaptrack-stacks.txt"
+    cmd = [heaptrack_print, "-f", str(data), "--print-flamegraph", str(folded), "--flamegraph-cost-type", "allocations"]
+    for report in ("--print-peaks", "--print-allocators", "--print-temporary", "--print-leaks"):
+        cmd += [report, "0"]
+    result = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
+    if result.returncode != 0:
+        raise ValueError(f"heaptrack_print failed: {result.stderr.strip()}")
+
+    stacks: Dict[Tuple[str, ...], float] = {}
+    if folded.exists():
+        for line in folded.read_text(encoding="utf-8", errors="replace").splitlines():
+            frames, _, count = line.rpartition(" ")
+            if not frames or not count.isdigit():
+                continue
+            # heaptrack writes stacks root first
+            key = _folded([clean_frame(f) for f in reversed(frames.split(";"))])
+            stacks[key] = stacks.get(key, 0.0) + int(count)
+    return heaptrack_summary(result.stdout), stacks
+
+
+# ============================================================================
+# valgrind (massif + DHAT)
+# ============================================================================
+
+
+def record_valgrind(valgrind: str, command: List[str], out_dir: Path) -> Tuple[int, Path, Path]:
+    """Run command under massif and DHAT; returns (exit code, massif.out, dhat.out)."""
+    massif = out_dir / "massif.out"
+    dhat = out_dir / "dhat.out"
+    code = subprocess.run(
+        [valgrind, "--tool=massif", f"--depth={MASSIF_DEPTH}", f"--massif-out-file={massif}"] + command
+    ).returncode
+    subprocess.run(
+        [valgrind, "--tool=dhat", f"--dhat-out-file={dhat}"] + command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return code, massif, dhat
+
+
+def parse_massif(text: str) -> Tuple[int, Dict[Tuple[str, ...], float]]:
+    """
+    Return (peak heap bytes, stacks holding memory at the peak) of a massif profile.
+
+    The peak snapshot's tree starts at the allocation functions; each level
+    below, indented one more space, is a caller. Leaves ('n0:') carry the
+    bytes of one call path.
+    """
+    peak = 0
+    stacks: Dict[Tuple[str, ...], float] = {}
+    in_peak = False
+    path: List[str] = []
+    for line in text.splitlines():
+        if line.startswith("mem_heap_B="):
+            peak = max(peak, int(line.split("=", 1)[1]))
+        elif line.startswith("heap_tree="):
+            in_peak = line.strip() == "heap_tree=peak"
+            path = []
+        elif line.startswith("snapshot=") or line.startswith("#"):
+            in_peak = False
+        elif in_peak:
+            match = re.match(r"^( *)n(\d+): (\d+) (.*)$", line)
+            if not match:
+                continue
+            depth = len(match.group(1))
+            children, size, frame = int(match.group(2)), int(match.group(3)), match.group(4)
+            path = path[:depth] + [clean_frame(frame)]
+            if children == 0 and size and depth > 0:
+                key = _folded(path[1:])
+                stacks[key] = stacks.get(key, 0.0) + size
+    return peak, stacks
+
+
+def parse_dhat(data: Dict[str, Any]) -> Tuple[Dict[str, int], Dict[Tuple[str, ...], float]]:
+    """
+    Return (summary, allocation-count stacks) of a DHAT profile.
+
+    Each program point ('pps') records totals for one allocation stack:
+    'tbk' blocks and 'tb' bytes allocated, 'gb' bytes live at the global
+    peak and 'eb' bytes still live at exit. Its 'fs' indexes frames in
+    'ftbl', innermost first.
+    """
+    frames = data.get("ftbl", [])
+    summary = {"allocations": 0, "allocated_bytes": 0, "peak_bytes": 0, "leaked_bytes": 0}
+    stacks: Dict[Tuple[str, ...], float] = {}
+    for point in data.get("pps", []):
+        summary["allocations"] += point.get("tbk", 0)
+        summary["allocated_bytes"] += point.get("tb", 0)
+        summary["peak_bytes"] += point.get("gb", 0)
+        summary["leaked_bytes"] += point.get("eb", 0)
+        names = [clean_frame(frames[i]) for i in point.get("fs", []) if i < len(frames) and frames[i] != "[root]"]
+        if names and point.get("tbk"):
+            key = _folded(names)
+            stacks[key] = stacks.get(key, 0.0) + point["tbk"]
+    return summary, stacks
+
+
+def valgrind_profile(massif: Path, dhat: Path) -> Tuple[Dict[str, int], Dict[Tuple[str, ...], float]]:
+    """Combine massif's peak with DHAT's allocation counts."""
+    summary: Dict[str, int] = {}
+    stacks: Dict[Tuple[str, ...], float] = {}
+    if dhat.exists():
+        summary, stacks = parse_dhat(json.loads(dhat.read_text(encoding="utf-8", errors="replace")))
+    if massif.exists():
+        peak, peak_stacks = parse_massif(massif.read_text(encoding="utf-8", errors="replace"))
+        summary["peak_bytes"] = peak
+        write_folded(peak_stacks, massif.with_suffix(".folded"))
+    return summary, stacks
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+
+def series_dir(root: Path, target: str, case: Optional[str]) -> Path:
+    """Return the directory holding summaries of one target or test case."""
+    name = re.sub(r"[^\w.-]", "_", case) if case else "all"
+    return project_state_dir(root) / MEMPROFILE_DIR / target / name
+
+
+def previous_summary(directory: Path, preset: str, tool: str, exclude: Path) -> Optional[Dict[str, Any]]:
+    """Return the most recent other summary recorded with the same preset and tool."""
+    summaries = [load_json(p, {}) for p in directory.glob(f"*@{preset}.json") if p != exclude]
+    summaries = [s for s in summaries if s.get("tool") == tool]
+    return max(summaries, key=lambda s: s.get("time", 0)) if summaries else None
+
+
+def growth(before: Dict[str, Any], after: Dict[str, Any], threshold: float) -> List[str]:
+    """Return the metrics that grew beyond threshold."""
+    grown = []
+    for key in ("peak_bytes", "allocations"):
+        old, new = before.get(key), after.get(key)
+        if old is not None and new is not None and new > old * (1 + threshold):
+            grown.append(key)
+    return grown
+
+
+def _change(old: Optional[int], new: Optional[int]) -> str:
+    if not old or new is None:
+        return dim("-")
+    change = (new - old) / old * 100
+    text = f"{change:+.1f}%"
+    return red(text) if change > 0 else green(text) if change < 0 else dim(text)
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def profile_run(
+    command: List[str],
+    out_dir: Path,
+    heaptrack: Optional[str],
+    valgrind: Optional[str],
+) -> Tuple[int, Dict[str, int], Dict[Tuple[str, ...], float]]:
+    """Profile one command; returns (exit code, summary, allocation stacks)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if heaptrack:
+        code, data = record_heaptrack(heaptrack, command, out_dir)
+        if data is None:
+            raise ValueError("heaptrack did not write a recording.")
+        summary, stacks = heaptrack_profile(require_tool("heaptrack_print") or "heaptrack_print", data, out_dir)
+    else:
+        code, massif, dhat = record_valgrind(valgrind or "valgrind", command, out_dir)
+        summary, stacks = valgrind_profile(massif, dhat)
+    return code, summary, stacks
+
+
+def cmd_memprofile(
+    root: Optional[Path] = None,
+    target: str = "cpp_quick_starter_app",
+    args: Optional[List[str]] = None,
+    preset: str = PROFILE_PRESET,
+    tool: Optional[str] = None,
+    case: Optional[str] = None,
+    threshold: float = DEFAULT_GROWTH,
+    top: int = 10,
+    label: Optional[str] = None,
+    build: bool = True,
+) -> bool:
+    """Heap-profile a target (or each matching gtest case) and flag growth against history."""
+    print_banner(
+        "Memprofile",
+        f"Heap profile of {target}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    heaptrack = require_tool("heaptrack") if tool in (None, "heaptrack") else None
+    valgrind = require_tool("valgrind") if tool in (None, "valgrind", "massif") and not heaptrack else None
+    if not heaptrack and not valgrind:
+        print_error("Neither heaptrack nor valgrind found." if tool is None else f"{tool} not found.")
+        print_info("Install heaptrack or valgrind.")
+        return False
+    tool_name = "heaptrack" if heaptrack else "valgrind"
+
+    cache_vars = flag_variables(root, preset, FRAME_POINTER_FLAGS, COMPILE_FLAG_VARIABLES)
+    executable = build_target(root, preset, "profile", target, cache_vars, build)
+    if executable is None:
+        print_error(f"Could not build target {target}." if build else f"{target} not built yet; run without --no-build.")
+        return False
+    print()
+
+    cases: List[Optional[str]] = [None]
+    if case:
+        cases = list_gtest_cases(executable, case)
+        if not cases:
+            print_error(f"No tests in {target} match {case}.")
+            return False
+        print_info(f"Profiling {cyan(str(len(cases)))} test case(s) one at a time")
+        print()
+
+    key = label or (current_commit(root) or "worktree") + ("-dirty" if is_dirty(root) else "")
+    results = []
+    for name in cases:
+        directory = series_dir(root, target, name)
+        command = [str(executable)] + (args or []) + ([f"--gtest_filter={name}"] if name else [])
+        print(dim(f"$ {tool_name} {' '.join(command)}"))
+        start = time.perf_counter()
+        code, summary, stacks = profile_run(command, directory / "latest", heaptrack, valgrind)
+        elapsed = time.perf_counter() - start
+        if code:
+            print_warning(f"{name or target} exited with code {code}")
+
+        ranked = sorted(stacks.items(), key=lambda item: -item[1])
+        write_folded(stacks, directory / "latest" / "allocations.folded")
+        if stacks:
+            svg = render_svg(stacks, f"{name or target} allocations ({tool_name})", "allocations")
+            (directory / "latest" / "allocations.svg").write_text(svg, encoding="utf-8")
+
+        path = directory / f"{key}@{preset}.json"
+        record = {
+            "time": int(time.time()),
+            "key": key,
+            "preset": preset,
+            "target": target,
+            "case": name,
+            "tool": tool_name,
+            "seconds": round(elapsed, 3),
+            **summary,
+            "top_stacks": [{"stack": ";".join(stack), "allocations": int(count)} for stack, count in ranked[:top]],
+        }
+        save_json(path, record, indent=2)
+        previous = previous_summary(directory, preset, tool_name, path)
+        results.append((name, record, previous, ranked, directory))
+
+    print()
+    rows = [dim(f"{'Case':<40} {'Peak':>10} {'Change':>8} {'Allocs':>10} {'Change':>8}")]
+    flagged = []
+    for name, record, previous, _, _ in results:
+        before = previous or {}
+        case_label = name or target
+        grown = growth(before, record, threshold)
+        if grown:
+            flagged.append((case_label, grown))
+        shown = case_label if len(case_label) <= 40 else case_label[:37] + "..."
+        peak, allocations = record.get("peak_bytes"), record.get("allocations")
+        rows.append(
+            f"{shown:<40} {format_size(peak or 0):>10} {_change(before.get('peak_bytes'), peak):>8} "
+            f"{allocations if allocations is not None else '-':>10} {_change(before.get('allocations'), allocations):>8}"
+        )
+    print_box(rows, title=f"Heap ({tool_name})")
+    print()
+
+    if len(results) == 1:
+        name, record, previous, ranked, directory = results[0]
+        total = sum(count for _, count in ranked) or 1
+        seconds = record["seconds"]
+        lines = [dim(f"{'Allocs':>10} {'Share':>6}  Stack (innermost first)")]
+        for stack, count in ranked[:top]:
+            trail = " <- ".join(reversed(stack[-3:]))
+            trail = trail if len(trail) <= 80 else trail[:77] + "..."
+            lines.append(f"{int(count):>10} {count / total * 100:>5.1f}%  {trail}")
+        print_box(lines, title=f"Top {top} Allocating Stacks")
+        print()
+        details = [
+            f"Allocations:  {cyan(str(record.get('allocations', '-')))}"
+            + (dim(f"  ({record['temporary']} temporary)") if "temporary" in record else ""),
+            f"Peak heap:    {cyan(format_size(record.get('peak_bytes', 0)))}",
+        ]
+        if "allocated_bytes" in record:
+            details.append(f"Allocated:    {cyan(format_size(record['allocated_bytes']))}")
+        details += [
+            f"Leaked:       {cyan(format_size(record.get('leaked_bytes', 0)))}",
+            f"Run time:     {cyan(f'{seconds:.2f} s')}",
+            f"Flamegraph:   {dim(str((directory / 'latest' / 'allocations.svg').relative_to(root)))}",
+            f"Baseline:     {dim(previous['key'] if previous else 'none (first run)')}",
+        ]
+        print_box(details, title="Memprofile")
+        print()
+
+    if flagged:
+        for case_label, grown in flagged:
+            print_error(f"{case_label}: {' and '.join(g.replace('_bytes', '').replace('_', ' ') for g in grown)} grew by more than {threshold * 100:.0f}%")
+        return False
+    print_success(f"No heap growth beyond {threshold * 100:.0f}%.")
+    return True
@@ -0,0 +1,482 @@
+"""
+Build statistics command - .ninja_log analysis with history.
+
+    cqs build-stats [BUILD_DIR | PRESET] [--top N] [--json]
+
+Without an argument the active build directory (the one
+build/compile_commands.json links to) is analyzed, else the ninja-debug preset's.
+
+The log is parsed incrementally (only bytes appended since the last run);
+each new build is summarized, appended to .cqs/ninja/<dir>/history.jsonl and
+compared against recent per-output durations to flag compile-time regressions.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    yellow,
+    dim,
+)
+from .presets import configure_presets, binary_dir as preset_binary_dir
+from .compdb import active_build_dir
+from .git import current_commit
+from .runner import require_tool
+from .state import project_state_dir, load_json, save_json
+
+
+NINJA_LOG = ".ninja_log"
+
+# Preset used when no build directory is given and none is active
+DEFAULT_PRESET = "ninja-debug"
+
+COMPILE_EXTENSIONS = {".o", ".obj", ".gch", ".pch"}
+LINK_EXTENSIONS = {".a", ".lib", ".so", ".dylib", ".dll", ".exe", ""}
+
+# Durations kept per output for regression detection
+HISTORY_SAMPLES = 10
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_MS = 100
+
+
+# ============================================================================
+# Log Parsing
+# ============================================================================
+
+
+class Edge:
+    """One build edge from .ninja_log (several outputs may share an edge)."""
+
+    __slots__ = ("outputs", "start", "end", "command_hash")
+
+    def __init__(self, output: str, start: int, end: int, command_hash: str):
+        self.outputs = [output]
+        self.start = start
+        self.end = end
+        self.command_hash = command_hash
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    @property
+    def kind(self) -> str:
+        ext = os.path.splitext(self.outputs[0])[1].lower()
+        if ext in COMPILE_EXTENSIONS:
+            return "compile"
+        if ext in LINK_EXTENSIONS or re.search(r"\.so\.\d", self.outputs[0]):
+            return "link"
+        return "other"
+
+
+def split_builds(lines: List[str]) -> List[List[Edge]]:
+    """
+    Group log lines into builds.
+
+    Entries are appended in completion order with times relative to the
+    build start, so a decreasing end time marks the start of a new build.
+    """
+    builds: List[List[Edge]] = []
+    current: List[Edge] = []
+    by_key: Dict[Tuple[int, int, str], Edge] = {}
+    last_end = -1
+
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split("\t")
+        if len(parts) < 5:
+            continue
+        start, end, output, command_hash = int(parts[0]), int(parts[1]), parts[3], parts[4]
+        if end < last_end and current:
+            builds.append(current)
+            current, by_key = [], {}
+        last_end = end
+        key = (start, end, command_hash)
+        if key in by_key:
+            by_key[key].outputs.append(output)
+        else:
+            edge = Edge(output, start, end, command_hash)
+            by_key[key] = edge
+            current.append(edge)
+
+    if current:
+        builds.append(current)
+    return builds
+
+
+def read_new_builds(build_dir: Path, state_dir: Path) -> Tuple[List[List[Edge]], bool]:
+    """
+    Return builds appended to .ninja_log since the previous call.
+
+    Returns (builds, reset) where reset means ninja recompacted the log and
+    the whole file had to be re-read.
+    """
+    log_path = build_dir / NINJA_LOG
+    state_path = state_dir / "log-state.json"
+    state = load_json(state_path, {}) or {}
+    st = log_path.stat()
+
+    offset = state.get("offset", 0)
+    reset = state.get("inode") != st.st_ino or st.st_size < offset
+    if reset:
+        offset = 0
+
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    # Only consume complete lines; a build may still be writing the last one
+    complete = data.rfind(b"\n") + 1
+    text = data[:complete].decode("utf-8", errors="replace")
+    save_json(state_path, {"offset": offset + complete, "inode": st.st_ino})
+
+    return split_builds(text.splitlines()), reset
+
+
+# ============================================================================
+# Analysis
+# ============================================================================
+
+
+def dependency_graph(build_dir: Path) -> Optional[Dict[str, List[str]]]:
+    """Return {output: [inputs]} from 'ninja -t graph', or None if unavailable."""
+    ninja = require_tool("ninja")
+    if not ninja:
+        return None
+    result = subprocess.run([ninja, "-C", str(build_dir), "-t", "graph"], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+
+    labels: Dict[str, str] = {}
+    edge_nodes = set()
+    arcs: List[Tuple[str, str]] = []
+    for line in result.stdout.splitlines():
+        node = re.match(r'"(\w+)" \[label="([^"]*)"(, shape=ellipse)?', line)
+        if node:
+            if node.group(3):
+                edge_nodes.add(node.group(1))
+            else:
+                labels[node.group(1)] = node.group(2)
+            continue
+        arc = re.match(r'"(\w+)" -> "(\w+)"', line)
+        if arc:
+            arcs.append((arc.group(1), arc.group(2)))
+
+    edge_inputs: Dict[str, List[str]] = {}
+    for src, dst in arcs:
+        if dst in edge_nodes:
+            edge_inputs.setdefault(dst, []).append(src)
+
+    deps: Dict[str, List[str]] = {}
+    for src, dst in arcs:
+        if dst in edge_nodes:
+            continue
+        inputs = edge_inputs.get(src, []) if src in edge_nodes else [src]
+        deps.setdefault(labels.get(dst, dst), []).extend(labels.get(i, i) for i in inputs)
+    return deps
+
+
+def critical_path(edges: List[Edge], deps: Optional[Dict[str, List[str]]]) -> Tuple[int, List[Edge]]:
+    """
+    Return the longest dependency chain (ms) through the edges of one build.
+
+    Uses the real dependency graph when available; otherwise falls back to
+    the longest chain of edges that each started after the previous ended.
+    """
+    producer = {out: e for e in edges for out in e.outputs}
+
+    if deps is not None:
+        memo: Dict[str, Tuple[int, Optional[Edge], Optional[str]]] = {}
+
+        def cost(path: str, depth: int = 0) -> int:
+            if path in memo:
+                return memo[path][0]
+            memo[path] = (0, None, None)  # guards against cycles
+            if depth > 500:
+                return 0
+            best, best_dep = 0, None
+            for dep in deps.get(path, ()):
+                c = cost(dep, depth + 1)
+                if c > best:
+                    best, best_dep = c, dep
+            edge = producer.get(path)
+            memo[path] = ((edge.duration if edge else 0) + best, edge, best_dep)
+            return memo[path][0]
+
+        end = max((out for e in edges for out in e.outputs), key=cost, default=None)
+        chain: List[Edge] = []
+        node = end
+        while node is not None:
+            _, edge, node = memo.get(node, (0, None, None))
+            if edge and (not chain or chain[-1] is not edge):
+                chain.append(edge)
+        return (memo[end][0] if end else 0), chain
+
+    ordered = sorted(edges, key=lambda e: e.end)
+    best: Dict[int, Tuple[int, Optional[int]]] = {}
+    for i, edge in enumerate(ordered):
+        prev = max(
+            ((best[j][0], j) for j in range(i) if ordered[j].end <= edge.start),
+            default=(0, None),
+        )
+        best[i] = (prev[0] + edge.duration, prev[1])
+    if not best:
+        return 0, []
+    i = max(best, key=lambda k: best[k][0])
+    length = best[i][0]
+    chain = []
+    while i is not None:
+        chain.append(ordered[i])
+        i = best[i][1]
+    return length, chain
+
+
+def target_of(output: str) -> str:
+    """Return the CMake target an output belongs to (CMakeFiles/<target>.dir/...)."""
+    match = re.search(r"CMakeFiles/([^/]+)\.dir/", output)
+    return match.group(1) if match else output
+
+
+def summarize_build(edges: List[Edge], deps: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+    """Summarize one build: wall/CPU time, parallelism, phase split and per-target time."""
+    wall = max(e.end for e in edges) - min(e.start for e in edges)
+    cpu = sum(e.duration for e in edges)
+    cp_length, cp_chain = critical_path(edges, deps)
+
+    kinds: Dict[str, int] = {}
+    targets: Dict[str, int] = {}
+    for edge in edges:
+        kinds[edge.kind] = kinds.get(edge.kind, 0) + edge.duration
+        if edge.kind == "compile":
+            name = target_of(edge.outputs[0])
+            targets[name] = targets.get(name, 0) + edge.duration
+
+    return {
+        "edges": len(edges),
+        "wall_ms": wall,
+        "cpu_ms": cpu,
+        "compile_ms": kinds.get("compile", 0),
+        "link_ms": kinds.get("link", 0),
+        "other_ms": kinds.get("other", 0),
+        "achieved_parallelism": round(cpu / wall, 2) if wall else 0,
+        "possible_parallelism": round(cpu / cp_length, 2) if cp_length else 0,
+        "critical_path_ms": cp_length,
+        "critical_path": [{"output": e.outputs[0], "ms": e.duration} for e in reversed(cp_chain)],
+        "targets": dict(sorted(targets.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def wall_ms_by_kind(edges: List[Edge]) -> Dict[str, int]:
+    """Return, per edge kind, the wall time during which at least one such edge ran."""
+    result: Dict[str, int] = {}
+    for kind in ("compile", "link", "other"):
+        spans = sorted((e.start, e.end) for e in edges if e.kind == kind)
+        total = 0
+        current_start = current_end = None
+        for start, end in spans:
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        result[kind] = total
+    return result
+
+
+# ============================================================================
+# History
+# ============================================================================
+
+
+def record_build(
+    root: Path,
+    state_dir: Path,
+    edges: List[Edge],
+    summary: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Append a build to the history and return outputs that regressed."""
+    samples_path = state_dir / "outputs.json"
+    samples: Dict[str, List[int]] = load_json(samples_path, {}) or {}
+
+    regressions = []
+    for edge in edges:
+        output = edge.outputs[0]
+        past = samples.get(output, [])
+        if len(past) >= 3:
+            median = statistics.median(past)
+            if edge.duration > median * REGRESSION_RATIO and edge.duration - median > REGRESSION_MIN_MS:
+                regressions.append({"output": output, "ms": edge.duration, "median_ms": median})
+        samples[output] = (past + [edge.duration])[-HISTORY_SAMPLES:]
+
+    save_json(samples_path, samples)
+
+    entry = {
+        "time": int(time.time()),
+        "commit": current_commit(root),
+        **{k: v for k, v in summary.items() if k != "critical_path"},
+    }
+    with open(state_dir / "history.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    return sorted(regressions, key=lambda r: -(r["ms"] - r["median_ms"]))
+
+
+def ninja_state_dir(root: Path, build_dir: Path) -> Path:
+    """Return the per-build-directory state directory for log analysis."""
+    try:
+        slug = build_dir.resolve().relative_to(root).as_posix()
+    except ValueError:
+        slug = build_dir.resolve().as_posix()
+    state_dir = project_state_dir(root) / "ninja" / re.sub(r"[^\w.-]+", "_", slug)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+
+def resolve_build_dir(root: Path, target: Optional[str]) -> Path:
+    """Resolve a build directory from a path or configure preset name.
+
+    Without a target, use the build directory compile_commands.json is linked
+    to (the last configured preset), falling back to the ninja-debug preset.
+    """
+    if target:
+        path = Path(target)
+        if (root / path).is_dir() or path.is_dir():
+            return (root / path).resolve()
+        if target in configure_presets(root):
+            return preset_binary_dir(root, target)
+        raise ValueError(f"Not a build directory or configure preset: {target}")
+    return active_build_dir(root) or preset_binary_dir(root, DEFAULT_PRESET)
+
+
+def analyze_new_builds(root: Path, build_dir: Path) -> List[Tuple[Dict[str, Any], List[Edge], List[Dict[str, Any]]]]:
+    """Parse builds appended since the last run, record them, and return their summaries."""
+    state_dir = ninja_state_dir(root, build_dir)
+    builds, reset = read_new_builds(build_dir, state_dir)
+    if reset and len(builds) > 1:
+        # A recompacted or first-seen log: only the most recent build is meaningful
+        builds = builds[-1:]
+
+    deps = dependency_graph(build_dir) if builds else None
+    results = []
+    for edges in builds:
+        summary = summarize_build(edges, deps)
+        regressions = record_build(root, state_dir, edges, summary)
+        results.append((summary, edges, regressions))
+
+    if results:
+        last_summary, last_edges, last_regressions = results[-1]
+        save_json(
+            state_dir / "last-build.json",
+            {
+                "summary": last_summary,
+                "slowest": [
+                    {"output": e.outputs[0], "ms": e.duration}
+                    for e in sorted(last_edges, key=lambda e: -e.duration)[:100]
+                ],
+                "regressions": last_regressions,
+            },
+        )
+    return results
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_build_stats(
+    root: Optional[Path] = None,
+    target: Optional[str] = None,
+    top: int = 10,
+    as_json: bool = False,
+) -> bool:
+    """Analyze .ninja_log: slowest edges, critical path, parallelism and history."""
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    build_dir = resolve_build_dir(root, target)
+
+    if not (build_dir / NINJA_LOG).exists():
+        print_error(f"No {NINJA_LOG} in {build_dir}. Build with a Ninja preset first.")
+        return False
+
+    analyze_new_builds(root, build_dir)
+    last = load_json(ninja_state_dir(root, build_dir) / "last-build.json")
+    if not last:
+        print_error("No completed build found in the log.")
+        return False
+
+    if as_json:
+        print(json.dumps(last, indent=2))
+        return True
+
+    summary = last["summary"]
+    print_banner(
+        "Build Statistics",
+        f"Ninja log analysis for {build_dir}",
+        "",
+    )
+
+    def _secs(ms: float) -> str:
+        return f"{ms / 1000:.2f} s"
+
+    cpu = summary["cpu_ms"] or 1
+    wall = summary["wall_ms"]
+    cp = summary["critical_path_ms"]
+    print_box(
+        [
+            f"Edges:             {cyan(str(summary['edges']))}",
+            f"Wall time:         {cyan(_secs(wall))}",
+            f"CPU time:          {cyan(_secs(summary['cpu_ms']))}",
+            f"Critical path:     {cyan(_secs(cp))}",
+            f"Parallelism:       {cyan(str(summary['achieved_parallelism']))} achieved / "
+            f"{cyan(str(summary['possible_parallelism']))} possible",
+            f"Compile:           {cyan(_secs(summary['compile_ms']))} ({100 * summary['compile_ms'] / cpu:.0f}%)",
+            f"Link:              {cyan(_secs(summary['link_ms']))} ({100 * summary['link_ms'] / cpu:.0f}%)",
+        ],
+        title="Summary",
+    )
+    print()
+
+    print_box(
+        [f"{e['ms']:>8} ms  {e['output']}" for e in last["slowest"][:top]],
+        title="Slowest Edges",
+    )
+    print()
+    print_box(
+        [f"{e['ms']:>8} ms  {e['output']}" for e in summary["critical_path"][-top:]],
+        title="Critical Path (last steps)",
+    )
+    print()
+    print_box(
+        [f"{ms:>8} ms  {name}" for name, ms in list(summary["targets"].items())[:top]],
+        title="Compile Time by Target",
+    )
+    print()
+
+    if last["regressions"]:
+        print_warning(f"{len(last['regressions'])} output(s) compiled much slower than their recent median:")
+        for r in last["regressions"][:top]:
+            print(f"    {yellow(str(r['ms']) + ' ms')} vs {r['median_ms']:.0f} ms median  {r['output']}")
+    else:
+        print_info("No per-output compile-time regressions against history.")
+
+    print(dim(f"  History: {ninja_state_dir(root, build_dir) / 'history.jsonl'}"))
+    return True
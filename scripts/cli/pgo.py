@@ -0,0 +1,381 @@
+"""
+PGO command - profile-guided optimization trained on the benchmark suite.
+
+    cqs pgo [preset] [--repetitions N] [--filter REGEX] [--retrain]
+
+Builds the benchmarks and examples of a preset (default ninja-release) with
+instrumentation (GCC -fprofile-generate, Clang -fprofile-instr-generate),
+runs them as the training workload, merges Clang's raw profiles with
+llvm-profdata, and rebuilds with the profile applied. Plain Release and PGO
+benchmarks then run interleaved and the speedup of every benchmark is
+reported.
+
+Profiles are cached in .cqs/pgo/<hash>/, keyed on the sources, build files,
+preset and compiler, so an unchanged tree skips instrumentation and training.
+"""
+
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    dim,
+)
+from .bench import (
+    BENCH_TARGET,
+    BENCH_CACHE_VARIABLES,
+    DEFAULT_ALPHA,
+    DEFAULT_NOISE,
+    DEFAULT_REPETITIONS,
+    build_benchmarks,
+    compiler_id,
+    compare_runs,
+    comparison_rows,
+    interleaved_runs,
+    report_noisy,
+)
+from .presets import configure_presets, resolve_cache_variables
+from .runner import variant_binary_dir, configure_and_build, find_executable, require_tool
+from .state import project_state_dir, save_json, load_json, hash_bytes, hash_file
+
+
+PGO_DIR = "pgo"
+
+# Profiles kept in .cqs/pgo; older ones are removed
+MAX_PROFILES = 5
+
+# Inputs a profile depends on; any change retrains
+SOURCE_DIRS = ("src", "include", "benchmarks", "examples", "cmake")
+SOURCE_FILES = ("CMakeLists.txt", "CMakePresets.json")
+
+# Training builds the examples as well, so their code paths are profiled too
+TRAINING_CACHE_VARIABLES = {**BENCH_CACHE_VARIABLES, "CPP_QUICK_STARTER_BUILD_EXAMPLES": "ON"}
+
+PROFRAW_PATTERN = "cqs-%p-%m.profraw"
+MERGED_PROFILE = "merged.profdata"
+GCDA_DIR = "gcda"
+META_FILE = "profile.json"
+
+# Cache variables instrumentation flags are appended to, with the environment
+# variable CMake initializes each from when the preset does not set it
+FLAG_VARIABLES = ("CMAKE_C_FLAGS", "CMAKE_CXX_FLAGS", "CMAKE_EXE_LINKER_FLAGS", "CMAKE_SHARED_LINKER_FLAGS")
+COMPILE_FLAG_VARIABLES = FLAG_VARIABLES[:2]
+FLAG_ENVIRONMENT = {
+    "CMAKE_C_FLAGS": "CFLAGS",
+    "CMAKE_CXX_FLAGS": "CXXFLAGS",
+    "CMAKE_EXE_LINKER_FLAGS": "LDFLAGS",
+    "CMAKE_SHARED_LINKER_FLAGS": "LDFLAGS",
+}
+
+
+# ============================================================================
+# Toolchain
+# ============================================================================
+
+
+def toolchain(compiler: str) -> Optional[str]:
+    """Map a compiler id ('GNU 13.2.0', 'Clang 17.0.6', ...) to 'gcc' or 'clang'."""
+    name = compiler.split()[0] if compiler else ""
+    if name == "GNU":
+        return "gcc"
+    if name in ("Clang", "AppleClang"):
+        return "clang"
+    return None
+
+
+def find_profdata(compiler: str) -> Optional[List[str]]:
+    """Return the llvm-profdata command matching a Clang compiler id."""
+    version = compiler.split()[1] if len(compiler.split()) > 1 else ""
+    major = version.split(".")[0]
+    found = require_tool(f"llvm-profdata-{major}", "llvm-profdata") if major else require_tool("llvm-profdata")
+    if found:
+        return [found]
+    if compiler.startswith("AppleClang") and shutil.which("xcrun"):
+        return ["xcrun", "llvm-profdata"]
+    return None
+
+
+def instrument_flags(kind: str) -> str:
+    """Return the compile/link flags of an instrumented build."""
+    return "-fprofile-generate" if kind == "gcc" else "-fprofile-instr-generate"
+
+
+def optimize_flags(kind: str, profile: Path) -> str:
+    """Return the compile/link flags applying a profile."""
+    if kind == "gcc":
+        # .gcda files sit next to the objects; untrained code is optimized as usual
+        return "-fprofile-use -fprofile-partial-training -fprofile-correction -Wno-missing-profile"
+    return f"-fprofile-instr-use={profile.as_posix()} -Wno-profile-instr-unprofiled -Wno-profile-instr-out-of-date"
+
+
+def flag_variables(root: Path, preset: str, flags: str, names: Tuple[str, ...] = FLAG_VARIABLES) -> Dict[str, str]:
+    """
+    Return cache variables appending flags to the preset's own compile and
+    link flags (or just names), falling back to CFLAGS/CXXFLAGS/LDFLAGS.
+    """
+    preset_vars = resolve_cache_variables(configure_presets(root), preset)
+    result = {}
+    for name in names:
+        base = preset_vars.get(name, os.environ.get(FLAG_ENVIRONMENT[name], ""))
+        result[name] = f"{base} {flags}".strip()
+    return result
+
+
+# ============================================================================
+# Profile Cache
+# ============================================================================
+
+
+def source_hash(root: Path, preset: str, compiler: str) -> str:
+    """Hash everything a profile depends on: sources, build files, preset and compiler."""
+    parts = [preset, compiler]
+    paths = [root / name for name in SOURCE_FILES if (root / name).is_file()]
+    for name in SOURCE_DIRS:
+        if (root / name).is_dir():
+            paths += [p for p in (root / name).rglob("*") if p.is_file()]
+    for path in sorted(paths):
+        parts.append(f"{path.relative_to(root).as_posix()}:{hash_file(path)}")
+    return hash_bytes("\n".join(parts).encode())[:16]
+
+
+def prune_profiles(pgo_dir: Path, keep: Path) -> None:
+    """Remove all but the newest MAX_PROFILES cached profiles."""
+    entries = sorted(
+        (p for p in pgo_dir.iterdir() if p.is_dir() and (p / META_FILE).exists()),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in entries[MAX_PROFILES:]:
+        if entry != keep:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def save_gcda(binary_dir: Path, cache: Path) -> int:
+    """Copy the .gcda files of a training run into the cache, keeping relative paths."""
+    count = 0
+    for path in binary_dir.rglob("*.gcda"):
+        target = cache / GCDA_DIR / path.relative_to(binary_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+        count += 1
+    return count
+
+
+def restore_gcda(cache: Path, binary_dir: Path) -> None:
+    """Put cached .gcda files back next to the objects GCC reads them for."""
+    for path in binary_dir.rglob("*.gcda"):
+        path.unlink()
+    source = cache / GCDA_DIR
+    for path in source.rglob("*.gcda"):
+        target = binary_dir / path.relative_to(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+
+
+# ============================================================================
+# Training
+# ============================================================================
+
+
+def training_executables(root: Path, binary_dir: Path) -> List[Path]:
+    """Return the benchmark and example executables of an instrumented build."""
+    names = [BENCH_TARGET] + sorted(p.stem for p in (root / "examples").glob("*.cpp"))
+    found = [find_executable(binary_dir, name) for name in names]
+    return [path for path in found if path is not None]
+
+
+def train(executables: List[Path], env: Dict[str, str]) -> Tuple[int, float]:
+    """Run the training workload; returns (failed runs, seconds)."""
+    failed = 0
+    start = time.perf_counter()
+    for executable in executables:
+        result = subprocess.run([str(executable)], cwd=str(executable.parent), env=env, capture_output=True)
+        failed += result.returncode != 0
+    return failed, time.perf_counter() - start
+
+
+def build_profile(
+    root: Path,
+    preset: str,
+    binary_dir: Path,
+    kind: str,
+    compiler: str,
+    cache: Path,
+) -> bool:
+    """Build instrumented, train and store the profile in cache."""
+    print_info(f"Building instrumented ({cyan(instrument_flags(kind))})...")
+    cache_vars = {**TRAINING_CACHE_VARIABLES, **flag_variables(root, preset, instrument_flags(kind))}
+    if not configure_and_build(root, preset, binary_dir, cache_vars):
+        print_error("Instrumented build failed.")
+        return False
+    print()
+
+    executables = training_executables(root, binary_dir)
+    if not executables:
+        print_error("No benchmark or example executables to train with.")
+        return False
+    raw_dir = cache / "raw"
+    shutil.rmtree(raw_dir, ignore_errors=True)
+    raw_dir.mkdir(parents=True)
+    for path in binary_dir.rglob("*.gcda"):
+        path.unlink()
+    env = dict(os.environ)
+    env["LLVM_PROFILE_FILE"] = str(raw_dir / PROFRAW_PATTERN)
+
+    with Spinner(f"Training on {', '.join(p.name for p in executables)}...") as spinner:
+        failed, seconds = train(executables, env)
+        if failed:
+            spinner.fail(f"{failed} training run(s) failed")
+            return False
+        spinner.succeed(f"Trained in {seconds:.1f} s")
+
+    if kind == "gcc":
+        count = save_gcda(binary_dir, cache)
+        shutil.rmtree(raw_dir, ignore_errors=True)
+        if not count:
+            print_error("Training produced no .gcda files.")
+            return False
+    else:
+        profdata = find_profdata(compiler)
+        raw = sorted(raw_dir.glob("*.profraw"))
+        if not profdata:
+            print_error("llvm-profdata not found; it is needed to merge Clang profiles.")
+            return False
+        if not raw:
+            print_error("Training produced no .profraw files.")
+            return False
+        result = subprocess.run(
+            profdata + ["merge", "-o", str(cache / MERGED_PROFILE)] + [str(p) for p in raw],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print_error(f"llvm-profdata merge failed: {result.stderr.strip()}")
+            return False
+        shutil.rmtree(raw_dir, ignore_errors=True)
+        count = len(raw)
+
+    save_json(
+        cache / META_FILE,
+        {"time": int(time.time()), "preset": preset, "compiler": compiler, "files": count, "seconds": round(seconds, 2)},
+        indent=2,
+    )
+    return True
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_pgo(
+    root: Optional[Path] = None,
+    preset: str = "ninja-release",
+    repetitions: int = DEFAULT_REPETITIONS,
+    benchmark_filter: Optional[str] = None,
+    retrain: bool = False,
+) -> bool:
+    """Build with profile-guided optimization and report the speedup over Release."""
+    print_banner(
+        "PGO",
+        f"Profile-guided optimization of {preset}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    # The plain build doubles as the baseline and tells us which compiler is used
+    baseline_dir = variant_binary_dir(root, preset, "bench")
+    baseline = build_benchmarks(root, preset, baseline_dir)
+    if baseline is None:
+        print_error("Release benchmark build failed.")
+        return False
+    print()
+    compiler = compiler_id(baseline_dir)
+    kind = toolchain(compiler)
+    if kind is None:
+        print_error(f"PGO is supported with GCC and Clang, not {compiler}.")
+        return False
+
+    pgo_dir = project_state_dir(root) / PGO_DIR
+    digest = source_hash(root, preset, compiler)
+    cache = pgo_dir / digest
+    binary_dir = variant_binary_dir(root, preset, "pgo")
+    cached = not retrain and load_json(cache / META_FILE) is not None
+    if cached:
+        print_info(f"Reusing cached profile {cyan(digest)} (sources unchanged)")
+    else:
+        shutil.rmtree(cache, ignore_errors=True)
+        cache.mkdir(parents=True)
+        if not build_profile(root, preset, binary_dir, kind, compiler, cache):
+            shutil.rmtree(cache, ignore_errors=True)
+            return False
+        print()
+    if kind == "gcc":
+        restore_gcda(cache, binary_dir)
+    cache.touch()
+    prune_profiles(pgo_dir, cache)
+
+    print_info(f"Building with profile ({cyan('-fprofile-use' if kind == 'gcc' else '-fprofile-instr-use')})...")
+    cache_vars = {**BENCH_CACHE_VARIABLES, **flag_variables(root, preset, optimize_flags(kind, cache / MERGED_PROFILE))}
+    if not configure_and_build(root, preset, binary_dir, cache_vars, [BENCH_TARGET]):
+        print_error("PGO build failed.")
+        return False
+    optimized = find_executable(binary_dir, BENCH_TARGET)
+    if optimized is None:
+        print_error("PGO benchmark executable not found.")
+        return False
+    print()
+
+    print_info(f"Running Release and PGO interleaved, {cyan(str(repetitions))} rounds...")
+    results = interleaved_runs([baseline, optimized], ["Release", "PGO"], repetitions, benchmark_filter)
+    print()
+    samples = [{name: [s["real_ns"] for s in runs] for name, runs in side.items()} for side in results]
+    # Any significant change is reported; there is no minimum effect size here
+    rows = compare_runs(samples[0], samples[1], 0.0, DEFAULT_ALPHA, DEFAULT_NOISE)
+    if not rows:
+        print_error("No benchmark results.")
+        return False
+    print_box(comparison_rows(rows, ("Release", "PGO")), title=f"PGO vs Release ({compiler})")
+    print()
+    report_noisy(rows, DEFAULT_NOISE)
+
+    speedups = [r["baseline"] / r["current"] for r in rows if r["current"] > 0]
+    geomean = math.exp(statistics.mean(math.log(s) for s in speedups))
+    meta = load_json(cache / META_FILE, {}) or {}
+    print_box(
+        [
+            f"Compiler:      {cyan(compiler)}",
+            f"Profile:       {cyan(digest)} " + dim("(cached)" if cached else f"(trained in {meta.get('seconds', 0):.1f} s)"),
+            f"PGO build:     {dim(str(binary_dir.relative_to(root)))}",
+            f"Speedup:       {(green if geomean > 1 else cyan)(f'{geomean:.3f}x')} " + dim("geometric mean"),
+        ],
+        title="PGO",
+    )
+    print()
+
+    slower = [r["name"] for r in rows if r["verdict"] == "regression"]
+    if slower:
+        print_warning(f"Slower with PGO: {', '.join(slower)}. The training workload may not match these paths.")
+    print_success(f"PGO build ready in {binary_dir.relative_to(root)}")
+    return True
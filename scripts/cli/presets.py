@@ -0,0 +1,227 @@
+"""
+CMake preset helpers - read CMakePresets.json and manage CMakeUserPresets.json.
+"""
+
+import json
+import os
+import platform
+import re
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+
+PRESETS_FILE = "CMakePresets.json"
+USER_PRESETS_FILE = "CMakeUserPresets.json"
+
+PRESET_KINDS = ("configurePresets", "buildPresets", "testPresets")
+
+# binaryDir that gives every configure preset its own build tree
+PER_PRESET_BINARY_DIR = "${sourceDir}/build/${presetName}"
+
+_BINARY_DIR_FIELD = re.compile(r'("binaryDir"\s*:\s*)"([^"]*)"')
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_presets(root: Path) -> Dict[str, Any]:
+    """Load project and user presets merged into one document."""
+    merged: Dict[str, Any] = {kind: [] for kind in PRESET_KINDS}
+    for name in (PRESETS_FILE, USER_PRESETS_FILE):
+        data = _read(root / name)
+        merged.setdefault("version", data.get("version"))
+        merged.setdefault("cmakeMinimumRequired", data.get("cmakeMinimumRequired"))
+        for kind in PRESET_KINDS:
+            merged[kind].extend(data.get(kind, []))
+    return merged
+
+
+def configure_presets(root: Path) -> Dict[str, Dict[str, Any]]:
+    """Return configure presets keyed by name."""
+    return {p["name"]: p for p in load_presets(root)["configurePresets"]}
+
+
+def _inherits(preset: Dict[str, Any]) -> List[str]:
+    parents = preset.get("inherits", [])
+    return [parents] if isinstance(parents, str) else list(parents)
+
+
+def resolve_field(presets: Dict[str, Dict[str, Any]], name: str, field: str) -> Any:
+    """Resolve a preset field, following 'inherits' in declaration order."""
+    preset = presets.get(name)
+    if preset is None:
+        return None
+    if field in preset:
+        return preset[field]
+    for parent in _inherits(preset):
+        value = resolve_field(presets, parent, field)
+        if value is not None:
+            return value
+    return None
+
+
+def resolve_cache_variables(presets: Dict[str, Dict[str, Any]], name: str) -> Dict[str, str]:
+    """Resolve the effective cacheVariables of a configure preset."""
+    preset = presets.get(name)
+    if preset is None:
+        return {}
+    result: Dict[str, str] = {}
+    # Earlier parents take precedence, so apply them last-to-first
+    for parent in reversed(_inherits(preset)):
+        result.update(resolve_cache_variables(presets, parent))
+    for key, value in preset.get("cacheVariables", {}).items():
+        result[key] = value["value"] if isinstance(value, dict) else value
+    return result
+
+
+def inherits_from(presets: Dict[str, Dict[str, Any]], name: str, ancestor: str) -> bool:
+    """Check whether a preset (transitively) inherits from ancestor."""
+    preset = presets.get(name)
+    if preset is None:
+        return False
+    return any(p == ancestor or inherits_from(presets, p, ancestor) for p in _inherits(preset))
+
+
+def expand_macros(value: str, root: Path, preset_name: str) -> str:
+    """Expand the preset macros cqs understands (${sourceDir}, ${presetName}, ...)."""
+    return (
+        value.replace("${sourceDir}", root.as_posix())
+        .replace("${sourceDirName}", root.name)
+        .replace("${presetName}", preset_name)
+    )
+
+
+_HOST_SYSTEM_NAMES = {"linux": "Linux", "darwin": "Darwin", "win32": "Windows"}
+
+
+def _expand_condition_value(value: str) -> str:
+    host = _HOST_SYSTEM_NAMES.get(sys.platform, platform.system())
+    value = value.replace("${hostSystemName}", host)
+    return re.sub(r"\$env\{(\w+)\}", lambda m: os.environ.get(m.group(1), ""), value)
+
+
+def condition_matches(presets: Dict[str, Dict[str, Any]], name: str) -> bool:
+    """
+    Evaluate a preset's (inherited) condition on this host.
+
+    Supports equals/notEquals/inList/notInList/const; other condition
+    types are assumed to match.
+    """
+    condition = resolve_field(presets, name, "condition")
+    if not isinstance(condition, dict):
+        return condition is not False
+    kind = condition.get("type")
+    if kind == "const":
+        return bool(condition.get("value"))
+    if kind in ("equals", "notEquals"):
+        equal = _expand_condition_value(condition.get("lhs", "")) == _expand_condition_value(condition.get("rhs", ""))
+        return equal if kind == "equals" else not equal
+    if kind in ("inList", "notInList"):
+        found = _expand_condition_value(condition.get("string", "")) in [
+            _expand_condition_value(v) for v in condition.get("list", [])
+        ]
+        return found if kind == "inList" else not found
+    return True
+
+
+def binary_dir(root: Path, preset_name: str) -> Path:
+    """Return the build directory a configure preset uses."""
+    presets = configure_presets(root)
+    value = resolve_field(presets, preset_name, "binaryDir")
+    if not value:
+        return root / "build"
+    path = Path(expand_macros(value, root, preset_name))
+    return path if path.is_absolute() else root / path
+
+
+def visible_configure_presets(root: Path) -> List[str]:
+    """Return names of non-hidden configure presets."""
+    return [p["name"] for p in load_presets(root)["configurePresets"] if not p.get("hidden")]
+
+
+# ============================================================================
+# Binary Directory Layout
+# ============================================================================
+
+
+def shared_binary_dirs(root: Path) -> Dict[Path, List[str]]:
+    """Return build directories used by more than one visible configure preset."""
+    users: Dict[Path, List[str]] = {}
+    for name in visible_configure_presets(root):
+        users.setdefault(binary_dir(root, name), []).append(name)
+    return {path: names for path, names in users.items() if len(names) > 1}
+
+
+def use_per_preset_binary_dirs(root: Path) -> List[str]:
+    """
+    Rewrite each binaryDir in CMakePresets.json that several visible presets
+    share to PER_PRESET_BINARY_DIR.
+
+    The file is edited textually so its formatting is kept. Returns the names
+    of the presets whose binaryDir changed.
+    """
+    path = root / PRESETS_FILE
+    text = path.read_text(encoding="utf-8")
+    shared = shared_binary_dirs(root)
+    changed: List[str] = []
+
+    def _replace(match: "re.Match[str]") -> str:
+        value = Path(expand_macros(match.group(2), root, ""))
+        if "${presetName}" in match.group(2) or (value if value.is_absolute() else root / value) not in shared:
+            return match.group(0)
+        # The preset owning this field is the nearest "name" before it
+        names = re.findall(r'"name"\s*:\s*"([^"]*)"', text[: match.start()])
+        if names:
+            changed.append(names[-1])
+        return f'{match.group(1)}"{PER_PRESET_BINARY_DIR}"'
+
+    updated = _BINARY_DIR_FIELD.sub(_replace, text)
+    if updated != text:
+        path.write_text(updated, encoding="utf-8")
+    return changed
+
+
+# ============================================================================
+# User Presets
+# ============================================================================
+
+
+def update_user_presets(
+    root: Path,
+    configure: Optional[List[Dict[str, Any]]] = None,
+    build: Optional[List[Dict[str, Any]]] = None,
+    test: Optional[List[Dict[str, Any]]] = None,
+) -> Path:
+    """
+    Insert or replace presets in CMakeUserPresets.json by name.
+
+    Presets not mentioned are left untouched, so several cqs commands can
+    own different entries of the same file.
+    """
+    path = root / USER_PRESETS_FILE
+    data = _read(path)
+    if "version" not in data:
+        data["version"] = _read(root / PRESETS_FILE).get("version", 6)
+
+    for kind, entries in zip(PRESET_KINDS, (configure, build, test)):
+        if not entries:
+            continue
+        existing = data.setdefault(kind, [])
+        names = {e["name"] for e in entries}
+        existing[:] = [p for p in existing if p.get("name") not in names] + list(entries)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+    return path
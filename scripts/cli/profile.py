@@ -0,0 +1,348 @@
+"""
+Profile command - one-command CPU profiling with flamegraphs.
+
+    cqs profile <target> [--preset P] [--tool perf|callgrind] [--frequency HZ]
+                [--top N] [--no-build] [-- args...]
+
+Builds the target in a RelWithDebInfo variant with frame pointers, records
+it with perf (or valgrind's callgrind when perf is unavailable), and writes
+folded stacks, a self-contained flamegraph SVG and a hot-function table to
+.cqs/profile/<target>-<time>/.
+"""
+
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+from .ui import (
+    Spinner,
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    cyan,
+    dim,
+)
+from .flamegraph import write_folded, render_svg, top_functions
+from .pgo import COMPILE_FLAG_VARIABLES, flag_variables
+from .presets import configure_presets
+from .runner import variant_binary_dir, configure_and_build, find_executable, require_tool
+from .state import project_state_dir
+
+
+PROFILE_PRESET = "ninja-relwithdebinfo"
+PROFILE_DIR = "profile"
+
+DEFAULT_FREQUENCY = 999
+
+FRAME_POINTER_FLAGS = "-fno-omit-frame-pointer"
+
+# Reconstructed callgrind stacks: paths carrying less than this fraction of the
+# total cost are dropped, which keeps diamond-shaped call graphs from exploding
+CALLGRIND_MIN_SHARE = 1e-4
+CALLGRIND_MAX_DEPTH = 32
+
+# Project options each known target needs; everything else stays off for a fast build
+TARGET_OPTIONS = {
+    "benchmarks": "CPP_QUICK_STARTER_BUILD_BENCHMARKS",
+    "example_01": "CPP_QUICK_STARTER_BUILD_EXAMPLES",
+    "unit_tests": "CPP_QUICK_STARTER_BUILD_TESTS",
+    "integration_tests": "CPP_QUICK_STARTER_BUILD_TESTS",
+}
+
+_OFFSET = re.compile(r"\+0x[0-9a-fA-F]+$")
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+
+def target_cache_variables(target: str) -> Dict[str, str]:
+    """Return cache variables enabling only what target needs."""
+    cache_vars = {option: "OFF" for option in set(TARGET_OPTIONS.values())}
+    if target in TARGET_OPTIONS:
+        cache_vars[TARGET_OPTIONS[target]] = "ON"
+    return cache_vars
+
+
+def build_target(
+    root: Path,
+    preset: str,
+    variant: str,
+    target: str,
+    cache_vars: Dict[str, str],
+    build: bool = True,
+) -> Optional[Path]:
+    """Build one target in a variant directory of preset and return its executable."""
+    binary_dir = variant_binary_dir(root, preset, variant)
+    if build and not configure_and_build(root, preset, binary_dir, {**target_cache_variables(target), **cache_vars}, [target]):
+        return None
+    return find_executable(binary_dir, target)
+
+
+# ============================================================================
+# perf
+# ============================================================================
+
+
+def record_perf(perf: str, command: List[str], out_dir: Path, frequency: int) -> Tuple[int, Path]:
+    """Record command with frame-pointer call graphs; returns (exit code, perf.data)."""
+    data = out_dir / "perf.data"
+    cmd = [perf, "record", "-F", str(frequency), "--call-graph", "fp", "-o", str(data), "--"] + command
+    return subprocess.run(cmd).returncode, data
+
+
+def fold_perf_script(text: str) -> Dict[Tuple[str, ...], float]:
+    """
+    Fold 'perf script' output into stacks.
+
+    Each sample is a header line ('comm pid ... event:', possibly padded)
+    followed by tab-indented 'address symbol+offset (dso)' frames, leaf
+    first, and a blank line.
+    """
+    stacks: Dict[Tuple[str, ...], float] = {}
+    comm: Optional[str] = None
+    frames: List[str] = []
+
+    def _flush() -> None:
+        if comm is not None and frames:
+            key = (comm,) + tuple(reversed(frames))
+            stacks[key] = stacks.get(key, 0.0) + 1
+
+    for line in text.splitlines():
+        if not line.strip():
+            _flush()
+            comm, frames = None, []
+        elif not line.startswith("\t"):
+            _flush()
+            comm, frames = line.split()[0], []
+        else:
+            parts = line.strip().split(None, 1)
+            if len(parts) < 2:
+                continue
+            symbol = parts[1]
+            if symbol.endswith(")") and " (" in symbol:
+                symbol, _, dso = symbol.rpartition(" (")
+                if symbol == "[unknown]":
+                    symbol = f"[{Path(dso.rstrip(')')).name}]"
+            frames.append(_OFFSET.sub("", symbol))
+    _flush()
+    return stacks
+
+
+def perf_stacks(perf: str, data: Path) -> Dict[Tuple[str, ...], float]:
+    """Return folded stacks of a perf.data file."""
+    result = subprocess.run(
+        [perf, "script", "-i", str(data)],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    if result.returncode != 0:
+        raise ValueError(f"perf script failed: {result.stderr.strip()}")
+    return fold_perf_script(result.stdout)
+
+
+# ============================================================================
+# callgrind
+# ============================================================================
+
+
+def record_callgrind(valgrind: str, command: List[str], out_dir: Path) -> Tuple[int, Path]:
+    """Run command under callgrind; returns (exit code, callgrind.out)."""
+    out = out_dir / "callgrind.out"
+    cmd = [valgrind, "--tool=callgrind", f"--callgrind-out-file={out}"] + command
+    return subprocess.run(cmd).returncode, out
+
+
+def parse_callgrind(text: str) -> Tuple[Dict[str, float], Dict[Tuple[str, str], float]]:
+    """
+    Parse a callgrind profile into (self cost per function, inclusive cost per call edge).
+
+    Only the first event (Ir by default) is used.
+    """
+    names: Dict[str, str] = {}
+    self_cost: Dict[str, float] = {}
+    edges: Dict[Tuple[str, str], float] = {}
+    current = ""
+    callee: Optional[str] = None
+    call_line = False
+    positions = 1
+
+    def _name(value: str) -> str:
+        # Name compression: '(id) name' defines an id, '(id)' refers to it
+        value = value.strip()
+        if value.startswith("("):
+            ident, _, rest = value.partition(")")
+            rest = rest.strip()
+            if rest:
+                names[ident] = rest
+                return rest
+            return names.get(ident, value)
+        return value
+
+    for line in text.splitlines():
+        if not line or line[0] == "#":
+            continue
+        if line.startswith("positions:"):
+            positions = len(line.split()) - 1
+        elif line.startswith("fn="):
+            current = _name(line[3:])
+            self_cost.setdefault(current, 0.0)
+        elif line.startswith("cfn="):
+            callee = _name(line[4:])
+        elif line.startswith("calls="):
+            call_line = True
+        elif line[0].isdigit() or line[0] in "+-*":
+            fields = line.split()
+            cost = float(fields[positions]) if len(fields) > positions else 0.0
+            if call_line and callee is not None:
+                edges[(current, callee)] = edges.get((current, callee), 0.0) + cost
+                call_line = False
+            else:
+                self_cost[current] = self_cost.get(current, 0.0) + cost
+    return self_cost, edges
+
+
+def callgrind_stacks(
+    self_cost: Dict[str, float],
+    edges: Dict[Tuple[str, str], float],
+    max_depth: int = CALLGRIND_MAX_DEPTH,
+    min_share: float = CALLGRIND_MIN_SHARE,
+) -> Dict[Tuple[str, ...], float]:
+    """
+    Approximate folded stacks from callgrind's caller/callee costs.
+
+    Callgrind keeps one level of call context, so each callee's subtree is
+    split between its callers in proportion to the cost of each call edge.
+    Paths worth less than min_share of the total cost are not expanded.
+    """
+    children: Dict[str, List[Tuple[str, float]]] = {}
+    callers: Dict[str, float] = {}
+    for (caller, callee), cost in edges.items():
+        children.setdefault(caller, []).append((callee, cost))
+        callers[callee] = callers.get(callee, 0.0) + cost
+    inclusive = {fn: self_cost.get(fn, 0.0) + sum(c for _, c in children.get(fn, [])) for fn in set(self_cost) | set(callers)}
+
+    stacks: Dict[Tuple[str, ...], float] = {}
+    min_cost = sum(self_cost.values()) * min_share
+    roots = [fn for fn in inclusive if fn not in callers and inclusive[fn] > 0]
+    pending: List[Tuple[Tuple[str, ...], float]] = [((fn,), 1.0) for fn in roots]
+    while pending:
+        path, share = pending.pop()
+        fn = path[-1]
+        if self_cost.get(fn):
+            stacks[path] = stacks.get(path, 0.0) + self_cost[fn] * share
+        if len(path) >= max_depth:
+            continue
+        for callee, cost in children.get(fn, []):
+            if callee in path or not inclusive.get(callee) or share * cost < min_cost:
+                continue
+            # This edge's share of the callee's total cost, scaled by our own share
+            pending.append((path + (callee,), share * cost / inclusive[callee]))
+    return stacks
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_profile(
+    root: Optional[Path] = None,
+    target: str = "cpp_quick_starter_app",
+    args: Optional[List[str]] = None,
+    preset: str = PROFILE_PRESET,
+    tool: Optional[str] = None,
+    frequency: int = DEFAULT_FREQUENCY,
+    top: int = 20,
+    build: bool = True,
+) -> bool:
+    """Profile a target and write folded stacks, a flamegraph and a hot-function table."""
+    print_banner(
+        "Profile",
+        f"CPU profile of {target}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    perf = require_tool("perf") if tool in (None, "perf") else None
+    valgrind = require_tool("valgrind") if tool in (None, "callgrind") and not perf else None
+    if not perf and not valgrind:
+        print_error("Neither perf nor valgrind found." if tool is None else f"{tool} not found.")
+        print_info("Install linux-perf (perf) or valgrind.")
+        return False
+
+    cache_vars = flag_variables(root, preset, FRAME_POINTER_FLAGS, COMPILE_FLAG_VARIABLES)
+    executable = build_target(root, preset, "profile", target, cache_vars, build)
+    if executable is None:
+        print_error(f"Could not build target {target}." if build else f"{target} not built yet; run without --no-build.")
+        return False
+    print()
+
+    out_dir = project_state_dir(root) / PROFILE_DIR / f"{target}-{time.strftime('%Y%m%d-%H%M%S')}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    command = [str(executable)] + (args or [])
+    print(dim(f"$ {' '.join(command)}"))
+
+    start = time.perf_counter()
+    if perf:
+        code, data = record_perf(perf, command, out_dir, frequency)
+    else:
+        code, data = record_callgrind(valgrind or "valgrind", command, out_dir)
+    elapsed = time.perf_counter() - start
+    print()
+    if not data.exists():
+        print_error("No profile was recorded.")
+        return False
+
+    with Spinner("Folding stacks...") as spinner:
+        if perf:
+            stacks = perf_stacks(perf, data)
+            unit = "samples"
+        else:
+            stacks = callgrind_stacks(*parse_callgrind(data.read_text(encoding="utf-8", errors="replace")))
+            unit = "instructions"
+        spinner.succeed(f"{len(stacks)} unique stacks")
+    if not stacks:
+        print_error("The profile contains no samples.")
+        return False
+
+    folded = out_dir / "stacks.folded"
+    svg = out_dir / "flamegraph.svg"
+    write_folded(stacks, folded)
+    svg.write_text(render_svg(stacks, f"{target} ({'perf' if perf else 'callgrind'})", unit), encoding="utf-8")
+
+    print()
+    width = min(70, max([len(name) for name, _, _ in top_functions(stacks, top)] + [8]))
+    rows = [dim(f"{'Self':>7} {'Total':>7}  Function")]
+    for name, self_share, total_share in top_functions(stacks, top):
+        shown = name if len(name) <= width else name[: width - 3] + "..."
+        rows.append(f"{self_share * 100:>6.1f}% {total_share * 100:>6.1f}%  {shown}")
+    print_box(rows, title=f"Top {top} Functions")
+    print()
+
+    print_box(
+        [
+            f"Tool:        {cyan('perf' if perf else 'callgrind')}",
+            f"Run time:    {cyan(f'{elapsed:.2f} s')}" + (dim(f"  (exit code {code})") if code else ""),
+            f"Flamegraph:  {cyan(str(svg.relative_to(root)))}",
+            f"Folded:      {cyan(str(folded.relative_to(root)))}",
+            f"Raw data:    {dim(str(data.relative_to(root)))}",
+        ],
+        title="Profile",
+    )
+    print()
+    print_success("Open the flamegraph in a browser; hover a frame for its cost.")
+    return True
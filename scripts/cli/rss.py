@@ -0,0 +1,61 @@
+"""
+Peak-RSS recorder for compile and link commands.
+
+Installed by `cqs jobs --record` as RULE_LAUNCH_COMPILE / RULE_LAUNCH_LINK:
+
+    python rss.py <compile|link> <log dir> <command...>
+
+Runs the command, then appends {"kind", "peak", "seconds", "output"} to
+<log dir>/<kind>.jsonl. Kept dependency-free (it runs once per build edge).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import List
+
+
+def _output(cmd: List[str]) -> str:
+    for i, arg in enumerate(cmd):
+        if arg == "-o" and i + 1 < len(cmd):
+            return cmd[i + 1]
+        if arg.startswith(("/Fo", "/out:")):
+            return arg.split(":", 1)[-1] if arg.startswith("/out:") else arg[3:]
+    return ""
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 4:
+        print("usage: rss.py <compile|link> <log dir> <command...>", file=sys.stderr)
+        return 2
+
+    kind, log_dir, cmd = argv[1], argv[2], argv[3:]
+    start = time.time()
+    try:
+        process = subprocess.Popen(cmd)
+    except OSError as e:
+        print(f"rss.py: {e}", file=sys.stderr)
+        return 127
+
+    if not hasattr(os, "wait4"):
+        # No rusage on Windows; run transparently without recording
+        return process.wait()
+
+    # ru_maxrss covers the child and its waited-for descendants (cc1plus, ld, ...)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = code = os.waitstatus_to_exitcode(status)
+    peak = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+    record = {"kind": kind, "peak": peak, "seconds": round(time.time() - start, 3), "output": _output(cmd)}
+    try:
+        with open(os.path.join(log_dir, f"{kind}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,125 @@
+"""
+Build runner helpers - configure/build presets and stream subprocess output.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Callable
+
+from .ui import dim
+
+
+# Build directories for instrumented variants (time-trace, coverage, PGO, ...)
+VARIANT_DIR = Path("build") / "cqs"
+
+
+def variant_binary_dir(root: Path, preset: str, variant: str) -> Path:
+    """Return a dedicated build directory for an instrumented variant of a preset."""
+    return root / VARIANT_DIR / f"{preset}-{variant}"
+
+
+def run_streamed(
+    cmd: List[str],
+    cwd: Optional[Path] = None,
+    env: Optional[Dict[str, str]] = None,
+    echo: bool = True,
+    prefix: str = "",
+    on_line: Optional[Callable[[str], None]] = None,
+) -> Tuple[int, List[str]]:
+    """
+    Run a command, echoing its output live while also capturing it.
+
+    Returns (exit code, output lines).
+    """
+    lines: List[str] = []
+    process = subprocess.Popen(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        bufsize=1,
+    )
+    assert process.stdout is not None
+    for line in process.stdout:
+        line = line.rstrip("\n")
+        lines.append(line)
+        if on_line:
+            on_line(line)
+        if echo:
+            sys.stdout.write(f"{prefix}{line}\n")
+            sys.stdout.flush()
+    return process.wait(), lines
+
+
+def configure_command(
+    preset: str,
+    binary_dir: Optional[Path] = None,
+    cache_vars: Optional[Dict[str, str]] = None,
+) -> List[str]:
+    """Return the 'cmake --preset' command line, optionally redirected to another build dir."""
+    cmd = ["cmake", "--preset", preset]
+    if binary_dir is not None:
+        cmd += ["-B", str(binary_dir)]
+    for key, value in (cache_vars or {}).items():
+        cmd.append(f"-D{key}={value}")
+    return cmd
+
+
+def build_command(
+    binary_dir: Path,
+    targets: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+) -> List[str]:
+    """Return a 'cmake --build' command line for a build directory."""
+    cmd = ["cmake", "--build", str(binary_dir)]
+    if targets:
+        cmd += ["--target", *targets]
+    if jobs:
+        cmd += ["-j", str(jobs)]
+    return cmd
+
+
+def configure_and_build(
+    root: Path,
+    preset: str,
+    binary_dir: Path,
+    cache_vars: Optional[Dict[str, str]] = None,
+    targets: Optional[List[str]] = None,
+    env: Optional[Dict[str, str]] = None,
+    echo: bool = True,
+) -> bool:
+    """Configure a preset into binary_dir and build it."""
+    for cmd in (
+        configure_command(preset, binary_dir, cache_vars),
+        build_command(binary_dir, targets),
+    ):
+        if echo:
+            print(dim(f"$ {' '.join(cmd)}"))
+        code, _ = run_streamed(cmd, cwd=root, env=env, echo=echo)
+        if code != 0:
+            return False
+    return True
+
+
+def find_executable(binary_dir: Path, name: str) -> Optional[Path]:
+    """Find a built executable by target name below a build directory."""
+    suffix = ".exe" if os.name == "nt" else ""
+    for candidate in binary_dir.rglob(name + suffix):
+        if candidate.is_file() and os.access(candidate, os.X_OK) and "CMakeFiles" not in candidate.parts:
+            return candidate
+    return None
+
+
+def require_tool(*names: str) -> Optional[str]:
+    """Return the path of the first tool found on PATH."""
+    for name in names:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
@@ -0,0 +1,481 @@
+"""
+Size command - binary size and symbol bloat analysis.
+
+    cqs size [target] [--preset P] [--top N] [--depth N] [--label NAME] [--no-build]
+    cqs size [target] --diff A..B
+
+Builds a target (the cpp_quick_starter library, the app or a test binary)
+and breaks it down by section ('size -A') and by symbol ('nm -S
+--size-sort -C'). Symbols are aggregated by namespace, e.g.
+project_name::utils, and by template, counting distinct instantiations.
+
+Every run is stored as a snapshot in .cqs/size/<target>/<key>@<preset>.json,
+keyed by commit (or --label), and compared against the previous snapshot of
+the same target and preset. --diff A..B compares two stored snapshots, each
+side naming a commit or label, optionally as key@preset.
+"""
+
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    cyan,
+    green,
+    red,
+    dim,
+)
+from .git import current_commit, resolve_commit, is_dirty
+from .presets import configure_presets
+from .profile import target_cache_variables
+from .runner import variant_binary_dir, configure_and_build, find_executable, require_tool
+from .state import project_state_dir, load_json, save_json, format_size
+
+
+SIZE_DIR = "size"
+
+SIZE_TARGET = "cpp_quick_starter"
+NAMESPACE_DEPTH = 2
+
+# Section families reported as one entry (.text.foo -> .text)
+SECTION_FAMILIES = (".text", ".rodata", ".data.rel.ro", ".data", ".bss", ".tdata", ".tbss", ".gcc_except_table")
+
+# nm types of symbols that may be emitted in several objects and folded by the linker
+WEAK_TYPES = set("WwVvu")
+
+_NM_LINE = re.compile(r"^[0-9a-fA-F]+\s+([0-9a-fA-F]+)\s+(\w)\s+(.+)$")
+_SPECIAL = re.compile(
+    r"^(?:vtable|VTT|typeinfo name|typeinfo|construction vtable|guard variable|"
+    r"(?:non-virtual |virtual )?thunk to|covariant return thunk to|reference temporary #\d+) for "
+)
+_SPECIAL_THUNK = re.compile(r"^(?:non-virtual |virtual )?thunk to |^covariant return thunk to ")
+_ANONYMOUS = "(anonymous namespace)"
+
+
+# ============================================================================
+# Reading Binaries
+# ============================================================================
+
+
+def find_artifact(binary_dir: Path, target: str) -> Optional[Path]:
+    """Find the executable or library a target produces."""
+    executable = find_executable(binary_dir, target)
+    if executable is not None:
+        return executable
+    for name in (f"lib{target}.a", f"lib{target}.so", f"lib{target}.dylib", f"{target}.lib", f"{target}.dll"):
+        for candidate in binary_dir.rglob(name):
+            if candidate.is_file() and "CMakeFiles" not in candidate.parts:
+                return candidate
+    return None
+
+
+def parse_nm(text: str) -> Dict[str, Tuple[str, int]]:
+    """
+    Parse 'nm -S --size-sort -C' output into {symbol: (type, size)}.
+
+    Archives list every member; weak symbols (inline functions, template
+    instantiations) repeated across members are counted once, as the linker
+    folds them, while other duplicates add up.
+    """
+    symbols: Dict[str, Tuple[str, int]] = {}
+    for line in text.splitlines():
+        match = _NM_LINE.match(line.strip())
+        if not match:
+            continue
+        size, kind, name = int(match.group(1), 16), match.group(2), match.group(3)
+        if name in symbols:
+            old_kind, old_size = symbols[name]
+            size = max(size, old_size) if kind in WEAK_TYPES else size + old_size
+        symbols[name] = (kind, size)
+    return symbols
+
+
+def section_family(name: str) -> str:
+    """Collapse per-function sections (.text._Z..., .rodata.str1.1) into their family."""
+    for family in SECTION_FAMILIES:
+        if name == family or name.startswith(family + "."):
+            return family
+    return name
+
+
+def parse_size_a(text: str) -> Dict[str, int]:
+    """Parse 'size -A' output into {section family: bytes}, summed over archive members."""
+    sections: Dict[str, int] = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 2 or not fields[0].startswith(".") or not fields[1].isdigit():
+            continue
+        family = section_family(fields[0])
+        sections[family] = sections.get(family, 0) + int(fields[1])
+    return sections
+
+
+def read_binary(path: Path) -> Tuple[Dict[str, int], Dict[str, Tuple[str, int]]]:
+    """Return (sections, symbols) of a binary using nm and size."""
+    nm = require_tool("nm", "llvm-nm")
+    size = require_tool("size", "llvm-size")
+    if not nm or not size:
+        raise ValueError("nm and size (binutils or LLVM) are required.")
+    result = subprocess.run([nm, "-S", "--size-sort", "-C", str(path)], capture_output=True, text=True, errors="replace")
+    if result.returncode != 0:
+        raise ValueError(f"nm failed: {result.stderr.strip()}")
+    symbols = parse_nm(result.stdout)
+    result = subprocess.run([size, "-A", str(path)], capture_output=True, text=True, errors="replace")
+    if result.returncode != 0:
+        raise ValueError(f"size failed: {result.stderr.strip()}")
+    return parse_size_a(result.stdout), symbols
+
+
+# ============================================================================
+# Demangled Names
+# ============================================================================
+
+
+def qualified_name(symbol: str) -> str:
+    """
+    Reduce a demangled symbol to its qualified entity name.
+
+    Drops clone suffixes, ABI tags, parameter lists, return types of
+    template functions and prefixes such as 'vtable for'.
+    """
+    name = re.sub(r" \[clone [^\]]*\]", "", symbol)
+    name = re.sub(r"\[abi:\w+\]", "", name)
+    name = _SPECIAL_THUNK.sub("", name)
+    name = _SPECIAL.sub("", name)
+    name = name.replace(_ANONYMOUS, "\x00")
+
+    depth = 0
+    last_space = -1
+    i = 0
+    end = len(name)
+    while i < len(name):
+        if depth == 0 and name.startswith("operator", i) and (i == 0 or not name[i - 1].isalnum()):
+            # Skip the operator token: operator(), operator<<, operator new, operator std::string
+            i += len("operator")
+            if name.startswith("()", i):
+                i += 2
+            while i < len(name) and name[i] != "(":
+                i += 1
+            end = i
+            break
+        char = name[i]
+        if char == "<":
+            depth += 1
+        elif char == ">":
+            depth = max(depth - 1, 0)
+        elif char == "(":
+            if depth == 0:
+                end = i
+                break
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif char == " " and depth == 0:
+            last_space = i
+        i += 1
+    name = name[last_space + 1 : end].strip() if last_space < end else name[:end]
+    return name.replace("\x00", _ANONYMOUS)
+
+
+def split_scopes(name: str) -> List[str]:
+    """Split a qualified name at top-level '::' (not inside template arguments)."""
+    parts: List[str] = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(name):
+        char = name[i]
+        if char in "<(":
+            depth += 1
+        elif char in ">)":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and name.startswith("::", i):
+            parts.append(name[start:i])
+            start = i + 2
+            i += 1
+        i += 1
+    parts.append(name[start:])
+    return [part for part in parts if part]
+
+
+def strip_template_args(part: str) -> str:
+    """Return a name component without its template arguments (vector<int> -> vector)."""
+    index = part.find("<")
+    return part[:index] if index > 0 and not part.startswith("operator") else part
+
+
+def namespace_of(symbol: str, depth: int) -> str:
+    """Return the enclosing scope of a symbol, at most depth components deep."""
+    scopes = split_scopes(qualified_name(symbol))[:-1]
+    if not scopes:
+        return "(global)"
+    return "::".join(strip_template_args(part) for part in scopes[:depth])
+
+
+def template_of(symbol: str) -> Optional[Tuple[str, str]]:
+    """
+    Return (template, instantiation) for symbols belonging to a template.
+
+    The template is the qualified name up to the first component with
+    template arguments, e.g. std::vector for
+    std::vector<int>::_M_realloc_insert; the instantiation keeps the arguments.
+    """
+    scopes = split_scopes(qualified_name(symbol))
+    for index, part in enumerate(scopes):
+        if "<" in part and not part.startswith("operator"):
+            prefix = [strip_template_args(p) for p in scopes[:index]]
+            return "::".join(prefix + [strip_template_args(part)]), "::".join(prefix + [part])
+    return None
+
+
+# ============================================================================
+# Aggregation
+# ============================================================================
+
+
+def by_namespace(symbols: Dict[str, Tuple[str, int]], depth: int) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for name, (_, size) in symbols.items():
+        key = namespace_of(name, depth)
+        totals[key] = totals.get(key, 0) + size
+    return totals
+
+
+def by_template(symbols: Dict[str, Tuple[str, int]]) -> Dict[str, Dict[str, Any]]:
+    """Return {template: {"size", "symbols", "instantiations"}}."""
+    groups: Dict[str, Dict[str, Any]] = {}
+    seen: Dict[str, set] = {}
+    for name, (_, size) in symbols.items():
+        found = template_of(name)
+        if found is None:
+            continue
+        template, instantiation = found
+        group = groups.setdefault(template, {"size": 0, "symbols": 0, "instantiations": 0})
+        group["size"] += size
+        group["symbols"] += 1
+        seen.setdefault(template, set()).add(instantiation)
+        group["instantiations"] = len(seen[template])
+    return groups
+
+
+def _shorten(name: str, width: int) -> str:
+    return name if len(name) <= width else name[: width - 3] + "..."
+
+
+def _delta(value: int, width: int = 0) -> str:
+    text = f"{'+' if value > 0 else ''}{format_size(value)}" if value else "0"
+    text = text.rjust(width)
+    if value > 0:
+        return red(text)
+    if value < 0:
+        return green(text)
+    return dim(text)
+
+
+def table(rows: List[Tuple[str, int]], total: int, top: int, width: int = 48) -> List[str]:
+    """Render (name, bytes) rows with their share of total."""
+    lines = []
+    for name, size in sorted(rows, key=lambda row: -row[1])[:top]:
+        share = size / total * 100 if total else 0.0
+        lines.append(f"{_shorten(name, width):<{width}} {format_size(size):>10} {dim(f'{share:5.1f}%')}")
+    return lines
+
+
+def diff_table(before: Dict[str, int], after: Dict[str, int], top: int, width: int = 48) -> List[str]:
+    """Render the largest changes between two {name: bytes} maps."""
+    changes = []
+    for name in set(before) | set(after):
+        delta = after.get(name, 0) - before.get(name, 0)
+        if delta:
+            changes.append((name, before.get(name, 0), after.get(name, 0), delta))
+    changes.sort(key=lambda change: -abs(change[3]))
+    lines = []
+    for name, old, new, delta in changes[:top]:
+        status = dim(" new") if not old else dim(" gone") if not new else ""
+        lines.append(f"{_shorten(name, width):<{width}} {format_size(old):>10} {format_size(new):>10} {_delta(delta, 10)}{status}")
+    return lines or [dim("No changes.")]
+
+
+# ============================================================================
+# Snapshots
+# ============================================================================
+
+
+def snapshot_path(root: Path, target: str, key: str, preset: str) -> Path:
+    return project_state_dir(root) / SIZE_DIR / target / f"{key}@{preset}.json"
+
+
+def previous_snapshot(root: Path, target: str, preset: str, exclude: Path) -> Optional[Path]:
+    """Return the most recent other snapshot of a target and preset."""
+    directory = project_state_dir(root) / SIZE_DIR / target
+    candidates = [p for p in directory.glob(f"*@{preset}.json") if p != exclude]
+    return max(candidates, key=lambda p: load_json(p, {}).get("time", 0)) if candidates else None
+
+
+def resolve_snapshot(root: Path, target: str, spec: str, preset: str) -> Path:
+    """Find the snapshot a --diff side names: a label or commit, optionally key@preset."""
+    key, _, side_preset = spec.partition("@")
+    side_preset = side_preset or preset
+    path = snapshot_path(root, target, key, side_preset)
+    if path.exists():
+        return path
+    try:
+        commit = resolve_commit(root, key)
+    except ValueError:
+        commit = key
+    for candidate in (commit, commit + "-dirty"):
+        path = snapshot_path(root, target, candidate, side_preset)
+        if path.exists():
+            return path
+    raise ValueError(f"No size snapshot of {target} for {spec} (preset {side_preset}); run cqs size there first.")
+
+
+def show_diff(before: Dict[str, Any], after: Dict[str, Any], top: int, depth: int) -> None:
+    """Print section, namespace and symbol deltas between two snapshots."""
+    title = f"{before['key']}@{before['preset']} -> {after['key']}@{after['preset']}"
+    delta = after["file_size"] - before["file_size"]
+    header = dim(f"{'Name':<48} {'Before':>10} {'After':>10} {'Change':>10}")
+
+    print_box([header] + diff_table(before["sections"], after["sections"], top), title=f"Sections: {title}")
+    print()
+    old_symbols = {name: tuple(value) for name, value in before["symbols"].items()}
+    new_symbols = {name: tuple(value) for name, value in after["symbols"].items()}
+    print_box(
+        [header] + diff_table(by_namespace(old_symbols, depth), by_namespace(new_symbols, depth), top),
+        title="Namespaces",
+    )
+    print()
+    print_box(
+        [header]
+        + diff_table(
+            {name: size for name, (_, size) in old_symbols.items()},
+            {name: size for name, (_, size) in new_symbols.items()},
+            top,
+        ),
+        title="Symbols",
+    )
+    print()
+    print_info(
+        f"File size {format_size(before['file_size'])} -> {format_size(after['file_size'])} ({_delta(delta)})"
+    )
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_size(
+    root: Optional[Path] = None,
+    target: str = SIZE_TARGET,
+    preset: str = "ninja-release",
+    top: int = 15,
+    depth: int = NAMESPACE_DEPTH,
+    label: Optional[str] = None,
+    diff: Optional[str] = None,
+    build: bool = True,
+) -> bool:
+    """Break a target down by section, namespace, template and symbol; store and compare snapshots."""
+    print_banner(
+        "Size",
+        f"Binary size of {target}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    if diff:
+        if ".." not in diff:
+            raise ValueError(f"Expected A..B, got: {diff}")
+        sides = diff.split("..", 1)
+        before = load_json(resolve_snapshot(root, target, sides[0], preset))
+        after = load_json(resolve_snapshot(root, target, sides[1], preset))
+        show_diff(before, after, top, depth)
+        return True
+
+    binary_dir = variant_binary_dir(root, preset, "size")
+    if build and not configure_and_build(root, preset, binary_dir, target_cache_variables(target), [target]):
+        print_error(f"Could not build target {target}.")
+        return False
+    artifact = find_artifact(binary_dir, target)
+    if artifact is None:
+        print_error(f"{target} not built yet; run without --no-build." if not build else f"No output found for {target}.")
+        return False
+    print()
+
+    sections, symbols = read_binary(artifact)
+    symbol_total = sum(size for _, size in symbols.values())
+    file_size = artifact.stat().st_size
+
+    section_total = sum(sections.values())
+    print_box(table(list(sections.items()), section_total, top), title=f"Sections ({format_size(section_total)})")
+    print()
+    print_box(
+        table(list(by_namespace(symbols, depth).items()), symbol_total, top),
+        title=f"Namespaces (depth {depth})",
+    )
+    print()
+
+    templates = by_template(symbols)
+    width = 40
+    lines = [dim(f"{'Template':<{width}} {'Inst.':>6} {'Symbols':>8} {'Size':>10}")]
+    for name, group in sorted(templates.items(), key=lambda item: -item[1]["size"])[:top]:
+        lines.append(
+            f"{_shorten(name, width):<{width}} {group['instantiations']:>6} {group['symbols']:>8} {format_size(group['size']):>10}"
+        )
+    template_total = sum(group["size"] for group in templates.values())
+    share = template_total / symbol_total * 100 if symbol_total else 0.0
+    print_box(lines, title=f"Templates ({format_size(template_total)}, {share:.0f}% of symbols)")
+    print()
+    print_box(
+        table([(name, size) for name, (_, size) in symbols.items()], symbol_total, top, width=60),
+        title="Largest Symbols",
+    )
+    print()
+
+    key = label or (current_commit(root) or "worktree") + ("-dirty" if is_dirty(root) else "")
+    path = snapshot_path(root, target, key, preset)
+    snapshot = {
+        "time": int(time.time()),
+        "key": key,
+        "preset": preset,
+        "target": target,
+        "file": os.path.relpath(artifact, root),
+        "file_size": file_size,
+        "sections": sections,
+        "symbols": {name: [kind, size] for name, (kind, size) in symbols.items()},
+    }
+    save_json(path, snapshot)
+
+    previous = previous_snapshot(root, target, preset, path)
+    print_box(
+        [
+            f"File:       {cyan(snapshot['file'])}  {dim(format_size(file_size))}",
+            f"Symbols:    {cyan(str(len(symbols)))}  {dim(format_size(symbol_total))}",
+            f"Snapshot:   {cyan(key)}  {dim(str(path.relative_to(root)))}",
+        ],
+        title="Size",
+    )
+    print()
+    if previous is not None:
+        before = load_json(previous)
+        print_info(f"Changes since {cyan(before['key'])}:")
+        print()
+        show_diff(before, snapshot, top, depth)
+    else:
+        print_success("First snapshot of this target and preset; later runs are compared against it.")
+    return True
@@ -0,0 +1,125 @@
+"""
+Persistent CLI state - cache directories, JSON stores and content hashing.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+# Project-local state directory (stats, histories, per-file caches)
+STATE_DIR_NAME = ".cqs"
+
+
+# ============================================================================
+# Directories
+# ============================================================================
+
+
+def user_cache_dir() -> Path:
+    """
+    Return the per-user cqs cache directory.
+
+    Honors CQS_CACHE_DIR, then the platform convention
+    (LOCALAPPDATA on Windows, ~/Library/Caches on macOS, XDG_CACHE_HOME elsewhere).
+    """
+    override = os.environ.get("CQS_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = str(Path.home() / "Library" / "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+
+    return Path(base) / "cqs"
+
+
+def project_state_dir(root: Path) -> Path:
+    """Return the project-local state directory (created on demand)."""
+    state_dir = root / STATE_DIR_NAME
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+
+# ============================================================================
+# JSON Stores
+# ============================================================================
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """Load a JSON file, returning default if it is missing or corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """Atomically write data as JSON (write to a temp file, then rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            if indent is not None:
+                f.write("\n")
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+# ============================================================================
+# Hashing
+# ============================================================================
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Sizes
+# ============================================================================
+
+
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """Parse a human size such as '500M', '10G' or '1.5GiB' into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: float) -> str:
+    """Format a byte count for display."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
@@ -0,0 +1,178 @@
+"""
+Project statistics - single-pass, incrementally cached file scanner.
+
+Results are memoized in .cqs/stats.json keyed by relative path; a file is only
+re-read when its mtime or size changes, so warm scans cost one stat() per file.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from .state import STATE_DIR_NAME, load_json, save_json
+
+
+STATS_FILE = "stats.json"
+STATS_VERSION = 1
+
+HEADER_EXTENSIONS = {".hpp", ".h", ".hxx", ".hh", ".inl", ".ipp"}
+SOURCE_EXTENSIONS = {".cpp", ".cc", ".cxx", ".c"}
+
+# Files whose lines are counted (everything else only contributes bytes)
+TEXT_EXTENSIONS = HEADER_EXTENSIONS | SOURCE_EXTENSIONS | {
+    ".cmake",
+    ".txt",
+    ".py",
+    ".lua",
+    ".md",
+    ".json",
+    ".yml",
+    ".yaml",
+    ".toml",
+    ".sh",
+    ".ps1",
+    ".cmd",
+}
+
+IGNORED_DIRS = {
+    ".git",
+    STATE_DIR_NAME,
+    ".xmake",
+    ".cache",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "site",
+}
+
+LARGEST_COUNT = 10
+
+
+# ============================================================================
+# Scanning
+# ============================================================================
+
+
+def _is_ignored_dir(name: str) -> bool:
+    return name in IGNORED_DIRS or name == "build" or name.startswith("build-")
+
+
+def count_lines(path: str) -> int:
+    """Count non-blank lines in a text file."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return 0
+    return sum(1 for line in data.splitlines() if line.strip())
+
+
+def _walk(root: str) -> List[Tuple[str, int, int]]:
+    """Walk the tree once, returning (relative path, mtime_ns, size) for every file."""
+    files: List[Tuple[str, int, int]] = []
+    stack = [("", root)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        try:
+            entries = os.scandir(abs_dir)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _is_ignored_dir(entry.name):
+                            stack.append((rel, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        files.append((rel, st.st_mtime_ns, st.st_size))
+                except OSError:
+                    continue
+    return files
+
+
+def scan(root: Path, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Scan the project and return aggregated statistics.
+
+    Per-file line counts are reused from .cqs/stats.json when mtime and size
+    are unchanged; the cache is rewritten only if something changed.
+    """
+    start = time.perf_counter()
+    cache_path = root / STATE_DIR_NAME / STATS_FILE
+    cached: Dict[str, List[int]] = {}
+    if use_cache:
+        data = load_json(cache_path, {}) or {}
+        if data.get("version") == STATS_VERSION:
+            cached = data.get("files", {})
+
+    entries: Dict[str, List[int]] = {}
+    rescanned = 0
+    root_str = str(root)
+    for rel, mtime, size in _walk(root_str):
+        previous = cached.get(rel)
+        if previous and previous[0] == mtime and previous[1] == size:
+            entries[rel] = previous
+            continue
+        ext = os.path.splitext(rel)[1].lower()
+        lines = count_lines(os.path.join(root_str, rel)) if ext in TEXT_EXTENSIONS else 0
+        entries[rel] = [mtime, size, lines]
+        rescanned += 1
+
+    if use_cache and (rescanned or len(entries) != len(cached)):
+        save_json(cache_path, {"version": STATS_VERSION, "files": entries})
+
+    result = aggregate(entries)
+    result["scan"] = {
+        "files_rescanned": rescanned,
+        "cached": len(entries) - rescanned,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    return result
+
+
+# ============================================================================
+# Aggregation
+# ============================================================================
+
+
+def _bucket() -> Dict[str, int]:
+    return {"files": 0, "bytes": 0, "lines": 0}
+
+
+def aggregate(entries: Dict[str, List[int]]) -> Dict[str, Any]:
+    """Aggregate per-file entries by top-level directory and extension."""
+    totals = _bucket()
+    by_directory: Dict[str, Dict[str, int]] = {}
+    by_extension: Dict[str, Dict[str, int]] = {}
+    headers = sources = 0
+
+    for rel, (_, size, lines) in entries.items():
+        directory = rel.split("/", 1)[0] if "/" in rel else "."
+        ext = os.path.splitext(rel)[1].lower() or "(none)"
+        for bucket in (totals, by_directory.setdefault(directory, _bucket()), by_extension.setdefault(ext, _bucket())):
+            bucket["files"] += 1
+            bucket["bytes"] += size
+            bucket["lines"] += lines
+        if ext in HEADER_EXTENSIONS:
+            headers += 1
+        elif ext in SOURCE_EXTENSIONS:
+            sources += 1
+
+    largest = sorted(entries.items(), key=lambda item: item[1][1], reverse=True)[:LARGEST_COUNT]
+
+    return {
+        "totals": totals,
+        "by_directory": dict(sorted(by_directory.items(), key=lambda kv: -kv[1]["lines"])),
+        "by_extension": dict(sorted(by_extension.items(), key=lambda kv: -kv[1]["lines"])),
+        "largest": [{"path": rel, "bytes": e[1], "lines": e[2]} for rel, e in largest],
+        "headers": headers,
+        "sources": sources,
+        "header_source_ratio": round(headers / sources, 2) if sources else None,
+    }
@@ -0,0 +1,652 @@
+"""
+Test command - parallel, duration-aware test runner on top of ctest.
+
+    cqs test [preset] [--jobs N] [--filter REGEX] [--build] [--top N] [--shard N]
+
+Tests are listed with 'ctest --show-only=json-v1' and run on our own worker
+pool, longest first according to recorded durations, each with a timeout
+derived from its history. Durations are kept in .cqs/test-history.json.
+Tests whose properties only ctest can honour (RUN_SERIAL, RESOURCE_LOCK,
+DEPENDS, fixtures, ...) are handed to ctest itself once the pool is done.
+
+With --shard N, each GoogleTest binary is instead run as N concurrent
+processes (GTEST_TOTAL_SHARDS/GTEST_SHARD_INDEX), and the per-shard JSON
+reports are merged into .cqs/test/<preset>-gtest.{json,xml}.
+"""
+
+import os
+import json
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+    cyan,
+    green,
+    red,
+    yellow,
+    dim,
+)
+from .build import run_cmake
+from .presets import configure_presets, binary_dir as preset_binary_dir
+from .state import project_state_dir, load_json, save_json
+
+
+HISTORY_FILE = "test-history.json"
+SHARD_DIR = "test"
+
+# Durations kept per test
+HISTORY_SAMPLES = 10
+
+# Timeout = max(MIN_TIMEOUT, TIMEOUT_FACTOR x slowest recorded run) once a test has history
+TIMEOUT_FACTOR = 3.0
+MIN_TIMEOUT = 10.0
+MIN_HISTORY = 3
+
+# CTest's own default when a test sets no TIMEOUT
+DEFAULT_TIMEOUT = 1500.0
+
+# Scheduling properties our pool cannot honour; tests using them run through ctest
+CTEST_ONLY_PROPERTIES = (
+    "RUN_SERIAL",
+    "RESOURCE_LOCK",
+    "RESOURCE_GROUPS",
+    "PROCESSORS",
+    "DEPENDS",
+    "FIXTURES_SETUP",
+    "FIXTURES_CLEANUP",
+    "FIXTURES_REQUIRED",
+)
+
+
+# ============================================================================
+# Test Discovery
+# ============================================================================
+
+
+def list_tests(binary_dir: Path, regex: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return the tests ctest knows about, with command, working directory and environment."""
+    cmd = ["ctest", "--show-only=json-v1"]
+    if regex:
+        cmd += ["-R", regex]
+    result = subprocess.run(cmd, cwd=binary_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"ctest failed: {result.stderr.strip() or result.stdout.strip()}")
+
+    tests = []
+    for test in json.loads(result.stdout).get("tests", []):
+        if not test.get("command"):
+            continue
+        props = {p["name"]: p["value"] for p in test.get("properties", [])}
+        if props.get("DISABLED"):
+            continue
+        env = dict(os.environ)
+        for item in props.get("ENVIRONMENT", []):
+            key, _, value = item.partition("=")
+            env[key] = value
+        modify_environment(env, props.get("ENVIRONMENT_MODIFICATION", []))
+        tests.append(
+            {
+                "name": test["name"],
+                "command": test["command"],
+                "cwd": props.get("WORKING_DIRECTORY", str(binary_dir)),
+                "env": env,
+                "timeout": float(props["TIMEOUT"]) if props.get("TIMEOUT") else None,
+                "will_fail": bool(props.get("WILL_FAIL")),
+                "pass_regex": props.get("PASS_REGULAR_EXPRESSION", []),
+                "fail_regex": props.get("FAIL_REGULAR_EXPRESSION", []),
+                "skip_regex": props.get("SKIP_REGULAR_EXPRESSION", []),
+                "skip_code": int(props["SKIP_RETURN_CODE"]) if "SKIP_RETURN_CODE" in props else None,
+                "ctest_only": [name for name in CTEST_ONLY_PROPERTIES if props.get(name)],
+            }
+        )
+    return tests
+
+
+def modify_environment(env: Dict[str, str], items: List[str]) -> None:
+    """Apply ENVIRONMENT_MODIFICATION entries (VAR=op:value) on top of ENVIRONMENT."""
+    original = dict(env)
+    for item in items:
+        key, _, rest = item.partition("=")
+        op, _, value = rest.partition(":")
+        current = env.get(key, "")
+        if op == "reset":
+            if key in original:
+                env[key] = original[key]
+            else:
+                env.pop(key, None)
+        elif op == "set":
+            env[key] = value
+        elif op == "unset":
+            env.pop(key, None)
+        elif op == "string_append":
+            env[key] = current + value
+        elif op == "string_prepend":
+            env[key] = value + current
+        elif op in ("path_list_append", "cmake_list_append"):
+            sep = os.pathsep if op.startswith("path") else ";"
+            env[key] = current + sep + value if current else value
+        elif op in ("path_list_prepend", "cmake_list_prepend"):
+            sep = os.pathsep if op.startswith("path") else ";"
+            env[key] = value + sep + current if current else value
+
+
+# ============================================================================
+# Scheduling
+# ============================================================================
+
+
+def expected_duration(history: Dict[str, List[float]], name: str) -> Optional[float]:
+    """Return the median recorded duration of a test."""
+    samples = history.get(name)
+    return statistics.median(samples) if samples else None
+
+
+def schedule(tests: List[Dict[str, Any]], history: Dict[str, List[float]]) -> List[Dict[str, Any]]:
+    """
+    Order tests longest first (LPT), which keeps the makespan close to optimal.
+
+    Tests without history go first, since any of them could be the long pole.
+    """
+    return sorted(tests, key=lambda t: -(expected_duration(history, t["name"]) or float("inf")))
+
+
+def timeout_for(test: Dict[str, Any], history: Dict[str, List[float]]) -> float:
+    """Return a per-test timeout derived from history, falling back to the TIMEOUT property."""
+    samples = history.get(test["name"], [])
+    if len(samples) >= MIN_HISTORY:
+        derived = max(MIN_TIMEOUT, TIMEOUT_FACTOR * max(samples))
+        return min(derived, test["timeout"]) if test["timeout"] else derived
+    return test["timeout"] or DEFAULT_TIMEOUT
+
+
+def test_status(test: Dict[str, Any], returncode: int, output: str) -> str:
+    """Classify a finished test the way ctest does, from its exit code and output."""
+    if test.get("skip_code") is not None and returncode == test["skip_code"]:
+        return "skipped"
+    if any(re.search(pattern, output) for pattern in test.get("skip_regex", [])):
+        return "skipped"
+    if test.get("pass_regex"):
+        passed = any(re.search(pattern, output) for pattern in test["pass_regex"])
+    else:
+        passed = returncode == 0
+    if any(re.search(pattern, output) for pattern in test.get("fail_regex", [])):
+        passed = False
+    return "passed" if passed != test["will_fail"] else "failed"
+
+
+def run_test(test: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    """Run one test command."""
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            test["command"],
+            cwd=test["cwd"],
+            env=test["env"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            timeout=timeout,
+        )
+        output = result.stdout
+        status = test_status(test, result.returncode, output)
+    except subprocess.TimeoutExpired as e:
+        status = "timeout"
+        output = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+    except OSError as e:
+        status = "failed"
+        output = str(e)
+    return {
+        "name": test["name"],
+        "status": status,
+        "seconds": time.perf_counter() - start,
+        "timeout": timeout,
+        "output": output,
+    }
+
+
+def status_label(status: str) -> str:
+    """Return the colored label of a test status."""
+    return {
+        "passed": green("Passed"),
+        "skipped": yellow("Skipped"),
+        "failed": red("Failed"),
+        "timeout": red("Timeout"),
+    }[status]
+
+
+def run_pool(
+    tests: List[Dict[str, Any]],
+    history: Dict[str, List[float]],
+    jobs: int,
+) -> List[Dict[str, Any]]:
+    """Run tests on a worker pool in schedule order, printing results as they finish."""
+    results = []
+    width = len(str(len(tests)))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_test, t, timeout_for(t, history)) for t in schedule(tests, history)]
+        for i, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            label = status_label(result["status"])
+            seconds = f"{result['seconds']:.2f} s"
+            print(f"  {dim(f'{i:>{width}}/{len(tests)}')} {result['name']:<50} {label} {dim(seconds)}")
+    return results
+
+
+def run_ctest(binary_dir: Path, tests: List[Dict[str, Any]], jobs: int, report: Path) -> List[Dict[str, Any]]:
+    """Run tests through ctest itself, which honours their scheduling properties, and read back its JUnit report."""
+    names = "|".join(re.escape(t["name"]) for t in tests)
+    timeouts = {t["name"]: t["timeout"] or DEFAULT_TIMEOUT for t in tests}
+    report.unlink(missing_ok=True)
+    subprocess.run(
+        ["ctest", "-R", f"^({names})$", "-j", str(jobs), "--output-junit", str(report)],
+        cwd=binary_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        stdin=subprocess.DEVNULL,
+    )
+    if not report.exists():
+        return [
+            {"name": t["name"], "status": "failed", "seconds": 0.0, "timeout": timeouts[t["name"]], "output": "ctest produced no report"}
+            for t in tests
+        ]
+
+    results = []
+    for case in ET.parse(report).getroot().iter("testcase"):
+        failure = case.find("failure")
+        output = case.findtext("system-out") or ""
+        if case.get("status") == "run":
+            status = "passed"
+        elif case.find("skipped") is not None:
+            status = "skipped"
+        elif failure is not None and "Timeout" in (failure.get("message") or ""):
+            status = "timeout"
+        else:
+            status = "failed"
+        result = {
+            "name": case.get("name", ""),
+            "status": status,
+            "seconds": float(case.get("time") or 0),
+            "timeout": timeouts.get(case.get("name", ""), DEFAULT_TIMEOUT),
+            "output": output,
+        }
+        results.append(result)
+        seconds = f"{result['seconds']:.2f} s"
+        print(f"  {dim('ctest')} {result['name']:<50} {status_label(status)} {dim(seconds)}")
+    return results
+
+
+def record_durations(history: Dict[str, List[float]], results: List[Dict[str, Any]]) -> None:
+    """Add durations of passing tests to the history (timeouts and failures are not representative)."""
+    for result in results:
+        if result["status"] == "passed":
+            samples = history.get(result["name"], [])
+            history[result["name"]] = (samples + [round(result["seconds"], 3)])[-HISTORY_SAMPLES:]
+
+
+# ============================================================================
+# GoogleTest Sharding
+# ============================================================================
+
+
+def gtest_binaries(tests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Group tests registered by gtest_discover_tests by executable.
+
+    Returns {executable: {"cwd", "env", "filters"}}, where filters are the
+    --gtest_filter patterns of the selected tests.
+    """
+    binaries: Dict[str, Dict[str, Any]] = {}
+    for test in tests:
+        executable, *args = test["command"]
+        gtest_filter = next((a.split("=", 1)[1] for a in args if a.startswith("--gtest_filter=")), None)
+        if gtest_filter is None:
+            continue
+        entry = binaries.setdefault(executable, {"cwd": test["cwd"], "env": test["env"], "filters": []})
+        entry["filters"].append(gtest_filter)
+    return binaries
+
+
+def shard_command(executable: str, index: int, total: int, gtest_filter: Optional[str] = None) -> str:
+    """Return a shell command reproducing one shard (optionally narrowed to one test)."""
+    args = [executable] + ([f"--gtest_filter={gtest_filter}"] if gtest_filter else [])
+    cmd = subprocess.list2cmdline(args) if sys.platform == "win32" else shlex.join(args)
+    if sys.platform == "win32":
+        return f"set GTEST_TOTAL_SHARDS={total}&& set GTEST_SHARD_INDEX={index}&& {cmd}"
+    return f"GTEST_TOTAL_SHARDS={total} GTEST_SHARD_INDEX={index} {cmd}"
+
+
+def run_shard(
+    executable: str,
+    binary: Dict[str, Any],
+    index: int,
+    total: int,
+    gtest_filter: Optional[str],
+    output: Path,
+) -> Dict[str, Any]:
+    """Run one shard of a gtest binary, writing its JSON report to output."""
+    env = dict(binary["env"])
+    env["GTEST_TOTAL_SHARDS"] = str(total)
+    env["GTEST_SHARD_INDEX"] = str(index)
+    env["GTEST_OUTPUT"] = f"json:{output}"
+    output.unlink(missing_ok=True)
+    test = {
+        "name": f"{Path(executable).name} shard {index}/{total}",
+        "command": [executable] + ([f"--gtest_filter={gtest_filter}"] if gtest_filter else []),
+        "cwd": binary["cwd"],
+        "env": env,
+        "will_fail": False,
+    }
+    result = run_test(test, DEFAULT_TIMEOUT)
+    result.update({"executable": executable, "index": index, "total": total, "filter": gtest_filter})
+    result["cases"] = parse_gtest_json(output)
+    return result
+
+
+def parse_gtest_json(path: Path) -> List[Dict[str, Any]]:
+    """Return the test cases of a gtest JSON report as {"suite", "name", "seconds", "status", "failures"}."""
+    report = load_json(path, None)
+    if not report:
+        return []
+    cases = []
+    for suite in report.get("testsuites", []):
+        for case in suite.get("testsuite", []):
+            if case.get("status") == "NOTRUN":
+                continue
+            failures = [f.get("failure", "") for f in case.get("failures", [])]
+            cases.append(
+                {
+                    "suite": suite["name"],
+                    "name": case["name"],
+                    "seconds": float(str(case.get("time", "0")).rstrip("s") or 0),
+                    "status": "failed" if failures else "skipped" if case.get("result") == "SKIPPED" else "passed",
+                    "failures": failures,
+                }
+            )
+    return cases
+
+
+def merge_shards(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-shard results into one gtest-style report with per-test timings."""
+    suites: Dict[str, List[Dict[str, Any]]] = {}
+    for shard in shards:
+        for case in shard["cases"]:
+            suites.setdefault(case["suite"], []).append(
+                {
+                    "name": case["name"],
+                    "status": case["status"],
+                    "time": f"{case['seconds']:.3f}s",
+                    "binary": shard["executable"],
+                    "shard": shard["index"],
+                    "failures": [{"failure": f} for f in case["failures"]],
+                }
+            )
+
+    def _totals(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "tests": len(cases),
+            "failures": sum(1 for c in cases if c["status"] == "failed"),
+            "time": f"{sum(float(c['time'][:-1]) for c in cases):.3f}s",
+        }
+
+    all_cases = [c for cases in suites.values() for c in cases]
+    return {
+        **_totals(all_cases),
+        "shards": shards[0]["total"] if shards else 0,
+        "testsuites": [
+            {"name": name, **_totals(cases), "testsuite": cases} for name, cases in sorted(suites.items())
+        ],
+    }
+
+
+def write_junit(report: Dict[str, Any], path: Path) -> None:
+    """Write a merged report as JUnit XML (the format of gtest's own --gtest_output=xml)."""
+    root = ET.Element(
+        "testsuites",
+        tests=str(report["tests"]),
+        failures=str(report["failures"]),
+        time=report["time"][:-1],
+    )
+    for suite in report["testsuites"]:
+        element = ET.SubElement(
+            root,
+            "testsuite",
+            name=suite["name"],
+            tests=str(suite["tests"]),
+            failures=str(suite["failures"]),
+            time=suite["time"][:-1],
+        )
+        for case in suite["testsuite"]:
+            testcase = ET.SubElement(element, "testcase", name=case["name"], classname=suite["name"], time=case["time"][:-1])
+            if case["status"] == "skipped":
+                ET.SubElement(testcase, "skipped")
+            for failure in case["failures"]:
+                ET.SubElement(testcase, "failure", message=failure["failure"].splitlines()[0] if failure["failure"] else "").text = failure["failure"]
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def run_sharded(
+    root: Path,
+    preset: str,
+    tests: List[Dict[str, Any]],
+    shards: int,
+    workers: int,
+    narrowed: bool,
+    top: int,
+) -> bool:
+    """Run every gtest binary as concurrent shards and report the merged results."""
+    binaries = gtest_binaries(tests)
+    if not binaries:
+        print_error("No GoogleTest binaries found (tests must be registered with gtest_discover_tests).")
+        return False
+
+    report_dir = project_state_dir(root) / SHARD_DIR
+    report_dir.mkdir(parents=True, exist_ok=True)
+    print_info(
+        f"{cyan(str(len(binaries)))} GoogleTest binar{'y' if len(binaries) == 1 else 'ies'} "
+        f"x {cyan(str(shards))} shard(s) on {cyan(str(workers))} worker(s)"
+    )
+    print()
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for executable, binary in binaries.items():
+            # Only pass a filter when ctest's selection is narrower than the whole binary
+            gtest_filter = ":".join(binary["filters"]) if narrowed else None
+            for index in range(shards):
+                output = report_dir / f"{preset}-{Path(executable).stem}-{index}.json"
+                futures.append(pool.submit(run_shard, executable, binary, index, shards, gtest_filter, output))
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            failed_cases = sum(1 for c in result["cases"] if c["status"] == "failed")
+            ok = result["status"] == "passed"
+            label = green("Passed") if ok else red("Timeout" if result["status"] == "timeout" else "Failed")
+            seconds = f"{result['seconds']:.2f} s, {len(result['cases'])} test(s)"
+            print(f"  {result['name']:<40} {label} {dim(seconds)}" + (red(f"  {failed_cases} failed") if failed_cases else ""))
+    wall = time.perf_counter() - start
+
+    results.sort(key=lambda r: (r["executable"], r["index"]))
+    report = merge_shards(results)
+    save_json(report_dir / f"{preset}-gtest.json", report, indent=2)
+    write_junit(report, report_dir / f"{preset}-gtest.xml")
+
+    failed = 0
+    for shard in results:
+        cases = [c for c in shard["cases"] if c["status"] == "failed"]
+        # A shard can fail without a failing case: a crash, a timeout, or a broken report
+        if not cases and shard["status"] == "passed":
+            continue
+        print()
+        for case in cases:
+            failed += 1
+            full_name = f"{case['suite']}.{case['name']}"
+            print(f"  {red(full_name)} failed in shard {shard['index']}:")
+            for line in "\n".join(case["failures"]).rstrip().splitlines()[-20:]:
+                print(f"    {line}")
+            print(f"    {dim('Repro:')} {shard_command(shard['executable'], shard['index'], shards, full_name)}")
+        if not cases:
+            failed += 1
+            reason = "timed out" if shard["status"] == "timeout" else "failed without a failing test (crash?)"
+            print(f"  {red(shard['name'])} {reason}:")
+            for line in shard["output"].rstrip().splitlines()[-20:]:
+                print(f"    {line}")
+        print(f"    {dim('Shard:')} {shard_command(shard['executable'], shard['index'], shards, shard['filter'])}")
+
+    print()
+    cases = [(f"{c['suite']}.{c['name']}", c["seconds"]) for r in results for c in r["cases"]]
+    print_box(
+        [f"{seconds:>8.3f} s  {name}" for name, seconds in sorted(cases, key=lambda c: -c[1])[:top]],
+        title="Slowest Tests",
+    )
+    print()
+
+    busy = max((r["seconds"] for r in results), default=0)
+    idle = min((r["seconds"] for r in results), default=0)
+    print_box(
+        [
+            f"Passed:     {cyan(str(report['tests'] - report['failures']))} / {report['tests']}",
+            f"Wall time:  {cyan(f'{wall:.2f} s')}  {dim(f'(shards took {idle:.2f}-{busy:.2f} s)')}",
+            f"Report:     {cyan(str((report_dir / f'{preset}-gtest.json').relative_to(root)))} "
+            f"{dim('(+ .xml)')}",
+        ],
+        title="Summary",
+    )
+    print()
+
+    if failed:
+        print_error(f"{failed} failure(s) across {shards} shard(s).")
+        return False
+
+    print_success("All tests passed!")
+    return True
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_test(
+    root: Optional[Path] = None,
+    preset: str = "ninja-debug",
+    jobs: Optional[int] = None,
+    regex: Optional[str] = None,
+    build: bool = False,
+    top: int = 10,
+    shards: Optional[int] = None,
+) -> bool:
+    """Run tests in parallel, longest first, with history-derived timeouts."""
+    print_banner(
+        "Test",
+        f"Parallel tests for preset {preset}",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    if preset not in configure_presets(root):
+        print_error(f"Unknown configure preset: {preset}")
+        return False
+
+    binary_dir = preset_binary_dir(root, preset)
+    if build or not binary_dir.exists():
+        ok, _ = run_cmake(root, preset, None, jobs)
+        print()
+        if not ok:
+            print_error("Build failed.")
+            return False
+
+    tests = list_tests(binary_dir, regex)
+    if not tests:
+        print_error("No tests found.")
+        return False
+
+    workers = jobs or os.cpu_count() or 1
+    if shards:
+        return run_sharded(root, preset, tests, shards, max(workers, shards), bool(regex), top)
+
+    history_path = project_state_dir(root) / HISTORY_FILE
+    history: Dict[str, List[float]] = load_json(history_path, {}) or {}
+    known = sum(1 for t in tests if t["name"] in history)
+    predicted = sum(expected_duration(history, t["name"]) or 0 for t in tests)
+    print_info(
+        f"{cyan(str(len(tests)))} test(s) on {cyan(str(workers))} worker(s), "
+        f"{known} with recorded durations"
+    )
+    delegated = [t for t in tests if t["ctest_only"]]
+    if delegated:
+        properties = sorted({p for t in delegated for p in t["ctest_only"]})
+        print_warning(
+            f"{len(delegated)} test(s) use {', '.join(properties)}; "
+            f"they run through ctest after the others."
+        )
+    print()
+
+    start = time.perf_counter()
+    results = run_pool([t for t in tests if not t["ctest_only"]], history, workers)
+    if delegated:
+        report = project_state_dir(root) / SHARD_DIR / f"{preset}-ctest.xml"
+        report.parent.mkdir(parents=True, exist_ok=True)
+        results += run_ctest(binary_dir, delegated, workers, report)
+    wall = time.perf_counter() - start
+
+    record_durations(history, results)
+    save_json(history_path, history)
+
+    failed = [r for r in results if r["status"] not in ("passed", "skipped")]
+    skipped = sum(1 for r in results if r["status"] == "skipped")
+    for result in sorted(failed, key=lambda r: r["name"]):
+        print()
+        reason = f"timed out after {result['timeout']:.0f} s" if result["status"] == "timeout" else "failed"
+        print(f"  {red(result['name'])} {reason}:")
+        lines = result["output"].rstrip().splitlines()[-40:]
+        for line in lines or [dim("(no output)")]:
+            print(f"    {line}")
+
+    print()
+    slowest = sorted(results, key=lambda r: -r["seconds"])[:top]
+    print_box(
+        [f"{r['seconds']:>8.2f} s  {r['name']}" for r in slowest],
+        title="Slowest Tests",
+    )
+    print()
+
+    cpu = sum(r["seconds"] for r in results)
+    print_box(
+        [
+            f"Passed:     {cyan(str(len(results) - len(failed) - skipped))} / {len(results)}"
+            + (dim(f"  ({skipped} skipped)") if skipped else ""),
+            f"Wall time:  {cyan(f'{wall:.2f} s')}" + (dim(f"  (predicted serial {predicted:.2f} s)") if predicted else ""),
+            f"Test time:  {cyan(f'{cpu:.2f} s')}  {dim(f'speedup {cpu / wall:.1f}x' if wall else '')}",
+        ],
+        title="Summary",
+    )
+    print()
+
+    if failed:
+        print_error(f"{len(failed)} test(s) failed.")
+        return False
+
+    print_success("All tests passed!")
+    return True
@@ -0,0 +1,256 @@
+"""
+Tidy command - parallel, hash-cached clang-tidy driven by compile_commands.json.
+
+    cqs tidy [--preset NAME] [--changed [REF]] [--jobs N]
+
+Each TU's result is cached in .cqs/tidy/ under a key made of the source hash,
+the hashes of the project headers it includes, its compile flags, the
+.clang-tidy hash and the clang-tidy version (from the cached doctor probe).
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from .ui import (
+    ProgressBar,
+    print_banner,
+    print_box,
+    print_success,
+    print_error,
+    print_warning,
+    print_info,
+    cyan,
+    yellow,
+    red,
+    dim,
+    bold,
+)
+from .compdb import find_compile_commands, load_compile_commands
+from .git import changed_files
+from .graph import build_graph, transitive_includes, dependent_units
+from .presets import binary_dir as preset_binary_dir
+from .doctor import tool_info
+from .state import project_state_dir, load_json, save_json, hash_bytes, hash_file
+
+
+_DIAGNOSTIC_RE = re.compile(r"^(.+?):(\d+):(\d+): (warning|error): (.*?)(?: \[([\w.,-]+)\])?$")
+
+
+# ============================================================================
+# Selection
+# ============================================================================
+
+
+def project_entries(root: Path, compdb: Path) -> List[Dict[str, Any]]:
+    """Return compile entries for project sources (skipping build trees and _deps)."""
+    build_root = os.path.normpath(str(root / "build"))
+    entries = []
+    seen = set()
+    for entry in load_compile_commands(compdb):
+        path = entry["file"]
+        if not path.startswith(str(root)) or path.startswith(build_root) or "_deps" in Path(path).parts:
+            continue
+        if path in seen:
+            continue
+        seen.add(path)
+        entries.append(entry)
+    return entries
+
+
+def select_changed(root: Path, entries: List[Dict[str, Any]], ref: str, graph: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Keep entries whose source, or any project header they include, changed since ref."""
+    changed = changed_files(root, ref)
+    wanted = {os.path.normpath(str(p)) for p in changed}
+    wanted |= {os.path.normpath(str(p)) for p in dependent_units(graph, changed)}
+    return [e for e in entries if e["file"] in wanted]
+
+
+# ============================================================================
+# Caching
+# ============================================================================
+
+
+def cache_key(
+    entry: Dict[str, Any],
+    header_hashes: List[str],
+    config_hash: str,
+    version: str,
+) -> str:
+    """Return the cache key for one TU."""
+    payload = json.dumps(
+        [hash_file(Path(entry["file"])), sorted(header_hashes), entry["arguments"], config_hash, version]
+    )
+    return hash_bytes(payload.encode())
+
+
+def run_tidy(tool: str, compdb_dir: Path, path: str) -> Dict[str, Any]:
+    """Run clang-tidy on one file."""
+    result = subprocess.run(
+        [tool, "-p", str(compdb_dir), "--quiet", path],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    return {"file": path, "returncode": result.returncode, "output": result.stdout}
+
+
+def cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a clang-tidy result is worth caching: not killed by a
+    signal, and either clean or failing with diagnostics to show for it.
+    """
+    if result["returncode"] < 0:
+        return False
+    return result["returncode"] == 0 or bool(parse_diagnostics(result["output"]))
+
+
+def parse_diagnostics(output: str) -> List[Dict[str, Any]]:
+    """Extract warnings and errors from clang-tidy output."""
+    diagnostics = []
+    for line in output.splitlines():
+        match = _DIAGNOSTIC_RE.match(line)
+        if match:
+            diagnostics.append(
+                {
+                    "file": match.group(1),
+                    "line": int(match.group(2)),
+                    "column": int(match.group(3)),
+                    "severity": match.group(4),
+                    "message": match.group(5),
+                    "check": match.group(6) or "",
+                }
+            )
+    return diagnostics
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def cmd_tidy(
+    root: Optional[Path] = None,
+    preset: Optional[str] = None,
+    changed: Optional[str] = None,
+    jobs: Optional[int] = None,
+) -> bool:
+    """Run clang-tidy over the compilation database with per-TU result caching."""
+    print_banner(
+        "clang-tidy",
+        "Parallel, cached static analysis",
+        "",
+    )
+
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+
+    info = tool_info("clang-tidy")
+    tool = info["path"]
+    if info["status"] != "ok":
+        print_error("clang-tidy not found in PATH.")
+        return False
+
+    compdb = find_compile_commands(root, preset_binary_dir(root, preset) if preset else None)
+    if not compdb:
+        print_error("compile_commands.json not found. Configure a preset first.")
+        return False
+
+    entries = project_entries(root, compdb)
+    graph = build_graph(root)
+    if changed is not None:
+        entries = select_changed(root, entries, changed, graph)
+        print_info(f"Files changed relative to {cyan(changed)}: {cyan(str(len(entries)))} TU(s)")
+    if not entries:
+        print_success("Nothing to check.")
+        return True
+
+    config = root / ".clang-tidy"
+    config_hash = hash_file(config) if config.exists() else ""
+    version = f"{info['version']} {info['fingerprint'][1]}"
+    cache_dir = project_state_dir(root) / "tidy"
+
+    header_hashes: Dict[Path, str] = {}
+    pending = []
+    results: List[Dict[str, Any]] = []
+    for entry in entries:
+        path = Path(entry["file"])
+        headers = transitive_includes(graph, path) if path in graph["edges"] else set()
+        for header in headers:
+            if header not in header_hashes:
+                header_hashes[header] = hash_file(header)
+        key = cache_key(entry, [header_hashes[h] for h in headers], config_hash, version)
+        cached = load_json(cache_dir / f"{key}.json")
+        if cached is not None:
+            results.append(cached)
+        else:
+            pending.append((key, entry))
+
+    hits = len(results)
+    workers = jobs or os.cpu_count() or 1
+    print_info(
+        f"{cyan(str(len(entries)))} TU(s): {cyan(str(hits))} cached, "
+        f"{cyan(str(len(pending)))} to analyze on {workers} worker(s)"
+    )
+
+    start = time.perf_counter()
+    if pending:
+        with ProgressBar(len(pending), prefix="  ") as bar:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_tidy, tool, compdb.parent, e["file"]): key for key, e in pending}
+                for future in as_completed(futures):
+                    result = future.result()
+                    # Crashes and killed runs are retried next time instead of sticking in the cache
+                    if cacheable(result):
+                        save_json(cache_dir / f"{futures[future]}.json", result)
+                    results.append(result)
+                    bar.update(message=os.path.relpath(result["file"], root))
+    elapsed = time.perf_counter() - start
+
+    warnings = errors = 0
+    failed = []
+    seen = set()
+    print()
+    for result in sorted(results, key=lambda r: r["file"]):
+        if result["returncode"] != 0:
+            failed.append(result["file"])
+        for diag in parse_diagnostics(result["output"]):
+            # Header diagnostics repeat for every TU that includes the header
+            key = (diag["file"], diag["line"], diag["column"], diag["message"])
+            if key in seen:
+                continue
+            seen.add(key)
+            location = f"{os.path.relpath(diag['file'], root)}:{diag['line']}:{diag['column']}"
+            if diag["severity"] == "error":
+                errors += 1
+                print(f"  {red('error')}   {bold(location)} {diag['message']} " + dim(f"[{diag['check']}]"))
+            else:
+                warnings += 1
+                print(f"  {yellow('warning')} {bold(location)} {diag['message']} " + dim(f"[{diag['check']}]"))
+
+    print()
+    print_box(
+        [
+            f"Translation units: {cyan(str(len(entries)))}",
+            f"Cache hits:        {cyan(str(hits))}",
+            f"Analyzed:          {cyan(str(len(pending)))} in {elapsed:.1f} s",
+            f"Warnings:          {cyan(str(warnings))}",
+            f"Errors:            {cyan(str(errors))}",
+        ],
+        title="Summary",
+    )
+
+    if failed:
+        print_warning(f"clang-tidy failed on {len(failed)} file(s).")
+    if errors or failed:
+        return False
+
+    print_success("clang-tidy finished")
+    return True
@@ -0,0 +1,280 @@
+"""
+Build profile command - clang -ftime-trace aggregation.
+
+    cqs build-profile [preset] [--no-build] [--top N] [--json]
+
+Configures the preset into build/cqs/<preset>-time-trace with clang and
+-ftime-trace, builds it, then streams every per-TU trace into one report.
+"""
+
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+from .ui import (
+    print_banner,
+    print_box,
+    print_error,
+    print_info,
+    print_success,
+    cyan,
+    dim,
+)
+from .pgo import flag_variables
+from .presets import configure_presets, resolve_cache_variables
+from .runner import variant_binary_dir, configure_and_build, require_tool
+
+
+CHUNK_SIZE = 1 << 16
+
+# Events aggregated from each trace
+TEMPLATE_EVENTS = ("InstantiateClass", "InstantiateFunction")
+
+
+# ============================================================================
+# Streaming Trace Reader
+# ============================================================================
+
+
+def iter_trace_events(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the events of a Chrome trace file one at a time.
+
+    Only the current event is buffered, so memory stays bounded no matter
+    how large the trace is.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        buf = ""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+            key = buf.find('"traceEvents"')
+            if key == -1:
+                buf = buf[-16:]
+                continue
+            bracket = buf.find("[", key)
+            if bracket != -1:
+                buf = buf[bracket + 1 :]
+                break
+            buf = buf[key:]
+
+        pos = 0
+        eof = False
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                event, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield event
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+def is_trace_file(path: Path) -> bool:
+    """Check whether a JSON file is a clang time trace."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return '"traceEvents"' in f.read(4096)
+    except OSError:
+        return False
+
+
+def find_traces(binary_dir: Path) -> List[Path]:
+    """Return all per-TU trace files (clang writes <object>.json next to each object)."""
+    return [p for p in binary_dir.rglob("*.json") if "CMakeFiles" in p.parts and is_trace_file(p)]
+
+
+# ============================================================================
+# Aggregation
+# ============================================================================
+
+
+def summarize_trace(path: Path) -> Dict[str, Any]:
+    """Reduce one trace to per-TU totals plus per-header/per-template times (microseconds)."""
+    totals: Dict[str, int] = {}
+    headers: Dict[str, int] = {}
+    templates: Dict[str, int] = {}
+
+    for event in iter_trace_events(path):
+        if event.get("ph") != "X":
+            continue
+        name = event.get("name", "")
+        dur = int(event.get("dur", 0))
+        if name.startswith("Total "):
+            totals[name[6:]] = totals.get(name[6:], 0) + dur
+        elif name == "Source":
+            detail = event.get("args", {}).get("detail", "")
+            headers[detail] = headers.get(detail, 0) + dur
+        elif name in TEMPLATE_EVENTS:
+            detail = event.get("args", {}).get("detail", "")
+            templates[detail] = templates.get(detail, 0) + dur
+
+    return {
+        "tu": str(path),
+        "total": totals.get("ExecuteCompiler", totals.get("Frontend", 0) + totals.get("Backend", 0)),
+        "frontend": totals.get("Frontend", 0),
+        "backend": totals.get("Backend", 0),
+        "headers": headers,
+        "templates": templates,
+    }
+
+
+def aggregate_traces(traces: List[Path], top: int = 15, jobs: Optional[int] = None) -> Dict[str, Any]:
+    """Aggregate traces across a process pool, keeping only running totals."""
+    tus: List[Tuple[int, str, int, int]] = []
+    headers: Dict[str, List[int]] = {}
+    templates: Dict[str, List[int]] = {}
+    frontend = backend = 0
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for summary in pool.map(summarize_trace, traces, chunksize=4):
+            tus.append((summary["total"], summary["tu"], summary["frontend"], summary["backend"]))
+            frontend += summary["frontend"]
+            backend += summary["backend"]
+            for name, dur in summary["headers"].items():
+                entry = headers.setdefault(name, [0, 0])
+                entry[0] += dur
+                entry[1] += 1
+            for name, dur in summary["templates"].items():
+                entry = templates.setdefault(name, [0, 0])
+                entry[0] += dur
+                entry[1] += 1
+
+    def _top(items: Dict[str, List[int]]) -> List[Dict[str, Any]]:
+        return [
+            {"name": name, "total_ms": total / 1000, "count": count, "avg_ms": total / count / 1000}
+            for name, (total, count) in heapq.nlargest(top, items.items(), key=lambda kv: kv[1][0])
+        ]
+
+    return {
+        "translation_units": len(tus),
+        "frontend_ms": frontend / 1000,
+        "backend_ms": backend / 1000,
+        "slowest_tus": [
+            {"tu": tu, "total_ms": total / 1000, "frontend_ms": fe / 1000, "backend_ms": be / 1000}
+            for total, tu, fe, be in heapq.nlargest(top, tus)
+        ],
+        "headers": _top(headers),
+        "templates": _top(templates),
+    }
+
+
+# ============================================================================
+# Command
+# ============================================================================
+
+
+def _short(text: str, width: int = 60) -> str:
+    return text if len(text) <= width else "..." + text[-(width - 3) :]
+
+
+def cmd_build_profile(
+    root: Optional[Path] = None,
+    preset: str = "ninja-debug",
+    build: bool = True,
+    top: int = 15,
+    as_json: bool = False,
+) -> bool:
+    """Build a preset with -ftime-trace and report compile-time hotspots."""
+    if root is None:
+        root = Path.cwd()
+
+    root = root.resolve()
+    binary_dir = variant_binary_dir(root, preset, "time-trace")
+
+    if not as_json:
+        print_banner(
+            "Build Profile",
+            f"Compile-time breakdown for preset {preset}",
+            "",
+        )
+
+    if build:
+        presets = configure_presets(root)
+        if preset not in presets:
+            print_error(f"Unknown configure preset: {preset}")
+            return False
+
+        compiler = resolve_cache_variables(presets, preset).get("CMAKE_CXX_COMPILER", "")
+        # Only C++ is switched to clang, so the C flags are left alone
+        cache_vars = flag_variables(root, preset, "-ftime-trace", ("CMAKE_CXX_FLAGS",))
+        if "clang" not in os.path.basename(compiler):
+            clang = require_tool("clang++")
+            if not clang:
+                print_error("-ftime-trace requires clang++, which was not found on PATH.")
+                return False
+            cache_vars["CMAKE_CXX_COMPILER"] = clang
+
+        print_info(f"Build directory: {cyan(str(binary_dir.relative_to(root)))}")
+        if not configure_and_build(root, preset, binary_dir, cache_vars, echo=not as_json):
+            print_error("Build failed.")
+            return False
+        print()
+
+    traces = find_traces(binary_dir) if binary_dir.exists() else []
+    if not traces:
+        print_error(f"No time-trace files found in {binary_dir}.")
+        return False
+
+    report = aggregate_traces(traces, top=top)
+    for tu in report["slowest_tus"]:
+        tu["tu"] = os.path.relpath(tu["tu"], binary_dir)
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return True
+
+    frontend, backend = report["frontend_ms"], report["backend_ms"]
+    total = frontend + backend or 1
+    print_box(
+        [
+            f"Translation units: {cyan(str(report['translation_units']))}",
+            f"Frontend:          {cyan(f'{frontend / 1000:.2f} s')} ({100 * frontend / total:.0f}%)",
+            f"Backend:           {cyan(f'{backend / 1000:.2f} s')} ({100 * backend / total:.0f}%)",
+        ],
+        title="Summary",
+    )
+    print()
+
+    print_box(
+        [f"{t['total_ms']:>9.0f} ms  {_short(t['tu'])}" for t in report["slowest_tus"]],
+        title="Slowest Translation Units",
+    )
+    print()
+    print_box(
+        [f"{h['total_ms']:>9.0f} ms {h['count']:>4}x  {_short(h['name'])}" for h in report["headers"]],
+        title="Most Expensive Headers (inclusive parse time)",
+    )
+    print()
+    print_box(
+        [f"{t['total_ms']:>9.0f} ms {t['count']:>4}x  {_short(t['name'])}" for t in report["templates"]],
+        title="Template Instantiation Hotspots",
+    )
+    print()
+    print_success(f"Aggregated {len(traces)} trace files")
+    print(dim(f"  Traces: {binary_dir}"))
+
+    return True
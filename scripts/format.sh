@@ -1,23 +1,33 @@
 #!/usr/bin/env bash
 # Cross-platform code formatting script
-# Usage: ./format.sh [--check] [--verbose]
+# Usage: ./format.sh [--check] [--changed [REF]] [--verbose]
+#
+# Delegates to 'cqs format', which batches files across a worker pool and
+# skips files already known to be formatted.
 
 set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
-CHECK=false
-VERBOSE=false
+ARGS=()
 
 while [[ $# -gt 0 ]]; do
     case $1 in
         --check)
-            CHECK=true
+            ARGS+=("--check")
             shift
             ;;
+        --changed)
+            ARGS+=("--changed")
+            shift
+            if [[ $# -gt 0 && "$1" != -* ]]; then
+                ARGS+=("$1")
+                shift
+            fi
+            ;;
         --verbose|-v)
-            VERBOSE=true
+            ARGS+=("--verbose")
             shift
             ;;
         *)
@@ -27,65 +37,11 @@ while [[ $# -gt 0 ]]; do
     esac
 done
 
-if ! command -v clang-format >/dev/null 2>&1; then
-    echo "Error: clang-format not found in PATH" >&2
-    echo "Install clang-format or add it to PATH" >&2
+PYTHON="$(command -v python3 || command -v python || true)"
+if [[ -z "$PYTHON" ]]; then
+    echo "Error: Python not found in PATH" >&2
     exit 1
 fi
 
-echo "Using: $(command -v clang-format)"
-
-# Find source files
-EXTENSIONS=("cpp" "hpp" "h" "cc" "cxx" "hxx")
-DIRECTORIES=("include" "src" "tests" "benchmarks" "examples")
-
-files=()
-for dir in "${DIRECTORIES[@]}"; do
-    dir_path="$PROJECT_ROOT/$dir"
-    if [[ -d "$dir_path" ]]; then
-        for ext in "${EXTENSIONS[@]}"; do
-            while IFS= read -r -d '' file; do
-                files+=("$file")
-            done < <(find "$dir_path" -name "*.$ext" -type f -print0 2>/dev/null)
-        done
-    fi
-done
-
-if [[ ${#files[@]} -eq 0 ]]; then
-    echo "No source files found"
-    exit 0
-fi
-
-echo "Found ${#files[@]} files to format"
-
-has_changes=false
-
-if [[ "$CHECK" == "true" ]]; then
-    for file in "${files[@]}"; do
-        if [[ "$VERBOSE" == "true" ]]; then
-            echo "  Checking: $(basename "$file")"
-        fi
-        if ! clang-format --dry-run --Werror "$file" 2>/dev/null; then
-            echo "  Needs formatting: $file"
-            has_changes=true
-        fi
-    done
-
-    if [[ "$has_changes" == "true" ]]; then
-        echo ""
-        echo "Some files need formatting. Run: ./scripts/format.sh"
-        exit 1
-    else
-        echo ""
-        echo "All files are properly formatted"
-    fi
-else
-    for file in "${files[@]}"; do
-        if [[ "$VERBOSE" == "true" ]]; then
-            echo "  Formatting: $(basename "$file")"
-        fi
-        clang-format -i "$file"
-    done
-    echo ""
-    echo "Formatted ${#files[@]} files"
-fi
+cd "$PROJECT_ROOT"
+exec "$PYTHON" "$SCRIPT_DIR/cqs.py" format "${ARGS[@]+"${ARGS[@]}"}"
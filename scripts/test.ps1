@@ -28,6 +28,20 @@ $ErrorActionPreference = "Stop"
 
 $ProjectRoot = Split-Path -Parent $PSScriptRoot
 
+# Point build/compile_commands.json (where clangd looks) at a preset's database.
+# Falls back to a copy where symbolic links are not permitted.
+function Set-CompileCommands([string]$Name) {
+    $source = Join-Path $ProjectRoot "build/$Name/compile_commands.json"
+    if (-not (Test-Path $source)) { return }
+    $link = Join-Path $ProjectRoot "build/compile_commands.json"
+    Remove-Item -Force $link -ErrorAction SilentlyContinue
+    try {
+        New-Item -ItemType SymbolicLink -Path $link -Target $source -ErrorAction Stop | Out-Null
+    } catch {
+        Copy-Item $source $link
+    }
+}
+
 # Determine default preset
 if (-not $Preset) {
     if ($IsWindows -or $env:OS -eq "Windows_NT") {
@@ -49,6 +63,7 @@ Write-Host "========================================" -ForegroundColor Cyan
 if ($Build) {
     Write-Host "`nBuilding..." -ForegroundColor Green
     & cmake --preset $Preset
+    Set-CompileCommands $Preset
     & cmake --build --preset $Preset
     if ($LASTEXITCODE -ne 0) {
         Write-Host "Build failed!" -ForegroundColor Red
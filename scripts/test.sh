@@ -7,6 +7,13 @@ set -euo pipefail
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
+# Point build/compile_commands.json (where clangd looks) at a preset's database
+link_compile_commands() {
+    if [[ -f "$PROJECT_ROOT/build/$1/compile_commands.json" ]]; then
+        ln -sfn "$1/compile_commands.json" "$PROJECT_ROOT/build/compile_commands.json"
+    fi
+}
+
 PRESET=""
 FILTER=""
 VERBOSE=false
@@ -57,6 +64,7 @@ if [[ "$BUILD" == "true" ]]; then
     echo ""
     echo "Building..."
     cmake --preset "$PRESET"
+    link_compile_commands "$PRESET"
     cmake --build --preset "$PRESET"
 fi
 
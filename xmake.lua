@@ -4,6 +4,11 @@ set_version("0.1.0")
 set_languages("cxx20")
 add_rules("mode.debug", "mode.release")
 
+-- Machine-specific compiler cache / linker settings written by `cqs accelerate`
+if os.isfile(path.join(os.scriptdir(), ".cqs", "xmake.lua")) then
+  includes(".cqs/xmake.lua")
+end
+
 option("build_tests")
   set_default(true)
   set_showmenu(true)